@@ -1,65 +1,52 @@
 import pygame
 import sys
-import json
 import os
+import random
 import asyncio # Import asyncio for the web game loop
 
 # Add the 'src' directory to the Python path
 # This is not needed for PyScript as it uses a virtual filesystem.
 # sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'src')))
 
-from src.card import Card 
-from src.ui import Button, draw_text
+from src.card import Card, load_cards
+from src.ui import Button, draw_text, text_cache, fonts_created
 from src.enemy import Enemy
 from src.player import Player
+from src.piles import DRAW, HAND, DISCARD, EXHAUST
 from src.layout import UILayout
+from src.hittest import HitIndex
+from src.atlas import CardAtlas
+from src.render import DirtyRenderer
+from src.screens import ModalScreens, draw_loading_screen
+from src.assets import assets, artwork_files
+from src.clock import FixedTimestep
+from src.profiler import FrameProfiler
+from src.trace import tracer
+from src.log import log
+from src.replay import ReplayRecorder, catalog_hash
+from src.combat import (
+    CombatEngine, reset_game, combat_seed,
+    PLAYER_TURN, ENEMY_ANNOUNCE, ENEMY_ATTACK, ENEMY_END, GAME_OVER, COMBAT_WIN, ENEMY_STATES,
+)
 # --- Constants ---
 SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
 WINDOW_TITLE = "Deckbuilder Card Battler"
-
-def load_cards():
-    """Loads all card definitions from the JSON file."""
-    try:
-        # In PyScript, the path is relative to the root where files are fetched.
-        json_path = 'src/data/cards.json'
-        with open(json_path, "r") as f:
-            all_card_data = json.load(f)
-            # Create a dictionary of Card objects, keyed by their ID
-            return {data["id"]: Card(data) for data in all_card_data}
-    except FileNotFoundError:
-        print("Error: cards.json not found!")
-        return {}
-    except json.JSONDecodeError:
-        print("Error: Could not decode cards.json!")
-        return {}
-
-def reset_game(player: Player, all_cards: dict, width: int, height: int, combat_count: int) -> Enemy:
-    """Resets the game to its initial state and returns a new Enemy instance."""
-    print("--- Resetting Game ---")
-    # Create a new starting deck with fresh card copies
-    strike_template = all_cards.get("card_001")
-    defend_template = all_cards.get("card_002")
-    starting_deck = []
-    if strike_template and defend_template:
-        for _ in range(5): # Let's reduce the starting deck size for better testing/gameplay
-            starting_deck.append(strike_template.copy())
-        for _ in range(5):
-            starting_deck.append(defend_template.copy())
-
-    # player.reset_stats() is now called from main() on first run
-    player.set_deck(starting_deck)
-    player.start_new_combat()
-
-    # Create and return a new enemy for the new game
-    # Scale enemy HP based on combat count. 25% increase per combat.
-    base_hp = 10 # The HP of the first enemy
-    new_hp = int(base_hp * (1 + 0.25 * combat_count))
-    new_enemy = Enemy(width // 2, height // 2 - 100, hp=new_hp)
-    return new_enemy
-
-async def main():
-    """Main game function."""
+REPLAY_PATH = os.path.join("replays", "latest.replay") # Where the session's replay is saved on exit
+TRACE_PATH = os.path.join("traces", "trace.json") # Open in chrome://tracing or ui.perfetto.dev
+
+async def main(fast_forward: bool = False, trace: bool = False):
+    """
+    Main game function.
+
+    Args:
+        fast_forward (bool): Play enemy turns out instantly, without the announcement
+            or animations (also toggled with F4). Useful for headless runs and tests.
+        trace (bool): Record a trace of every frame from the start (also started with F6)
+            and write it to TRACE_PATH on exit.
+    """
+    if trace:
+        tracer.start() # Before loading, so the startup asset loads are in the trace too
 
     # --- PyScript/Web Specific Setup ---
     # This tells pygame to render to the div specified in the <py-script> tag's "target"
@@ -75,81 +62,307 @@ async def main():
     combat_count = 0
 
     all_cards = load_cards()
-    print(f"Loaded {len(all_cards)} cards!")
-    # Load card images
+    log.info("cards.loaded", "Loaded {count} cards!", count=len(all_cards))
+
+    # --- Loading Screen ---
+    # Every artwork in the catalog is decoded up front (on worker threads where the
+    # platform has them), so nothing touches the disk once combat starts.
+    def show_loading_progress(loaded, total):
+        draw_loading_screen(screen, loaded, total)
+        pygame.display.flip()
+        pygame.event.pump() # Keep the window responsive while loading
+
+    await assets.preload(artwork_files(all_cards.values()), show_loading_progress)
+    # Compose every card face from the preloaded artwork
     for card in all_cards.values():
-        card.load_image() # No longer needs a path argument
+        card.load_image()
+    # Pack every card face into one texture so a whole hand is drawn with one batched blit
+    card_atlas = CardAtlas(all_cards.values())
 
     # --- Player ---
-    player = Player()
-    # Create a starting deck. It's crucial that each card is a unique object.
-    # We'll use the loaded cards as templates.
-    strike_template = all_cards.get("card_001")
-    defend_template = all_cards.get("card_002")
-    enemy = reset_game(player, all_cards, SCREEN_WIDTH, SCREEN_HEIGHT, combat_count)
+    # Every session is recorded (see src/replay.py). Each combat is shuffled from the
+    # run seed, so the recording only needs the player's actions.
+    recorder = ReplayRecorder(random.randrange(2**32), catalog_hash())
+    player = Player(rng=random.Random())
+
+    def start_combat() -> Enemy:
+        """Deals the current combat from the run seed and records its start."""
+        player.rng.seed(combat_seed(recorder.seed, recorder.combats_started))
+        new_enemy = reset_game(player, all_cards, screen.get_width(), screen.get_height(), combat_count)
+        recorder.combat_started(combat_count, player)
+        return new_enemy
+
+    enemy = start_combat()
 
     # --- Game State Machine ---
-    # The game can only be in one of these states at a time.
-    # - PLAYER_TURN: Waiting for player input (playing cards, ending turn).
-    # - ENEMY_ANNOUNCE: Brief pause to show "Enemy's Turn".
-    # - ENEMY_ATTACK: The enemy performs its attack animation and logic.
-    # - ENEMY_END: The enemy turn ends, player's turn begins.
-    # - GAME_OVER: The player has lost, showing restart/quit options.
-    # - COMBAT_WIN: The player has won the combat, showing next/quit options.
-    game_state = "PLAYER_TURN"
+    # The combat engine owns the rules and state transitions (see src/combat.py).
+    # The loop below only adds timers and animations on top of it.
+    engine = CombatEngine(player, enemy)
 
     turn_timer = 0
-    game_over_reason = "" # To store why the game ended
     ENEMY_TURN_ANNOUNCE_DURATION = 1.5 # seconds
 
+    # --- Timing ---
+    # The simulation advances in fixed steps, so the game runs at the same speed at any
+    # frame rate and a slow frame is caught up instead of stretching the enemy turn.
+    timestep = FixedTimestep(step=1 / 60)
+    timestep.fast_forward = fast_forward
+
     # --- UI Layout ---
     layout = UILayout(SCREEN_WIDTH, SCREEN_HEIGHT)
 
     # --- Enemy ---
     # enemy is now initialized by reset_game
 
+    # --- Hit Testing ---
+    # Card and button rects only change when position_ui_elements runs, so they are
+    # indexed there, and clicks and hover look the element up instead of scanning
+    # the hand (see src/hittest.py).
+    hit_index = HitIndex()
+
     # --- Dynamic UI positioning ---
     # We need a function to reposition elements when the screen resizes
     def position_ui_elements(width, height):
         close_button.rect.topright = (width - 10, 10)
         end_turn_button.rect = layout.end_turn_area
+        restart_button.rect.center = (width // 2, height // 2 + 50)
 
         # Position cards in hand
         num_cards = len(player.hand)
-        if num_cards == 0:
-            return
-
-        card_width = 100 # Assuming card image width is 100
-        card_spacing = card_width + 10 # Ideal spacing
-
-        # Calculate total width required with ideal spacing
-        total_hand_width = (num_cards - 1) * card_spacing + card_width
-
-        # If the hand is too wide for the zone, calculate the necessary overlap
-        if total_hand_width > layout.card_zone.width and num_cards > 1:
-            card_spacing = (layout.card_zone.width - card_width) / (num_cards - 1)
-
-        card_x_start = layout.card_zone.left
-        card_y = layout.card_zone.y
-        for i, card in enumerate(player.hand): # Use player.hand now
-            card.rect = card.image.get_rect(topleft=(card_x_start + i * card_spacing, card_y))
+        if num_cards > 0:
+            positions = layout.hand_positions(num_cards, card_width=100) # Assuming card image width is 100
+            for card, topleft in zip(player.hand, positions): # Use player.hand now
+                card.rect = card.image.get_rect(topleft=topleft)
 
         # Reposition enemy
         if enemy:
-            enemy.rect.center = layout.enemy_area.center
-            enemy.base_x = layout.enemy_area.centerx
+            enemy.move_to(layout.enemy_area.center)
 
         # Reposition player
         player.rect.center = layout.player_avatar_area.center
 
+        # Bottom to top, as they are drawn: later cards overlap earlier ones, buttons go over the hand
+        hit_index.rebuild([(card, card.rect) for card in player.hand] +
+                          [(button, button.rect) for button in (end_turn_button, restart_button, close_button)])
+
     # --- UI Elements ---
     close_button = Button(0, 0, 100, 40, "Close")
     end_turn_button = Button(0, 0, 150, 50, "End Turn")
     restart_button = Button(0, 0, 200, 60, "Restart")
     position_ui_elements(layout.width, layout.height) # Set initial position
 
+    # --- Scene ---
+    # Everything on screen is a tracked sprite. Each frame the renderer only repaints
+    # the sprites whose area or contents changed, instead of filling and flipping the
+    # whole screen. Sprites are drawn in the order they are added.
+    renderer = DirtyRenderer(background=(20, 20, 30))
+    hovered_card = None
+
+    def in_combat():
+        return not engine.is_over
+
+    def is_interactive(target) -> bool:
+        """Whether a hit-test target can be hovered or clicked in the current state."""
+        if target is close_button:
+            return True
+        if target is end_turn_button:
+            return engine.state == PLAYER_TURN
+        if target is restart_button:
+            return engine.is_over
+        return not engine.is_over and target in player.hand # Skips cards played since the last rebuild
+
+    # --- Combat Number ---
+    renderer.add_text("combat_number", lambda: f"Combat {combat_count + 1}",
+                      lambda: (screen.get_width() // 2 - 50, 15), font_size=32, color=(220, 220, 220), visible=in_combat)
+
+    # --- Player and Enemy ---
+    renderer.add("player", player.draw, lambda: player.rect,
+                 visible=lambda: engine.state != COMBAT_WIN) # Also the background of the game over screen
+    renderer.add("enemy", lambda surface: enemy.draw(surface), lambda: enemy.rect, visible=in_combat)
+
+    def enemy_stats_pos():
+        stats_rect = pygame.Rect(0, 0, 300, 30)
+        stats_rect.midtop = enemy.rect.midbottom
+        return stats_rect.topleft
+
+    renderer.add_text("enemy_stats", lambda: f"HP: {enemy.hp} | Armor: {enemy.armor} | Attack: {enemy.attack_damage}",
+                      enemy_stats_pos, font_size=28, color=(220, 220, 220), visible=in_combat)
+
+    # --- Deck Composition Display ---
+    # This should reflect all cards currently in play for the combat (draw + discard + hand).
+    # It shows the whole deck, which only changes in set_deck(), so the lines and their area are
+    # only rebuilt when player.deck_version changes (or the window is resized), not on every draw or play.
+    deck_panel_key = None
+    deck_panel_lines = []
+    deck_panel_rect = pygame.Rect(0, 0, 0, 0)
+
+    def deck_composition_lines():
+        nonlocal deck_panel_key, deck_panel_lines, deck_panel_rect
+        key = (player.deck_version, layout.draw_pile_area.topleft)
+        if key == deck_panel_key:
+            return deck_panel_lines
+        # Draw from the bottom up for scalability
+        deck_info_pos = layout.draw_pile_area.topleft
+        line_height = 22
+        # Start drawing just above the draw pile area and move upwards
+        start_y = layout.draw_pile_area.top - line_height
+        deck_panel_lines = [(f"{name}: {count}", (deck_info_pos[0], start_y - (i * line_height)))
+                            for i, (name, count) in enumerate(player.composition().items())]
+        deck_panel_rect = pygame.Rect(layout.draw_pile_area.left, layout.draw_pile_area.top, 0, 0)
+        for text, pos in deck_panel_lines:
+            deck_panel_rect.union_ip(text_cache.render(text, 24, (200, 200, 200)).get_rect(topleft=pos))
+        deck_panel_key = key
+        return deck_panel_lines
+
+    def draw_deck_composition(surface):
+        for text, (x, y) in deck_composition_lines():
+            draw_text(surface, text, x, y, font_size=24, color=(200, 200, 200))
+
+    def deck_composition_rect():
+        deck_composition_lines() # Brings the area up to date
+        return deck_panel_rect
+
+    renderer.add("deck_composition", draw_deck_composition, deck_composition_rect, lambda: player.deck_version,
+                 visible=in_combat)
+
+    # --- Draw/Discard Pile visuals ---
+    def draw_draw_pile(surface):
+        pygame.draw.rect(surface, (50, 50, 80), layout.draw_pile_area, border_radius=10)
+        draw_text(surface, "Deck", layout.draw_pile_area.centerx - 25, layout.draw_pile_area.centery - 30)
+        draw_text(surface, str(player.piles.count(DRAW)), layout.draw_pile_area.centerx - 10, layout.draw_pile_area.centery, font_size=36)
+
+    renderer.add("draw_pile", draw_draw_pile, lambda: layout.draw_pile_area, lambda: player.piles.count(DRAW), visible=in_combat)
+
+    # --- Player Stats ---
+    def draw_player_stats(surface):
+        stats_pos = layout.player_stats_area.topleft
+        player_hp_text = f"HP: {player.hp} / {player.max_hp}"
+        player_armor_text = f"Armor: {player.armor}"
+        player_energy_text = f"Energy: {player.energy} / {player.max_energy}"
+        draw_text(surface, player_hp_text, stats_pos[0], stats_pos[1], font_size=32, color=(200, 220, 200))
+        draw_text(surface, player_armor_text, stats_pos[0], stats_pos[1] + 30, font_size=32, color=(180, 180, 255))
+        draw_text(surface, player_energy_text, stats_pos[0], stats_pos[1] + 60, font_size=32, color=(200, 200, 255))
+
+    renderer.add("player_stats", draw_player_stats, lambda: layout.player_stats_area,
+                 lambda: (player.hp, player.max_hp, player.armor, player.energy, player.max_energy), visible=in_combat)
+
+    def draw_discard_pile(surface):
+        pygame.draw.rect(surface, (80, 50, 50), layout.discard_pile_area, border_radius=10)
+        draw_text(surface, "Discard", layout.discard_pile_area.centerx - 40, layout.discard_pile_area.centery - 15)
+        draw_text(surface, str(player.piles.count(DISCARD)), layout.discard_pile_area.centerx - 10, layout.discard_pile_area.centery + 5, font_size=36)
+        if player.piles.count(EXHAUST):
+            draw_text(surface, f"Exhausted: {player.piles.count(EXHAUST)}", layout.discard_pile_area.left + 8,
+                      layout.discard_pile_area.bottom - 22, font_size=20, color=(180, 180, 180))
+
+    renderer.add("discard_pile", draw_discard_pile, lambda: layout.discard_pile_area,
+                 lambda: (player.piles.count(DISCARD), player.piles.count(EXHAUST)), visible=in_combat)
+
+    # --- Cards in Hand ---
+    def hand_rect():
+        card_rects = [card.rect for card in player.hand if card.rect]
+        if not card_rects:
+            return pygame.Rect(0, 0, 0, 0)
+        return card_rects[0].unionall(card_rects).inflate(6, 6) # Room for the hover highlight
+
+    def hand_signature():
+        # Cards are identified by their pile slot, which is stable for the whole combat
+        return (tuple((slot, card.rect and card.rect.topleft, card.face_key)
+                      for slot, card in player.piles.slots(HAND)), id(hovered_card))
+
+    renderer.add("hand", lambda surface: card_atlas.draw_cards(surface, player.hand, hovered_card),
+                 hand_rect, hand_signature, visible=lambda: in_combat() and player.piles.count(HAND) > 0)
+
+    # Only show the end turn button during the player's turn
+    renderer.add("end_turn_button", end_turn_button.draw, lambda: end_turn_button.rect,
+                 lambda: end_turn_button.hovered, visible=lambda: engine.state == PLAYER_TURN)
+    def enemy_turn_pos():
+        # Centered on the current window size, so it stays correct after a resize
+        text_surf = text_cache.render("Enemy's Turn", 72, (200, 50, 50))
+        return text_surf.get_rect(midtop=(screen.get_width() // 2, screen.get_height() // 2 - 50)).topleft
+
+    renderer.add_text("enemy_turn", lambda: "Enemy's Turn", enemy_turn_pos,
+                      font_size=72, color=(200, 50, 50), visible=lambda: engine.state == ENEMY_ANNOUNCE)
+
+    renderer.add("tooltip", lambda surface: hovered_card.draw_tooltip(surface), lambda: hovered_card.tooltip_rect(),
+                 lambda: hovered_card.description, visible=lambda: hovered_card is not None)
+
+    # --- Game Over / Victory Screens ---
+    # Composed once per (state, window size, reason) and reused every frame
+    modal_screens = ModalScreens()
+    renderer.add("end_screen", lambda surface: modal_screens.draw(surface, engine.state, engine.game_over_reason),
+                 lambda: screen.get_rect(),
+                 lambda: (engine.state, engine.game_over_reason), visible=lambda: engine.is_over)
+    # Draw the restart button ("Next Combat" after a win)
+    renderer.add("restart_button", restart_button.draw, lambda: restart_button.rect,
+                 lambda: (restart_button.hovered, restart_button.text), visible=lambda: engine.is_over)
+
+    # The close button should be visible in all states
+    renderer.add("close_button", close_button.draw, lambda: close_button.rect, lambda: close_button.hovered)
+
+    # --- Profiler Overlay (F3) ---
+    # Counters are read once per frame while the overlay is on; the hot paths only bump plain integers
+    profiler = FrameProfiler()
+
+    def surfaces_allocated() -> int:
+        # Every place that creates a pygame.Surface keeps a running count of them
+        return (text_cache.misses + Card.faces_built + Card.tooltips_built + modal_screens.builds
+                + profiler.surfaces_built + CardAtlas.textures_built + Enemy.images_built + Player.images_built
+                + assets.disk_loads)
+
+    profiler.add_counter("surfaces allocated", surfaces_allocated)
+    profiler.add_counter("fonts created", fonts_created)
+    profiler.add_counter("text renders", lambda: text_cache.misses)
+    profiler.add_counter("text cache hits", lambda: text_cache.hits)
+    profiler.add_counter("atlas draw calls", lambda: card_atlas.draw_calls, cumulative=False)
+    profiler.add_counter("dirty rects", lambda: len(renderer.last_dirty), cumulative=False)
+    renderer.add("profiler", profiler.draw, profiler.rect, lambda: profiler.panel_version, visible=lambda: profiler.enabled)
+
+    # --- Simulation Steps ---
+    def step_simulation(dt):
+        """Advances timers and animations by one fixed step of `dt` seconds."""
+        nonlocal turn_timer
+        if engine.state == PLAYER_TURN:
+            player.update()
+            enemy.update(dt) # Update for idle animations
+            engine.update() # Win/loss checks and auto-ending the turn
+
+        elif engine.state == ENEMY_ANNOUNCE:
+            turn_timer += dt
+            if turn_timer >= ENEMY_TURN_ANNOUNCE_DURATION:
+                turn_timer = 0
+                engine.advance() # -> ENEMY_ATTACK
+                enemy.start_attack_animation(player.rect)
+
+        elif engine.state == ENEMY_ATTACK:
+            attack_landed = enemy.update(dt)
+            if attack_landed:
+                engine.advance() # Performs the attack -> ENEMY_END
+
+        elif engine.state == ENEMY_END:
+            # Wait for enemy return animation to finish
+            enemy.update(dt)
+            if enemy.animation_state == "idle":
+                engine.advance() # -> PLAYER_TURN, or GAME_OVER if the draw fails
+                position_ui_elements(screen.get_width(), screen.get_height())
+
+    def fast_forward_enemy_turn():
+        """Plays out the rest of the enemy turn at once, skipping the announcement and animations."""
+        nonlocal turn_timer
+        turn_timer = 0
+        enemy.finish_animation()
+        engine.run_enemy_turn()
+        position_ui_elements(screen.get_width(), screen.get_height())
+
+    def save_trace():
+        try:
+            count = tracer.dump(TRACE_PATH)
+            log.info("trace.saved", "Saved {count} trace events to {path}", count=count, path=TRACE_PATH)
+        except OSError as e:
+            log.warning("trace.save_failed", "Could not save the trace: {error}", error=str(e))
+
     running = True
     while running:
+        profiler.begin_frame()
         for event in pygame.event.get(): # Regular event loop
             if event.type == pygame.QUIT:
                 running = False
@@ -157,219 +370,102 @@ async def main():
                 screen = pygame.display.set_mode(event.size, pygame.RESIZABLE)
                 layout = UILayout(event.w, event.h) # Re-create layout with new dimensions
                 position_ui_elements(event.w, event.h) # Reposition all elements
+                renderer.invalidate()
+                modal_screens.invalidate()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F2:
+                renderer.debug = not renderer.debug # Outline the repainted regions
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                profiler.toggle() # Frame timings overlay
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                timestep.fast_forward = not timestep.fast_forward # Skip enemy turn animations
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F6:
+                # The first press starts tracing; later presses save what's been recorded so far
+                if tracer.enabled:
+                    save_trace()
+                else:
+                    tracer.start()
 
             # --- Event Handling based on Game State ---
-            if game_state == "PLAYER_TURN":
-                if close_button.is_clicked(event):
+            # A left click is resolved to the top-most element under it, if any
+            clicked = None
+            if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+                clicked = hit_index.hit(event.pos, is_interactive)
+
+            if engine.state == PLAYER_TURN:
+                if clicked is close_button:
                     running = False
-                if end_turn_button.is_clicked(event):
-                    game_state = "ENEMY_ANNOUNCE"
-                
-                # Check for card clicks (iterate backwards to safely remove items)
-                for card in reversed(player.hand):
-                    if card.rect and event.type == pygame.MOUSEBUTTONUP and event.button == 1:
-                        if card.rect.collidepoint(event.pos):
-                            # Check if there is an enemy to target
-                            if not enemy:
-                                print("No enemy to target!")
-                                continue
-                            player.play_card(card, enemy) # This can fail if not enough energy
-                            position_ui_elements(screen.get_width(), screen.get_height()) # Reposition hand
-                            # --- Immediate check for enemy defeat after a card is played ---
-                            if enemy.hp <= 0:
-                                game_state = "COMBAT_WIN"
-                            break # Stop after playing one card to avoid multiple plays on one click
-            elif game_state == "GAME_OVER":
-                if restart_button.is_clicked(event):
+                elif clicked is end_turn_button:
+                    if engine.end_turn():
+                        recorder.end_turn()
+                elif isinstance(clicked, Card):
+                    hand_index = player.hand.index(clicked)
+                    if engine.play_card(clicked): # This can fail if not enough energy
+                        recorder.play_card(hand_index)
+                    position_ui_elements(screen.get_width(), screen.get_height()) # Reposition hand
+            elif engine.state == GAME_OVER:
+                if clicked is restart_button:
+                    recorder.restart()
                     combat_count = 0 # Reset combat count on game over
                     player.reset_stats() # Fully reset player HP for a new run
-                    enemy = reset_game(player, all_cards, screen.get_width(), screen.get_height(), combat_count) # This resets player.hp
-                    restart_button.rect.center = (screen.get_width() // 2, screen.get_height() // 2 + 50)
+                    enemy = start_combat()
+                    engine = CombatEngine(player, enemy)
                     position_ui_elements(screen.get_width(), screen.get_height())
-                    game_state = "PLAYER_TURN"
-                    game_over_reason = "" # Clear the reason so the overlay doesn't re-appear immediately
-                if close_button.is_clicked(event):
+                if clicked is close_button:
                     running = False
-            elif game_state == "COMBAT_WIN":
-                if restart_button.is_clicked(event): # We'll reuse the restart button for "Next Combat"
+            elif engine.state == COMBAT_WIN:
+                if clicked is restart_button: # We'll reuse the restart button for "Next Combat"
+                    recorder.next_combat()
                     combat_count += 1
                     # Player stats like HP carry over to the next combat
-                    enemy = reset_game(player, all_cards, screen.get_width(), screen.get_height(), combat_count)
+                    enemy = start_combat()
+                    engine = CombatEngine(player, enemy)
                     position_ui_elements(screen.get_width(), screen.get_height())
-                    game_state = "PLAYER_TURN"
-                if close_button.is_clicked(event):
+                if clicked is close_button:
                     running = False
 
-        # --- Game Logic / Updates based on Game State --- (Use elif to prevent state re-evaluation in the same frame)
-        if game_state == "PLAYER_TURN":
-            player.update()
-            if enemy:
-                enemy.update() # Update for idle animations
-                if enemy.hp <= 0:
-                    game_state = "COMBAT_WIN"
-            
-            # --- Check for state transitions ---
-            if player.hp <= 0:
-                game_over_reason = "You have been defeated!"
-                game_state = "GAME_OVER"
-            # Auto-end turn if player has no energy for any cards
-            elif (player.energy <= 0 and any(card.cost > 0 for card in player.hand)) or not player.hand:
-                game_state = "ENEMY_ANNOUNCE"
-
-        elif game_state == "ENEMY_ANNOUNCE":
-            turn_timer += clock.get_time() / 1000 # Add elapsed time in seconds
-            if turn_timer >= ENEMY_TURN_ANNOUNCE_DURATION:
-                turn_timer = 0
-                game_state = "ENEMY_ATTACK"
-                if enemy:
-                    enemy.start_attack_animation(player.rect)
-
-        elif game_state == "ENEMY_ATTACK":
-            if enemy:
-                attack_landed = enemy.update()
-                if attack_landed:
-                    enemy.perform_attack(player)
-                    game_state = "ENEMY_END"
-            else: # Enemy was defeated before it could attack
-                game_state = "ENEMY_END"
-
-        elif game_state == "ENEMY_END":
-            # Wait for enemy return animation to finish
-            if enemy:
-                enemy.update()
-            
-            if not enemy or enemy.animation_state == "idle":
-                player.end_turn() # Reset player energy and draw count
-                # --- Auto-draw a card at the start of the turn ---
-                if not player.draw_card():
-                    game_over_reason = "Draw pile is empty!"
-                    game_state = "GAME_OVER"
-                else:
-                    position_ui_elements(screen.get_width(), screen.get_height())
-                game_state = "PLAYER_TURN"
+        profiler.mark("events")
 
-        elif game_state == "GAME_OVER":
-            restart_button.rect.center = (screen.get_width() // 2, screen.get_height() // 2 + 50)
-        
-        elif game_state == "COMBAT_WIN":
-            restart_button.rect.center = (screen.get_width() // 2, screen.get_height() // 2 + 50)
+        # --- Game Logic / Updates based on Game State ---
+        # The engine decides the transitions; the fixed steps only advance timers and animations.
+        if timestep.fast_forward and engine.state in ENEMY_STATES:
+            fast_forward_enemy_turn()
+        for _ in range(timestep.advance(clock.get_time() / 1000)):
+            step_simulation(timestep.step)
+
+        if engine.state == COMBAT_WIN:
+            restart_button.text = "Next Combat" # Reusing the restart button
+        profiler.mark("update")
 
         # --- Drawing ---
-        screen.fill((20, 20, 30)) # Fill screen with a dark blue color
-
-        # --- Drawing based on Game State ---
-        if game_state not in ["GAME_OVER", "COMBAT_WIN"]:
-            # --- Draw Combat Number ---
-            combat_text = f"Combat {combat_count + 1}"
-            draw_text(screen, combat_text, screen.get_width() // 2 - 50, 15, font_size=32, color=(220, 220, 220))
-
-            # --- Draw normal game UI ---
-            player.draw(screen)
-            if enemy:
-                enemy.draw(screen)
-                stats_text = f"HP: {enemy.hp} | Armor: {enemy.armor} | Attack: {enemy.attack_damage}"
-                stats_rect = pygame.Rect(0, 0, 300, 30)
-                stats_rect.midtop = enemy.rect.midbottom
-                draw_text(screen, stats_text, stats_rect.x, stats_rect.y, font_size=28, color=(220, 220, 220))
-            
-            # --- Deck Composition Display ---
-            # This should reflect all cards currently in play for the combat (draw + discard + hand)
-            deck_composition = {}
-            # Let's count from the master deck list for consistency
-            for card in player.deck:
-                deck_composition[card.name] = deck_composition.get(card.name, 0) + 1
-            
-            # Draw from the bottom up for scalability
-            deck_info_pos = layout.draw_pile_area.topleft
-            line_height = 22
-            # Start drawing just above the draw pile area and move upwards
-            start_y = layout.draw_pile_area.top - line_height
-            for i, (name, count) in enumerate(deck_composition.items()):
-                text = f"{name}: {count}"
-                draw_text(screen, text, deck_info_pos[0], start_y - (i * line_height), font_size=24, color=(200, 200, 200))
-
-            # Discard Pile Info
-            # This is now drawn as part of the pile itself
-
-            # Draw/Discard Pile visuals
-            pygame.draw.rect(screen, (50, 50, 80), layout.draw_pile_area, border_radius=10)
-            draw_text(screen, "Deck", layout.draw_pile_area.centerx - 25, layout.draw_pile_area.centery - 30)
-            draw_text(screen, str(len(player.draw_pile)), layout.draw_pile_area.centerx - 10, layout.draw_pile_area.centery, font_size=36)
-            
-            # Player Stats
-            stats_pos = layout.player_stats_area.topleft
-            player_hp_text = f"HP: {player.hp} / {player.max_hp}"
-            player_armor_text = f"Armor: {player.armor}"
-            player_energy_text = f"Energy: {player.energy} / {player.max_energy}"
-            draw_text(screen, player_hp_text, stats_pos[0], stats_pos[1], font_size=32, color=(200, 220, 200))
-            draw_text(screen, player_armor_text, stats_pos[0], stats_pos[1] + 30, font_size=32, color=(180, 180, 255))
-            draw_text(screen, player_energy_text, stats_pos[0], stats_pos[1] + 60, font_size=32, color=(200, 200, 255))
-            
-            pygame.draw.rect(screen, (80, 50, 50), layout.discard_pile_area, border_radius=10)
-            draw_text(screen, "Discard", layout.discard_pile_area.centerx - 40, layout.discard_pile_area.centery - 15)
-            draw_text(screen, str(len(player.discard_pile)), layout.discard_pile_area.centerx - 10, layout.discard_pile_area.centery + 5, font_size=36)
-
-            # Draw cards in hand
-            hovered_card = None
-            for card in player.hand:
-                if card.rect.collidepoint(pygame.mouse.get_pos()):
-                    hovered_card = card
-            
-            for card in player.hand:
-                is_hovered = (card == hovered_card)
-                card.draw(screen, is_hovered)
-
-            # Only show the end turn button during the player's turn
-            if game_state == "PLAYER_TURN":
-                end_turn_button.draw(screen)
-            elif game_state == "ENEMY_ANNOUNCE":
-                draw_text(screen, "Enemy's Turn", SCREEN_WIDTH // 2 - 150, SCREEN_HEIGHT // 2 - 50, font_size=72, color=(200, 50, 50))
-
-            if hovered_card:
-                hovered_card.draw_tooltip(screen)
-
-        elif game_state == "GAME_OVER":
-            # Draw elements common to both playing and game over (the background scene)
-            player.draw(screen)
-
-            # Draw the game over overlay
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 150)) # Black, semi-transparent
-            screen.blit(overlay, (0, 0))
-
-            # Draw "Game Over" text
-            draw_text(screen, "Game Over", SCREEN_WIDTH // 2 - 150, SCREEN_HEIGHT // 2 - 100, font_size=72, color=(200, 50, 50))
-            draw_text(screen, game_over_reason, SCREEN_WIDTH // 2 - (len(game_over_reason) * 9), SCREEN_HEIGHT // 2 - 30, font_size=36, color=(220, 220, 220))
-
-            # Draw the restart button
-            restart_button.draw(screen)
-
-        elif game_state == "COMBAT_WIN":
-            # Draw the background scene
-
-            # Draw the victory overlay
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 150)) # Black, semi-transparent
-            screen.blit(overlay, (0, 0))
-
-            # Draw "You Win!" text
-            draw_text(screen, "You Win!", SCREEN_WIDTH // 2 - 120, SCREEN_HEIGHT // 2 - 100, font_size=72, color=(255, 215, 0))
-
-            # Draw the "Next Combat" button (reusing the restart button)
-            restart_button.text = "Next Combat"
-            restart_button.draw(screen)
-
-        # The close button should be visible in all states
-        close_button.draw(screen)
-
-        pygame.display.flip() # Update the full display Surface to the screen
+        # Only the regions that changed since last frame are repainted (see the scene above)
+        card_atlas.reset_stats() # Draw calls are counted per frame
+        enemy.interpolate(timestep.alpha) # Smooth motion between simulation steps
+        # Hover is resolved once per frame, from one mouse sample, for the hand and every button
+        hovered = hit_index.hit(pygame.mouse.get_pos(), is_interactive)
+        hovered_card = hovered if isinstance(hovered, Card) else None
+        for button in (end_turn_button, restart_button, close_button):
+            button.hovered = hovered is button
+
+        dirty_rects = renderer.render(screen)
+        profiler.mark("draw")
+        pygame.display.update(dirty_rects) # Push only the repainted regions to the screen
+        profiler.mark("flip")
         clock.tick(60) # Limit frame rate to 60 FPS
         await asyncio.sleep(0) # Yield control to the browser
 
+    try:
+        recorder.save(REPLAY_PATH) # Play it back with: python -m src.replay replays/latest.replay
+    except OSError as e:
+        log.warning("replay.save_failed", "Could not save the replay: {error}", error=str(e))
+    if tracer.enabled:
+        save_trace()
+        tracer.stop()
+
     pygame.quit()
     # sys.exit() is not needed in the browser and can cause issues.
 
 if __name__ == "__main__":
     # PyScript runs the top-level code. We use asyncio.run to start our async main function.
     # This makes the game loop compatible with the browser's event model.
-    asyncio.run(main())
+    # --fast-forward plays enemy turns out instantly (like F4), e.g. for headless runs and tests
+    asyncio.run(main(fast_forward="--fast-forward" in sys.argv, trace="--trace" in sys.argv))
@@ -0,0 +1,42 @@
+from __future__ import annotations
+import importlib
+import sys
+
+# --- Headless Tools ---
+# name -> (module, description). A tool's module is only imported when it is run,
+# and none of the simulation tools import pygame, so `python -m src simulate ...`
+# starts as fast as the rules load.
+COMMANDS = {
+    "simulate": ("src.simulate", "simulate many runs with a simple policy"),
+    "mcts": ("src.mcts", "play runs with the MCTS autoplayer"),
+    "solver": ("src.solver", "play runs with the exact per-turn solver"),
+    "replay": ("src.replay", "play back, seek or record a replay"),
+    "bench": ("src.bench", "run or compare the benchmarks (needs pygame)"),
+    "bundle": ("src.bundle", "build the web bundle"),
+}
+
+
+def usage() -> str:
+    lines = ["usage: python -m src <command> [args...]", "", "commands:"]
+    lines += [f"  {name:<10} {description}" for name, (_, description) in COMMANDS.items()]
+    lines.append("\nRun `python -m src <command> --help` for a command's options.")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command-line entry point: python -m src <command> [args...]"""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help"):
+        print(usage())
+        return 0
+    if argv[0] not in COMMANDS:
+        print(f"Unknown command {argv[0]!r}\n\n{usage()}", file=sys.stderr)
+        return 2
+
+    module_name = COMMANDS[argv[0]][0]
+    sys.argv = [f"python -m src {argv[0]}"] + argv[1:] # So the tool's --help shows how it was run
+    return importlib.import_module(module_name).main(argv[1:]) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
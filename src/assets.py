@@ -0,0 +1,124 @@
+from __future__ import annotations
+import asyncio
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Optional
+
+import pygame
+
+from .log import log
+from .trace import tracer
+
+# --- For web deployment, paths must be relative to the index.html file ---
+ARTWORK_DIR = os.path.join('assets', 'images', 'cards')
+
+# The browser build has no threads, so it loads one file at a time and yields to the page in between
+THREADS_AVAILABLE = sys.platform != "emscripten"
+
+
+def artwork_files(cards: Iterable) -> list[str]:
+    """Every distinct artwork filename the cards (e.g. the load_cards() catalog) refer to, in order."""
+    return list(dict.fromkeys(card.artwork_filename for card in cards))
+
+
+class AssetManager:
+    """
+    Loads card artwork once and hands it out by filename.
+
+    preload() decodes a batch of files on a thread pool (PNG decoding happens in
+    SDL and runs outside the GIL), then converts each surface to the display's
+    pixel format on the main thread as it arrives, since only the main thread may
+    touch the display. After that, get() is a dict lookup: nothing during play
+    goes to the disk. A file nobody preloaded is still loaded on first use.
+
+    Files that fail to load are remembered as None, and the error is logged once.
+    """
+
+    def __init__(self, base_path: str = ARTWORK_DIR, workers: int = 4):
+        """
+        Args:
+            base_path (str): Directory the artwork filenames are relative to.
+            workers (int): Decoding threads used by preload().
+        """
+        self.base_path = base_path
+        self.workers = workers
+        self._surfaces: dict[str, Optional[pygame.Surface]] = {} # filename -> converted surface, or None if it failed
+        self.disk_loads = 0 # Files read from disk so far
+
+    def __contains__(self, filename: str) -> bool:
+        return filename in self._surfaces
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+    def path_for(self, filename: str) -> str:
+        return os.path.join(self.base_path, filename)
+
+    def get(self, filename: str) -> Optional[pygame.Surface]:
+        """Returns the artwork, loading it now if it wasn't preloaded. None if it can't be loaded."""
+        if filename in self._surfaces:
+            return self._surfaces[filename]
+        return self._finish(*self._decode(filename))
+
+    def clear(self):
+        """Forgets every loaded surface (e.g. after the display is re-created)."""
+        self._surfaces.clear()
+
+    # --- Loading ---
+
+    def _decode(self, filename: str) -> tuple[str, Optional[pygame.Surface], Optional[Exception]]:
+        """Reads and decodes one file. Safe to call from any thread. Returns (filename, surface, error)."""
+        with tracer.span("decode", category="assets", file=filename):
+            try:
+                return filename, pygame.image.load(self.path_for(filename)), None
+            except (pygame.error, OSError) as e:
+                return filename, None, e
+
+    def _finish(self, filename: str, surface: Optional[pygame.Surface], error: Optional[Exception]) -> Optional[pygame.Surface]:
+        """Converts a decoded surface for the display and stores it. Main thread only."""
+        self.disk_loads += 1
+        if surface is not None and pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        if error is not None:
+            log.warning("assets.load_failed", "Error loading image {path}: {error}", path=self.path_for(filename), error=str(error))
+        self._surfaces[filename] = surface
+        return surface
+
+    async def preload(self, filenames: Iterable[str], on_progress: Optional[Callable[[int, int], None]] = None):
+        """
+        Loads every file not loaded yet, calling on_progress(loaded, total) after each one.
+
+        Awaiting this keeps the event loop (and the browser page) responsive: with threads,
+        it waits for the pool without blocking; without them, it yields after every file.
+        """
+        pending = [filename for filename in dict.fromkeys(filenames) if filename not in self._surfaces]
+        total = len(pending)
+        if on_progress:
+            on_progress(0, total)
+        if not pending:
+            return
+
+        if not THREADS_AVAILABLE or self.workers <= 1:
+            for done, filename in enumerate(pending, 1):
+                self._finish(*self._decode(filename))
+                if on_progress:
+                    on_progress(done, total)
+                await asyncio.sleep(0)
+            return
+
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=min(self.workers, total), thread_name_prefix="asset-loader") as pool:
+            futures = [asyncio.wrap_future(pool.submit(self._decode, filename), loop=loop) for filename in pending]
+            for done, next_done in enumerate(asyncio.as_completed(futures), 1):
+                self._finish(*await next_done)
+                if on_progress:
+                    on_progress(done, total)
+
+    def preload_now(self, filenames: Iterable[str], on_progress: Optional[Callable[[int, int], None]] = None):
+        """preload() for code that isn't running in an event loop (tools, tests)."""
+        asyncio.run(self.preload(filenames, on_progress))
+
+
+# The shared artwork store every card draws from.
+assets = AssetManager()
@@ -0,0 +1,112 @@
+from __future__ import annotations
+import pygame
+from typing import TYPE_CHECKING, Iterable, Optional, Sequence
+
+# This block is only processed by type checkers, not at runtime
+if TYPE_CHECKING:
+    from .card import Card
+
+
+class CardAtlas:
+    """
+    Packs every card face into one texture at startup.
+
+    Cards are drawn from sub-rects of that texture with a single Surface.blits
+    call per batch, instead of one blit per card Surface. Any card whose face
+    isn't in the atlas (e.g. its cost was modified in play) is drawn from its own
+    image inside the same batch, so callers never need to care.
+    """
+
+    MAX_WIDTH = 2048 # Widest texture we are willing to allocate
+    PADDING = 2 # Gap between faces, so filtering never bleeds into neighbours
+    textures_built = 0 # Atlas textures allocated so far, for the profiler
+
+    def __init__(self, cards: Iterable[Card]):
+        """
+        Args:
+            cards (Iterable[Card]): The cards whose faces should be packed, usually
+                every template from load_cards(). Cards with identical faces share a region.
+        """
+        self.regions: dict[tuple, pygame.Rect] = {}
+        self.draw_calls = 0 # Draw calls issued since the last reset_stats()
+        self.cards_drawn = 0
+
+        faces: dict[tuple, pygame.Surface] = {}
+        for card in cards:
+            if card.image is None:
+                card.load_image()
+            faces.setdefault(card.face_key, card.image)
+
+        # --- Shelf packing: fill rows left to right, start a new row when one is full ---
+        x = y = shelf_height = width = 0
+        for key, face in faces.items():
+            face_width, face_height = face.get_size()
+            if x > 0 and x + face_width > self.MAX_WIDTH:
+                x = 0
+                y += shelf_height + self.PADDING
+                shelf_height = 0
+            self.regions[key] = pygame.Rect(x, y, face_width, face_height)
+            x += face_width + self.PADDING
+            width = max(width, x)
+            shelf_height = max(shelf_height, face_height)
+
+        self.texture = pygame.Surface((max(width, 1), max(y + shelf_height, 1)), pygame.SRCALPHA)
+        CardAtlas.textures_built += 1
+        if pygame.display.get_surface() is not None:
+            self.texture = self.texture.convert_alpha()
+        self.texture.fill((0, 0, 0, 0))
+        for key, face in faces.items():
+            self.texture.blit(face, self.regions[key])
+
+    def region_for(self, card: Card) -> Optional[pygame.Rect]:
+        """Returns the card's sub-rect in the atlas texture, or None if it isn't packed."""
+        return self.regions.get(card.face_key)
+
+    def reset_stats(self):
+        """Resets the draw-call counters, e.g. once per frame."""
+        self.draw_calls = 0
+        self.cards_drawn = 0
+
+    def _blit_sequence(self, cards: Sequence[Card]) -> list:
+        """Builds the (source, dest, area) list for Surface.blits."""
+        sequence = []
+        for card in cards:
+            if not card.rect:
+                continue
+            area = self.regions.get(card.face_key)
+            if area is not None:
+                sequence.append((self.texture, card.rect.topleft, area))
+            elif card.image is not None:
+                sequence.append((card.image, card.rect.topleft))
+        return sequence
+
+    def draw_cards(self, surface: pygame.Surface, cards: Sequence[Card], hovered_card: Optional[Card] = None):
+        """
+        Draws the cards in order with batched blits. Used for the hand as well as
+        pile and reward views; anything that shows a row of cards.
+        The hovered card gets the same highlight Card.draw gives it.
+        """
+        # Everything up to the hovered card is drawn first, then its highlight, then the rest
+        below, above = [], []
+        batch = below
+        for card in cards:
+            batch.append(card)
+            if card is hovered_card and card.rect:
+                batch = above
+        highlighted = batch is above
+
+        self._draw_batch(surface, below)
+        if highlighted:
+            # Draw a highlight rectangle over the hovered card, like Card.draw
+            highlight_rect = hovered_card.rect.inflate(6, 6) # Make it slightly larger than the card
+            pygame.draw.rect(surface, (255, 255, 0), highlight_rect, border_radius=12)
+            self.draw_calls += 1
+            self._draw_batch(surface, above)
+
+    def _draw_batch(self, surface: pygame.Surface, cards: Sequence[Card]):
+        """Draws the cards with a single Surface.blits call."""
+        sequence = self._blit_sequence(cards)
+        if sequence:
+            surface.blits(sequence, doreturn=False)
+            self.draw_calls += 1
+            self.cards_drawn += len(sequence)
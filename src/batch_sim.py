@@ -0,0 +1,233 @@
+from __future__ import annotations
+import random
+from typing import TYPE_CHECKING, Sequence
+
+import numpy as np # Only the batch simulator needs NumPy, not the game itself
+
+from .combat import STARTING_DECK
+from .effects import EffectTotals, effect_totals
+
+# This block is only processed by type checkers, not at runtime
+if TYPE_CHECKING:
+    from .card import Card
+
+# --- Outcomes ---
+RUNNING = 0
+WIN = 1
+LOSS_DEFEATED = 2 # "You have been defeated!"
+LOSS_EMPTY_DRAW = 3 # "Draw pile is empty!"
+
+STARTING_HAND_SIZE = 5
+
+
+def card_effect(card: Card) -> EffectTotals:
+    """
+    Returns what a card does as plain numbers (damage, armor, energy, draw).
+    Raises ValueError for cards with conditional effects, which can't be vectorized.
+    """
+    try:
+        return effect_totals(card.definition.effects)
+    except ValueError as e:
+        raise ValueError(f"Card '{card.id}' can't be batch simulated: {e}") from None
+
+
+class BatchCombat:
+    """
+    N combats against one enemy each, simulated in lockstep.
+
+    Every game is stored as NumPy arrays instead of Player/Enemy objects, and
+    draws, card effects and enemy attacks are applied to all games at once.
+    The rules mirror CombatEngine.run() with the play_first_affordable policy,
+    and a game seeded with `seed` gets the same shuffle as
+    Player(rng=random.Random(seed)), so results match the scalar path exactly.
+
+    Every game uses the same deck list but its own shuffle. Piles hold indices
+    into that deck: `draw`, `hand` and `discard` are (N, deck size) arrays with
+    matching `*_len` counters, where the top of the draw pile is the last entry.
+    """
+
+    def __init__(
+        self,
+        deck: Sequence[Card],
+        seeds: Sequence[int],
+        enemy_hp: int | np.ndarray,
+        player_hp: int | np.ndarray = 20,
+        energy: int | np.ndarray = 3,
+        max_energy: int = 3,
+        enemy_attack: int = 10,
+        fast_shuffle: bool = False,
+    ):
+        """
+        Args:
+            deck (Sequence[Card]): The master deck shared by every game.
+            seeds (Sequence[int]): One shuffle seed per game.
+            enemy_hp (int | np.ndarray): Enemy HP, for all games or per game.
+            player_hp (int | np.ndarray): Player HP at the start of the combat.
+            energy (int | np.ndarray): Player energy at the start of the combat
+                (it is not refilled until the end of the first turn).
+            max_energy (int): Energy restored at the end of each turn.
+            enemy_attack (int): Damage the enemy deals each turn.
+            fast_shuffle (bool): Shuffle every game at once with a NumPy generator seeded
+                from `seeds`. Much faster for big batches, but the shuffles no longer
+                match the scalar Player for the same seed.
+        """
+        n = len(seeds)
+        size = len(deck)
+        self.n = n
+        self.deck_size = size
+        self.max_energy = max_energy
+        self.enemy_attack = enemy_attack
+
+        # --- Per-card lookup tables (indexed by deck position) ---
+        effects = [card_effect(card) for card in deck]
+        self.card_cost = np.array([card.cost for card in deck], dtype=np.int32)
+        self.card_damage = np.array([effect.damage for effect in effects], dtype=np.int32)
+        self.card_armor = np.array([effect.block for effect in effects], dtype=np.int32)
+        self.card_energy = np.array([effect.energy for effect in effects], dtype=np.int32)
+        self.card_draw = np.array([effect.draw for effect in effects], dtype=np.int32)
+        self.card_exhaust = np.array([card.exhaust for card in deck], dtype=bool)
+        self._max_card_draw = int(self.card_draw.max(initial=0))
+
+        # --- Per-game stats ---
+        self.hp = np.broadcast_to(np.asarray(player_hp, dtype=np.int32), (n,)).copy()
+        self.armor = np.zeros(n, dtype=np.int32)
+        self.energy = np.broadcast_to(np.asarray(energy, dtype=np.int32), (n,)).copy()
+        self.enemy_hp = np.broadcast_to(np.asarray(enemy_hp, dtype=np.int32), (n,)).copy()
+        self.turns = np.ones(n, dtype=np.int32)
+        self.outcome = np.full(n, RUNNING, dtype=np.int8)
+
+        # --- Piles ---
+        if fast_shuffle:
+            keys = np.random.default_rng(list(seeds)).random((n, size))
+            self.draw = np.argsort(keys, axis=1).astype(np.int16)
+        else:
+            self.draw = np.empty((n, size), dtype=np.int16)
+            for i, seed in enumerate(seeds):
+                # Same shuffle as Player.start_new_combat with random.Random(seed)
+                order = list(range(size))
+                random.Random(seed).shuffle(order)
+                self.draw[i] = order
+        self.draw_len = np.full(n, size, dtype=np.int32)
+        self.hand = np.zeros((n, size), dtype=np.int16)
+        self.hand_len = np.zeros(n, dtype=np.int32)
+        self.discard = np.zeros((n, size), dtype=np.int16)
+        self.discard_len = np.zeros(n, dtype=np.int32)
+
+        self._columns = np.arange(size)
+        for _ in range(STARTING_HAND_SIZE):
+            self._draw(np.flatnonzero(self.draw_len > 0))
+        self._check_defeat_at_start()
+
+    @classmethod
+    def from_catalog(cls, all_cards: dict, seeds: Sequence[int], enemy_hp, **kwargs) -> BatchCombat:
+        """Builds a batch using the standard starting deck from the card catalog."""
+        deck = [all_cards[card_id] for card_id, copies in STARTING_DECK for _ in range(copies)]
+        return cls(deck, seeds, enemy_hp, **kwargs)
+
+    @property
+    def won(self) -> np.ndarray:
+        """Boolean mask of the games the player has won."""
+        return self.outcome == WIN
+
+    @property
+    def active(self) -> np.ndarray:
+        """Boolean mask of the games that are still being played."""
+        return self.outcome == RUNNING
+
+    # --- Pile Operations ---
+
+    def _draw(self, rows: np.ndarray):
+        """Moves the top card of the draw pile into the hand for the given games."""
+        self.draw_len[rows] -= 1
+        cards = self.draw[rows, self.draw_len[rows]]
+        self.hand[rows, self.hand_len[rows]] = cards
+        self.hand_len[rows] += 1
+
+    def _play(self, rows: np.ndarray, slots: np.ndarray):
+        """Plays the card at hand position `slots` in each of the given games."""
+        cards = self.hand[rows, slots]
+        self.energy[rows] -= self.card_cost[cards]
+        self.enemy_hp[rows] -= self.card_damage[cards]
+        self.armor[rows] += self.card_armor[cards]
+        self.energy[rows] += self.card_energy[cards]
+
+        # Remove from hand, keeping the order of the remaining cards
+        source = self._columns + (self._columns >= slots[:, None])
+        np.minimum(source, self.deck_size - 1, out=source)
+        self.hand[rows] = np.take_along_axis(self.hand[rows], source, axis=1)
+        self.hand_len[rows] -= 1
+
+        # Draw effects, one card at a time until each game has drawn enough or runs out
+        draws = self.card_draw[cards]
+        for drawn in range(self._max_card_draw):
+            drawing = rows[(draws > drawn) & (self.draw_len[rows] > 0)]
+            if drawing.size == 0:
+                break
+            self._draw(drawing)
+
+        # Exhausted cards leave the combat; everything else is discarded
+        kept = ~self.card_exhaust[cards]
+        rows, cards = rows[kept], cards[kept]
+        self.discard[rows, self.discard_len[rows]] = cards
+        self.discard_len[rows] += 1
+
+    # --- Turn Phases ---
+
+    def _check_defeat_at_start(self):
+        """Ends games that are already decided before the first card is played."""
+        running = self.active
+        self.outcome[running & (self.enemy_hp <= 0)] = WIN
+        self.outcome[self.active & (self.hp <= 0)] = LOSS_DEFEATED
+
+    def _player_phase(self):
+        """Plays the left-most affordable card in every game until each one's turn ends."""
+        in_turn = self.active.copy()
+        while True:
+            rows = np.flatnonzero(in_turn)
+            if rows.size == 0:
+                return
+            in_hand = self._columns < self.hand_len[rows, None]
+            costs = self.card_cost[self.hand[rows]]
+            affordable = in_hand & (costs <= self.energy[rows, None])
+            has_affordable = affordable.any(axis=1)
+            # Same auto-end rule as CombatEngine.update()
+            stuck = (self.energy[rows] <= 0) & (in_hand & (costs > 0)).any(axis=1)
+            playing = has_affordable & ~stuck
+
+            in_turn[rows[~playing]] = False
+            rows = rows[playing]
+            if rows.size == 0:
+                return
+            self._play(rows, affordable[playing].argmax(axis=1))
+
+            won = rows[self.enemy_hp[rows] <= 0]
+            self.outcome[won] = WIN
+            in_turn[won] = False
+
+    def _enemy_phase(self):
+        """The enemy attacks, then the player's next turn starts with a draw."""
+        rows = np.flatnonzero(self.active)
+        # Armor absorbs damage first
+        absorbed = np.minimum(self.armor[rows], self.enemy_attack)
+        self.armor[rows] -= absorbed
+        self.hp[rows] -= self.enemy_attack - absorbed
+
+        defeated = self.hp[rows] <= 0
+        self.outcome[rows[defeated]] = LOSS_DEFEATED
+        rows = rows[~defeated]
+
+        self.energy[rows] = self.max_energy
+        empty = self.draw_len[rows] == 0
+        self.outcome[rows[empty]] = LOSS_EMPTY_DRAW
+        rows = rows[~empty]
+        self._draw(rows)
+        self.turns[rows] += 1
+
+    def run(self) -> BatchCombat:
+        """Plays every game in the batch to the end. Returns self for chaining."""
+        while self.active.any():
+            self._player_phase()
+            if not self.active.any():
+                break
+            self._enemy_phase()
+        return self
@@ -0,0 +1,379 @@
+from __future__ import annotations
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+from typing import Callable, NamedTuple, Optional
+
+import pygame
+
+from .assets import assets, artwork_files
+from .atlas import CardAtlas
+from .card import Card, load_cards
+from .combat import Run, build_starting_deck, reset_game
+from .enemy import Enemy
+from .hittest import HitIndex
+from .layout import UILayout
+from .log import log, WARNING
+from .player import Player
+from .render import DirtyRenderer
+from .simulate import DEFAULT_CARDS_PATH, collect_run_stats
+from .ui import Button, draw_text
+
+SCREEN_SIZE = (1280, 720) # Same as main.py
+HAND_SIZES = (5, 20, 50)
+DEFAULT_THRESHOLD = 0.10 # A result more than 10% worse than the baseline is a regression
+FORMAT_VERSION = 1
+
+
+class Benchmark(NamedTuple):
+    """
+    One measurement. `setup` prepares everything that shouldn't be timed and returns
+    the operation to time; each call of the operation returns how many items it processed.
+    """
+    name: str
+    setup: Callable[[dict], Callable[[], int]] # Called with the card catalog
+    unit: str # "items/s" (throughput, higher is better) or "ms" (latency per call, lower is better)
+    description: str
+
+    @property
+    def higher_is_better(self) -> bool:
+        return self.unit != "ms"
+
+
+def measure(operation: Callable[[], int], repeat: int = 5, min_time: float = 0.2) -> tuple[float, int]:
+    """
+    Times `operation` like timeit: it is called in batches big enough to take at least
+    `min_time` seconds, and the fastest of `repeat` batches is kept, since anything
+    slower was only slowed down by the rest of the system.
+    Returns (seconds per call, items per call).
+    """
+    items = operation() # Warm-up, and it tells us how long one call takes
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            operation()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        # Aim straight for min_time, but grow at least 2x so a noisy first batch can't stall this
+        number = number * 10 if elapsed <= 0 else max(number * 2, int(number * min_time / elapsed) + 1)
+
+    best = elapsed
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            operation()
+        best = min(best, time.perf_counter() - start)
+    return best / number, items
+
+
+# --- Engine ---
+
+def _load_cards(all_cards: dict) -> Callable[[], int]:
+    def operation():
+        return len(load_cards(DEFAULT_CARDS_PATH))
+    return operation
+
+
+def _card_copy(all_cards: dict) -> Callable[[], int]:
+    templates = list(all_cards.values())
+
+    def operation():
+        for card in templates:
+            card.copy()
+        return len(templates)
+    return operation
+
+
+def _reset_game(all_cards: dict) -> Callable[[], int]:
+    player = Player(rng=random.Random(0))
+
+    def operation():
+        reset_game(player, all_cards, *SCREEN_SIZE, combat_count=0)
+        return 1
+    return operation
+
+
+def _combats(all_cards: dict) -> Callable[[], int]:
+    run = Run(all_cards, seed=0)
+    max_combats = 10
+
+    def operation():
+        run.restart()
+        return collect_run_stats(lambda _: run, lambda run: run.engine.run(), 1, max_combats).combats # The lost combat counts too
+    return operation
+
+
+# --- Rendering and startup ---
+
+def _card_faces(all_cards: dict) -> Callable[[], int]:
+    """Builds every card face from scratch: artwork, text and wrap_text."""
+    templates = list(all_cards.values())
+
+    def operation():
+        Card.clear_image_caches()
+        for card in templates:
+            card.load_image()
+        return len(templates)
+    return operation
+
+
+def _startup(all_cards: dict) -> Callable[[], int]:
+    """What main() does before the first frame: load the catalog, its faces and the atlas."""
+    def operation():
+        Card.clear_image_caches()
+        cards = load_cards(DEFAULT_CARDS_PATH)
+        assets.preload_now(artwork_files(cards.values()))
+        for card in cards.values():
+            card.load_image()
+        CardAtlas(cards.values())
+        return 1
+    return operation
+
+
+def _player_turn_frame(hand_size: int) -> Callable[[dict], Callable[[], int]]:
+    """
+    A PLAYER_TURN frame with `hand_size` cards in hand, repainted in full: the player,
+    enemy, stats, hand and end turn button, as main() draws them. The hovered card moves
+    along the hand every frame, like a mouse sweeping over it.
+    """
+    def setup(all_cards: dict) -> Callable[[], int]:
+        screen = pygame.display.get_surface()
+        layout = UILayout(*SCREEN_SIZE)
+        atlas = CardAtlas(all_cards.values())
+        templates = [card for card in all_cards.values() if card.image is not None]
+        hand = [templates[i % len(templates)].copy() for i in range(hand_size)]
+        for card, topleft in zip(hand, layout.hand_positions(hand_size)):
+            card.rect = card.image.get_rect(topleft=topleft)
+
+        player = Player(rng=random.Random(0))
+        player.set_deck(build_starting_deck(all_cards))
+        player.rect.center = layout.player_avatar_area.center
+        enemy = Enemy(0, 0, hp=30)
+        enemy.move_to(layout.enemy_area.center)
+        end_turn_button = Button(0, 0, 150, 50, "End Turn")
+        end_turn_button.rect = layout.end_turn_area
+        hovered = [None]
+
+        def draw_stats(surface):
+            x, y = layout.player_stats_area.topleft
+            draw_text(surface, f"HP: {player.hp} / {player.max_hp}", x, y, font_size=32, color=(200, 220, 200))
+            draw_text(surface, f"Armor: {player.armor}", x, y + 30, font_size=32, color=(180, 180, 255))
+            draw_text(surface, f"Energy: {player.energy} / {player.max_energy}", x, y + 60, font_size=32, color=(200, 200, 255))
+
+        renderer = DirtyRenderer(background=(20, 20, 30))
+        renderer.add("player", player.draw, lambda: player.rect)
+        renderer.add("enemy", enemy.draw, lambda: enemy.rect)
+        renderer.add("player_stats", draw_stats, lambda: layout.player_stats_area)
+        renderer.add("hand", lambda surface: atlas.draw_cards(surface, hand, hovered[0]),
+                     lambda: hand[0].rect.unionall([card.rect for card in hand]).inflate(6, 6))
+        renderer.add("end_turn_button", end_turn_button.draw, lambda: end_turn_button.rect)
+        frame = [0]
+
+        def operation():
+            frame[0] += 1
+            hovered[0] = hand[frame[0] % hand_size]
+            atlas.reset_stats()
+            renderer.invalidate()
+            pygame.display.update(renderer.render(screen))
+            return 1
+        return operation
+    return setup
+
+
+def _hover_lookups(all_cards: dict) -> Callable[[], int]:
+    """Hit tests over the biggest hand and the buttons, with the mouse sweeping across the hand area."""
+    layout = UILayout(*SCREEN_SIZE)
+    hand_size = max(HAND_SIZES)
+    elements = [(i, pygame.Rect(topleft, (100, 150))) for i, topleft in enumerate(layout.hand_positions(hand_size))]
+    elements.append(("end_turn", layout.end_turn_area))
+    index = HitIndex()
+    index.rebuild(elements)
+    rng = random.Random(0)
+    area = layout.card_zone
+    points = [(rng.randrange(area.left, area.right), rng.randrange(area.top, area.bottom)) for _ in range(1000)]
+
+    def operation():
+        for pos in points:
+            index.hit(pos)
+        return len(points)
+    return operation
+
+
+BENCHMARKS = [
+    Benchmark("load_cards", _load_cards, "items/s", "cards loaded per second by load_cards()"),
+    Benchmark("card_copy", _card_copy, "items/s", "Card.copy() calls per second"),
+    Benchmark("reset_game", _reset_game, "ms", "reset_game() latency"),
+    Benchmark("combats", _combats, "items/s", "headless combats simulated per second"),
+    Benchmark("card_faces", _card_faces, "items/s", "card faces built per second (load_image, wrap_text)"),
+    Benchmark("startup", _startup, "ms", "catalog, faces and atlas loaded, as at startup"),
+] + [
+    Benchmark(f"frame_hand_{size}", _player_turn_frame(size), "ms", f"full PLAYER_TURN frame with {size} cards in hand")
+    for size in HAND_SIZES
+] + [
+    Benchmark("hover_lookups", _hover_lookups, "items/s", f"hit tests per second with {max(HAND_SIZES)} cards in hand"),
+]
+
+
+def _open_display():
+    """
+    Opens a display Surface to draw into if there isn't one. Unless a video driver
+    was chosen explicitly, SDL's dummy driver is used, so no window appears; the
+    environment variable is only set while the display is opened.
+    """
+    if pygame.display.get_surface() is not None:
+        return
+    chosen = "SDL_VIDEODRIVER" in os.environ
+    if not chosen:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+    try:
+        pygame.display.init()
+        pygame.display.set_mode(SCREEN_SIZE)
+    finally:
+        if not chosen:
+            del os.environ["SDL_VIDEODRIVER"]
+
+
+def run_benchmarks(names: Optional[list[str]] = None, repeat: int = 5, min_time: float = 0.2,
+                   on_result: Optional[Callable[[Benchmark, float], None]] = None) -> dict:
+    """
+    Runs the benchmarks (all of them, or those in `names`) and returns the results
+    in the baseline format: {"results": {name: {"value", "unit", "higher_is_better"}}, ...}.
+    Uses the current display Surface, or opens a headless one (see _open_display()).
+    """
+    selected = [bench for bench in BENCHMARKS if names is None or bench.name in names]
+    unknown = set(names or ()) - {bench.name for bench in BENCHMARKS}
+    if unknown:
+        raise ValueError(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    _open_display()
+    pygame.init()
+    all_cards = load_cards(DEFAULT_CARDS_PATH)
+    for card in all_cards.values():
+        card.load_image()
+
+    results = {}
+    for bench in selected:
+        seconds, items = measure(bench.setup(all_cards), repeat, min_time)
+        value = seconds * 1000 if bench.unit == "ms" else items / seconds
+        results[bench.name] = {"value": value, "unit": bench.unit, "higher_is_better": bench.higher_is_better}
+        if on_result:
+            on_result(bench, value)
+
+    return {
+        "version": FORMAT_VERSION,
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float = DEFAULT_THRESHOLD) -> list[tuple[str, float, float, float, bool]]:
+    """
+    Compares two result sets from run_benchmarks(). Returns (name, baseline value,
+    current value, change, regressed) for every benchmark in both, where `change` is
+    the relative slowdown (positive = worse, whatever the unit) and a benchmark has
+    regressed if it got worse by more than `threshold`.
+    """
+    rows = []
+    for name, old in baseline["results"].items():
+        new = current["results"].get(name)
+        if new is None or old["value"] <= 0 or new["value"] <= 0:
+            continue
+        if old["higher_is_better"]:
+            change = old["value"] / new["value"] - 1 # Time per item, relative to the baseline
+        else:
+            change = new["value"] / old["value"] - 1
+        rows.append((name, old["value"], new["value"], change, change > threshold))
+    return rows
+
+
+def load_results(path: str) -> dict:
+    with open(path, "r") as f:
+        results = json.load(f)
+    if results.get("version") != FORMAT_VERSION:
+        raise ValueError(f"{path} is not a version {FORMAT_VERSION} benchmark file")
+    return results
+
+
+def save_results(results: dict, path: str):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def print_comparison(rows: list, threshold: float) -> bool:
+    """Prints a comparison table. Returns True if anything regressed."""
+    print(f"{'benchmark':<16} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, old, new, change, regressed in rows:
+        flag = f"  REGRESSION (> {threshold:.0%})" if regressed else ""
+        print(f"{name:<16} {old:>12.4g} {new:>12.4g} {change:>+8.1%}{flag}")
+    return any(row[4] for row in rows)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Command-line entry point, run from the project root:
+        python -m src.bench run --save benchmarks/baseline.json
+        python -m src.bench run --compare benchmarks/baseline.json
+        python -m src.bench compare benchmarks/baseline.json benchmarks/latest.json
+    Exits with status 1 if a comparison finds a regression.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the engine, rendering and startup hot paths.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("names", nargs="*", help="benchmarks to run (default: all)")
+    run_parser.add_argument("--save", metavar="PATH", help="write the results to a JSON file")
+    run_parser.add_argument("--compare", metavar="BASELINE", help="compare the results with a saved baseline")
+    run_parser.add_argument("--repeat", type=int, default=5, help="timed batches per benchmark (the best is kept)")
+    run_parser.add_argument("--min-time", type=float, default=0.2, help="seconds each batch runs for at least")
+    run_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown, e.g. 0.1 for 10%%")
+    run_parser.add_argument("--list", action="store_true", help="list the benchmarks and exit")
+
+    compare_parser = commands.add_parser("compare", help="compare two saved result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown, e.g. 0.1 for 10%%")
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        rows = compare(load_results(args.baseline), load_results(args.current), args.threshold)
+        return 1 if print_comparison(rows, args.threshold) else 0
+
+    if args.list:
+        for bench in BENCHMARKS:
+            print(f"{bench.name:<16} {bench.unit:<8} {bench.description}")
+        return 0
+
+    baseline = load_results(args.compare) if args.compare else None
+
+    def report(bench: Benchmark, value: float):
+        print(f"{bench.name:<16} {value:>12.4g} {bench.unit:<8} {bench.description}")
+
+    log.configure(level=WARNING) # reset_game() logs every call; measure it the way a headless run uses it
+    try:
+        results = run_benchmarks(args.names or None, args.repeat, args.min_time, report)
+    finally:
+        pygame.quit()
+
+    if args.save:
+        save_results(results, args.save)
+        print(f"Saved to {args.save}")
+    if baseline:
+        print()
+        return 1 if print_comparison(compare(baseline, results, args.threshold), args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+from __future__ import annotations
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+import zipfile
+from typing import Optional
+
+BUNDLE_NAME = "game.bundle" # Fetched by index.html, next to it
+MANIFEST_NAME = "manifest.json"
+FORMAT_VERSION = 1
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# --- What goes in the bundle ---
+# Directories are walked recursively. Tests and dev-only tools are left out.
+BUNDLE_FILES = ["main.py"]
+BUNDLE_DIRS = ["src", os.path.join("src", "data"), os.path.join("assets", "images")]
+EXCLUDED_NAMES = {"run_dev.py"} # Needs watchdog, which the browser doesn't have
+CODE_DIRS = {"src"} # Only .py files are taken from these (not recursively)
+
+# Fixed zip metadata, so the same inputs always give the same bytes
+ZIP_DATE = (1980, 1, 1, 0, 0, 0)
+ZIP_PERMISSIONS = 0o644 << 16
+ZIP_SYSTEM_UNIX = 3
+
+
+class BundleError(Exception):
+    """The bundle is malformed or a file doesn't match its manifest hash."""
+
+
+def collect_files(root: str = PROJECT_ROOT) -> list[str]:
+    """The files to bundle, as sorted '/'-separated paths relative to `root`."""
+    paths = set(BUNDLE_FILES)
+    for directory in BUNDLE_DIRS:
+        base = os.path.join(root, directory)
+        if not os.path.isdir(base):
+            continue
+        if directory in CODE_DIRS:
+            paths.update(os.path.join(directory, name) for name in os.listdir(base)
+                         if name.endswith(".py") and not name.startswith("test_") and name not in EXCLUDED_NAMES)
+            continue
+        for folder, subfolders, names in os.walk(base):
+            subfolders[:] = [name for name in subfolders if name != "__pycache__"]
+            paths.update(os.path.relpath(os.path.join(folder, name), root) for name in names)
+    return sorted(path.replace(os.sep, "/") for path in paths if os.path.isfile(os.path.join(root, path)))
+
+
+def build_bundle(root: str = PROJECT_ROOT, files: Optional[list[str]] = None) -> tuple[bytes, dict]:
+    """
+    Packs the files into one deflated zip with a manifest of their SHA-256 hashes.
+    Reproducible: entries are sorted and every timestamp and permission is fixed,
+    so building the same tree twice gives byte-identical bundles.
+    Returns (bundle bytes, manifest).
+    """
+    files = collect_files(root) if files is None else sorted(files)
+    contents = {}
+    for path in files:
+        with open(os.path.join(root, path), "rb") as f:
+            contents[path] = f.read()
+
+    entries = {path: {"sha256": hashlib.sha256(data).hexdigest(), "size": len(data)} for path, data in contents.items()}
+    digest = hashlib.sha256("".join(f"{path}\0{entry['sha256']}\n" for path, entry in entries.items()).encode()).hexdigest()
+    manifest = {"version": FORMAT_VERSION, "digest": digest, "files": entries}
+
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, "w") as archive:
+        _write_entry(archive, MANIFEST_NAME, json.dumps(manifest, indent=1, sort_keys=True).encode())
+        for path, data in contents.items():
+            _write_entry(archive, path, data)
+    return output.getvalue(), manifest
+
+
+def _write_entry(archive: zipfile.ZipFile, path: str, data: bytes):
+    info = zipfile.ZipInfo(path, date_time=ZIP_DATE)
+    info.compress_type = zipfile.ZIP_DEFLATED
+    info.external_attr = ZIP_PERMISSIONS
+    info.create_system = ZIP_SYSTEM_UNIX
+    archive.writestr(info, data, compresslevel=9)
+
+
+def read_manifest(archive: zipfile.ZipFile) -> dict:
+    try:
+        manifest = json.loads(archive.read(MANIFEST_NAME))
+    except (KeyError, ValueError) as e:
+        raise BundleError(f"No readable {MANIFEST_NAME} in the bundle: {e}") from e
+    if manifest.get("version") != FORMAT_VERSION:
+        raise BundleError(f"Unsupported bundle version {manifest.get('version')}")
+    return manifest
+
+
+def mount(source: str | bytes, target: str = ".") -> dict:
+    """
+    Unpacks a bundle into `target` (in the browser, PyScript's in-memory filesystem),
+    checking every file against its manifest hash, so the game finds its code, cards.json
+    and artwork at the usual relative paths. Files already there with the right
+    contents are left alone. Returns the manifest.
+
+    Args:
+        source (str | bytes): Path to the bundle, or its bytes.
+        target (str): Directory to unpack into.
+    """
+    with zipfile.ZipFile(io.BytesIO(source) if isinstance(source, bytes) else source) as archive:
+        manifest = read_manifest(archive)
+        for path, entry in manifest["files"].items():
+            parts = path.split("/")
+            if path.startswith("/") or ".." in parts or ":" in parts[0]:
+                raise BundleError(f"Refusing to unpack {path!r} outside the target directory")
+            data = archive.read(path)
+            if hashlib.sha256(data).hexdigest() != entry["sha256"]:
+                raise BundleError(f"{path} doesn't match its manifest hash")
+
+            destination = os.path.join(target, *parts)
+            if os.path.isfile(destination):
+                with open(destination, "rb") as f:
+                    if hashlib.sha256(f.read()).hexdigest() == entry["sha256"]:
+                        continue
+            os.makedirs(os.path.dirname(destination) or ".", exist_ok=True)
+            with open(destination, "wb") as f:
+                f.write(data)
+    return manifest
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Command-line entry point:
+        python -m src.bundle build [--output game.bundle]
+        python -m src.bundle list game.bundle
+    """
+    parser = argparse.ArgumentParser(description="Pack the web build into a single archive.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build_parser = commands.add_parser("build", help="build the bundle from the project tree")
+    build_parser.add_argument("--output", default=os.path.join(PROJECT_ROOT, BUNDLE_NAME), help="where to write the bundle")
+    build_parser.add_argument("--root", default=PROJECT_ROOT, help="project root to bundle")
+    list_parser = commands.add_parser("list", help="show a bundle's manifest")
+    list_parser.add_argument("path")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        data, manifest = build_bundle(args.root)
+        with open(args.output, "wb") as f:
+            f.write(data)
+        raw_size = sum(entry["size"] for entry in manifest["files"].values())
+        print(f"Bundled {len(manifest['files'])} files ({raw_size} bytes) into {args.output} ({len(data)} bytes)")
+        print(f"Digest: {manifest['digest']}")
+        return 0
+
+    with zipfile.ZipFile(args.path) as archive:
+        manifest = read_manifest(archive)
+    for path, entry in manifest["files"].items():
+        print(f"{entry['sha256'][:12]}  {entry['size']:>8}  {path}")
+    print(f"Digest: {manifest['digest']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
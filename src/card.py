@@ -1,115 +1,236 @@
-import pygame
-from typing import Optional
-import os
-from ui import wrap_text # Import the new text wrapper
+from __future__ import annotations
+from typing import TYPE_CHECKING, Optional
+import json
+from .effects import Effect, compile_effects, effect_specs
+from .log import log
+from .trace import tracer
 
-class Card:
-    """Represents a single card in the game."""
+# This block is only processed by type checkers, not at runtime
+if TYPE_CHECKING:
+    import pygame
+
+# pygame and the rendering modules (ui, assets) are only imported once a card is drawn,
+# so the rules, simulations and tools can load cards without pygame.
+
+class CardDefinition:
+    """
+    The static part of a card, as defined in cards.json.
 
-    # Class-level set to track filenames that have already failed to load
-    _failed_to_load_artwork = set()
+    Definitions are immutable and interned: every card with the same data shares
+    one CardDefinition, so a deck of hundreds of cards only stores its definitions once.
+    Use CardDefinition.get() rather than creating them directly.
+    """
+
+    __slots__ = ("id", "name", "cost", "type", "value", "description", "artwork_filename", "effects", "exhaust")
+
+    # Interning table: the card's data -> its shared definition
+    _interned: dict[tuple, 'CardDefinition'] = {}
 
     def __init__(self, data: dict):
-        self.id: str = data["id"]
-        self.name: str = data["name"]
-        self.cost: int = data["cost"]
-        self.type: str = data["type"]
-        self.value: int = data.get("value") # Use .get() for optional fields
-        self.description: str = data["description"]
-        self.artwork_filename: str = data["artwork"]
-        # We will load the pygame.Surface in a separate method
-        self.image: Optional[pygame.Surface] = None
+        set_field = object.__setattr__ # Bypass our own __setattr__, which forbids changes
+        set_field(self, "id", data["id"])
+        set_field(self, "name", data["name"])
+        set_field(self, "cost", data["cost"])
+        set_field(self, "type", data["type"])
+        set_field(self, "value", data.get("value")) # Use .get() for optional fields
+        set_field(self, "description", data["description"])
+        set_field(self, "artwork_filename", data["artwork"])
+        # What the card does, compiled once here into (handler, args) opcodes
+        set_field(self, "effects", compile_effects(effect_specs(data)))
+        set_field(self, "exhaust", bool(data.get("exhaust", False))) # Removed from the combat once played
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"CardDefinition is immutable (tried to set '{name}')")
+
+    def __repr__(self) -> str:
+        return f"CardDefinition({self.id!r}, {self.name!r})"
+
+    @classmethod
+    def get(cls, data: dict) -> 'CardDefinition':
+        """Returns the shared definition for this card data, creating it the first time it's seen."""
+        key = (data["id"], data["name"], data["cost"], data["type"], data.get("value"), data["description"], data["artwork"],
+               json.dumps(data.get("effects"), sort_keys=True), bool(data.get("exhaust", False)))
+        definition = cls._interned.get(key)
+        if definition is None:
+            definition = cls(data)
+            cls._interned[key] = definition
+        return definition
+
+
+class Card:
+    """
+    Represents a single card in the game: one copy in a deck, hand or pile.
+
+    Everything static lives on the shared CardDefinition; an instance only keeps
+    its own mutable state (cost override, upgrades, position and its face), so it
+    is small and copies in O(1).
+    """
+
+    __slots__ = ("definition", "cost_override", "upgrades", "rect", "_image", "_face_key", "_wants_image")
+
+    # Process-wide cache shared by every card instance: face key -> the composed card
+    # face (artwork + name, cost and description). The artwork itself lives in assets.py.
+    _face_cache: dict[tuple, pygame.Surface] = {}
+    faces_built = 0 # Card faces composed so far (each is a new Surface), for the profiler
+    tooltips_built = 0 # Tooltip backgrounds allocated so far (a new Surface every time one is drawn)
+
+    def __init__(self, data: 'dict | CardDefinition'):
+        self.definition: CardDefinition = data if isinstance(data, CardDefinition) else CardDefinition.get(data)
+        self.cost_override: Optional[int] = None # Set when the cost is modified in play
+        self.upgrades: int = 0 # Times this copy has been upgraded
         # Add a rect for positioning and collision detection
         self.rect: Optional[pygame.Rect] = None
+        # The pygame.Surface is fetched from the face cache in load_image()
+        self._image: Optional[pygame.Surface] = None
+        self._face_key: Optional[tuple] = None # The face_key self._image was built for
+        self._wants_image = False
+
+    # --- Static fields, shared through the definition ---
+    @property
+    def id(self) -> str:
+        return self.definition.id
+
+    @property
+    def name(self) -> str:
+        return self.definition.name
+
+    @property
+    def type(self) -> str:
+        return self.definition.type
+
+    @property
+    def value(self) -> Optional[int]:
+        return self.definition.value
+
+    @property
+    def description(self) -> str:
+        return self.definition.description
+
+    @property
+    def artwork_filename(self) -> str:
+        return self.definition.artwork_filename
+
+    @property
+    def effects(self) -> tuple[Effect, ...]:
+        return self.definition.effects
 
-    def copy(self) -> 'Card':
-        """Creates a new Card instance with the same data."""
-        # Re-create the original data structure that __init__ expects
-        data = {
-            "id": self.id,
-            "name": self.name,
-            "cost": self.cost,
-            "type": self.type,
-            "value": self.value,
-            "description": self.description,
-            "artwork": self.artwork_filename
-        }
-        new_card = Card(data)
-        # If the original card's artwork failed to load, mark the new one as failed too
-        # to prevent it from trying (and printing an error) again.
-        if self.artwork_filename in Card._failed_to_load_artwork:
-            Card._failed_to_load_artwork.add(new_card.artwork_filename)
-        
-        new_card.load_image() # Now, load the image (or placeholder)
+    @property
+    def exhaust(self) -> bool:
+        return self.definition.exhaust
+
+    @property
+    def cost(self) -> int:
+        """The card's cost: its own override if it was modified in play, otherwise the definition's."""
+        return self.definition.cost if self.cost_override is None else self.cost_override
+
+    @cost.setter
+    def cost(self, cost: int):
+        self.cost_override = None if cost == self.definition.cost else cost
+
+    @property
+    def face_key(self) -> tuple:
+        """Everything that is drawn on the card's face. Cards with equal keys share one surface."""
+        return (self.definition, self.cost)
+
+    @property
+    def image(self) -> Optional[pygame.Surface]:
+        """
+        The card's face, shared with every card that looks the same.
+        If a displayed field changed since it was fetched (e.g. the cost was modified
+        in play), the matching face is fetched or built on access.
+        """
+        if self._wants_image and self._face_key != self.face_key:
+            self.load_image()
+        return self._image
+
+    @image.setter
+    def image(self, surface: Optional[pygame.Surface]):
+        self._image = surface
+        self._face_key = self.face_key if surface is not None else None
+
+    def copy(self, load_image: bool = True) -> 'Card':
+        """
+        Creates a new Card instance with the same definition and cost, in O(1).
+        The copy's image comes from the shared face cache the first time it is
+        drawn, so copying never touches the disk or re-renders text.
+        Pass load_image=False for headless use, where no artwork is needed.
+        """
+        new_card = Card.__new__(Card)
+        new_card.definition = self.definition
+        new_card.cost_override = self.cost_override
+        new_card.upgrades = self.upgrades
+        new_card.rect = None
+        new_card._wants_image = load_image
+        if load_image:
+            new_card._image = self._image # Same face, shared right away (None if not loaded yet)
+            new_card._face_key = self._face_key
+        else:
+            new_card._image = None
+            new_card._face_key = None
         return new_card
 
+    @tracer.traced("Card.load_image", category="assets")
     def load_image(self):
-        """Loads the card's image from the artwork filename."""
+        """Fetches the card's face from the shared cache, building it on first use."""
+        self._wants_image = True
+        key = self.face_key
+        face = Card._face_cache.get(key)
+        if face is None:
+            face = self._render_face()
+            Card._face_cache[key] = face
+            Card.faces_built += 1
+        self._image = face
+        self._face_key = key
+
+    @classmethod
+    def clear_image_caches(cls):
+        """Forgets every loaded artwork and card face (e.g. after the display is re-created)."""
+        from .assets import assets
+        assets.clear()
+        cls._face_cache.clear()
+
+    def _render_face(self) -> pygame.Surface:
+        """Composes the card's face: the artwork (or a placeholder) with its text on top."""
+        import pygame
+        from .assets import assets
+        from .ui import wrap_text, get_font
+        artwork = assets.get(self.artwork_filename) # Preloaded at startup, or loaded once on first use
+        if artwork is not None:
+            image = artwork.copy() # The artwork is shared, so draw the text on a copy
+        else:
+            # Create a placeholder surface if the image failed to load
+            image = pygame.Surface((100, 150), pygame.SRCALPHA)
+            image.fill((50, 50, 50)) # Dark grey background
+            pygame.draw.rect(image, (100, 100, 100), image.get_rect(), 3) # Border
+
+        # --- Render text directly onto the image ---
         try:
-            # --- For web deployment, paths must be relative to the index.html file ---
-            base_path = os.path.join('assets', 'images', 'cards')
-            # Construct the full path to the image
-            image_path = os.path.join(base_path, self.artwork_filename)
-            self.image = pygame.image.load(image_path).convert_alpha()
-
-            # --- Render text directly onto the loaded image ---
-            try:
-                font_small = pygame.font.Font(None, 20)
-            except pygame.error: # Fallback if default font fails
-                font_small = pygame.font.SysFont("sans", 20)
-
-            font_large = pygame.font.Font(None, 24)
-
-            # Render card name
-            name_surf = font_large.render(self.name, True, (255, 255, 255))
-            name_rect = name_surf.get_rect(center=(self.image.get_width() // 2, 20))
-            self.image.blit(name_surf, name_rect)
-
-            # Render card cost
-            cost_surf = font_large.render(str(self.cost), True, (255, 255, 0)) # Yellow cost
-            cost_rect = cost_surf.get_rect(topleft=(10, 10))
-            self.image.blit(cost_surf, cost_rect)
-
-            # Render description text
-            desc_area_y = self.image.get_height() * 0.6 # Start description text 60% down the card
-            desc_padding = 8
-            desc_max_width = self.image.get_width() - (desc_padding * 2)
-            wrap_text(self.image, self.description, (desc_padding, desc_area_y), font_small, desc_max_width, color=(230, 230, 230))
-
-
-        except pygame.error as e:
-            # Only print the error once per filename to avoid flooding the console
-            if self.artwork_filename not in Card._failed_to_load_artwork:
-                print(f"Error loading image for card '{self.name}' at {image_path}: {e}")
-                Card._failed_to_load_artwork.add(self.artwork_filename)
-
-            # Optional: Create a placeholder surface if image fails to load
-            self.image = pygame.Surface((100, 150), pygame.SRCALPHA)
-            self.image.fill((50, 50, 50)) # Dark grey background
-            pygame.draw.rect(self.image, (100, 100, 100), self.image.get_rect(), 3) # Border
-
-            # --- Render placeholder text ---
-            font_small = pygame.font.Font(None, 20)
-            font_large = pygame.font.Font(None, 24)
-
-            # Render card name
-            name_surf = font_large.render(self.name, True, (255, 255, 255))
-            name_rect = name_surf.get_rect(center=(self.image.get_width() // 2, 20))
-            self.image.blit(name_surf, name_rect)
-
-            # Render card cost
-            cost_surf = font_large.render(str(self.cost), True, (255, 255, 0)) # Yellow cost
-            cost_rect = cost_surf.get_rect(topleft=(10, 10))
-            self.image.blit(cost_surf, cost_rect)
-
-            # Render description text on placeholder
-            desc_area_y = self.image.get_height() * 0.6
-            desc_padding = 8
-            desc_max_width = self.image.get_width() - (desc_padding * 2)
-            wrap_text(self.image, self.description, (desc_padding, desc_area_y), font_small, desc_max_width, color=(230, 230, 230))
+            font_small = get_font(20)
+        except pygame.error: # Fallback if default font fails
+            font_small = pygame.font.SysFont("sans", 20)
+
+        font_large = get_font(24)
+
+        # Render card name
+        name_surf = font_large.render(self.name, True, (255, 255, 255))
+        name_rect = name_surf.get_rect(center=(image.get_width() // 2, 20))
+        image.blit(name_surf, name_rect)
+
+        # Render card cost
+        cost_surf = font_large.render(str(self.cost), True, (255, 255, 0)) # Yellow cost
+        cost_rect = cost_surf.get_rect(topleft=(10, 10))
+        image.blit(cost_surf, cost_rect)
+
+        # Render description text
+        desc_area_y = image.get_height() * 0.6 # Start description text 60% down the card
+        desc_padding = 8
+        desc_max_width = image.get_width() - (desc_padding * 2)
+        wrap_text(image, self.description, (desc_padding, desc_area_y), font_small, desc_max_width, color=(230, 230, 230))
+        return image
 
     def draw(self, surface: pygame.Surface, is_hovered: bool = False):
         """Draws the card on the given surface."""
+        import pygame
         if not self.image or not self.rect:
             return
         # Draw the card image itself first
@@ -125,8 +246,19 @@ class Card:
                 border_radius=12
             )
 
+    def tooltip_rect(self) -> Optional[pygame.Rect]:
+        """The area the tooltip covers: centered just above the card."""
+        import pygame
+        if not self.rect:
+            return None
+        tooltip_width = 200
+        tooltip_height = 100
+        return pygame.Rect(self.rect.centerx - tooltip_width // 2, self.rect.top - tooltip_height - 5, tooltip_width, tooltip_height)
+
     def draw_tooltip(self, surface: pygame.Surface):
         """Draws the card's description tooltip, meant to be called for the hovered card."""
+        import pygame
+        from .ui import text_cache
         if not self.rect:
             return
         # --- Draw description tooltip on hover ---
@@ -134,15 +266,34 @@ class Card:
         tooltip_width = 200
         tooltip_height = 100
         tooltip_surf = pygame.Surface((tooltip_width, tooltip_height), pygame.SRCALPHA)
+        Card.tooltips_built += 1
         tooltip_surf.fill((20, 20, 30, 220)) # Dark, semi-transparent background
         pygame.draw.rect(tooltip_surf, (150, 150, 150), tooltip_surf.get_rect(), 1, border_radius=5)
 
         # Render the description text (you might need a text wrapping function for longer descriptions)
-        font = pygame.font.Font(None, 22)
-        desc_surf = font.render(self.description, True, (230, 230, 230))
+        desc_surf = text_cache.render(self.description, 22, (230, 230, 230))
         desc_rect = desc_surf.get_rect(center=(tooltip_width // 2, tooltip_height // 2))
         tooltip_surf.blit(desc_surf, desc_rect)
 
         # Position the tooltip above the card
-        tooltip_pos = (self.rect.centerx - tooltip_width // 2, self.rect.top - tooltip_height - 5)
-        surface.blit(tooltip_surf, tooltip_pos)
\ No newline at end of file
+        surface.blit(tooltip_surf, self.tooltip_rect())
+
+
+# A Card is one instance of a CardDefinition; this name makes that explicit where it helps.
+CardInstance = Card
+
+
+def load_cards(json_path: str = 'src/data/cards.json') -> dict[str, Card]:
+    """Loads all card definitions from the JSON file."""
+    try:
+        # In PyScript, the path is relative to the root where files are fetched.
+        with open(json_path, "r") as f:
+            all_card_data = json.load(f)
+            # Create a dictionary of Card objects, keyed by their ID
+            return {data["id"]: Card(data) for data in all_card_data}
+    except FileNotFoundError:
+        log.error("cards.not_found", "Error: cards.json not found!", path=json_path)
+        return {}
+    except json.JSONDecodeError:
+        log.error("cards.invalid", "Error: Could not decode cards.json!", path=json_path)
+        return {}
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+
+class FixedTimestep:
+    """
+    Runs the game simulation in fixed steps, independent of the frame rate.
+
+    Each frame, the real time that passed is added to an accumulator and the
+    simulation is stepped as many whole `step`s as fit in it. What's left over
+    becomes `alpha`, the fraction of a step to interpolate by when drawing, so
+    motion stays smooth even when the frame rate isn't a multiple of the step rate.
+    """
+
+    def __init__(self, step: float = 1 / 60, max_steps: int = 15):
+        """
+        Args:
+            step (float): Length of one simulation step, in seconds.
+            max_steps (int): Most steps run for one frame. After a very long frame
+                (e.g. the browser tab was in the background) the rest is dropped
+                rather than stalling the game to catch up.
+        """
+        self.step = step
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.fast_forward = False # Skip enemy turn animations and timers
+        self.steps_run = 0 # Total steps run so far
+
+    def advance(self, elapsed: float) -> int:
+        """Adds `elapsed` seconds of real time. Returns how many steps to simulate this frame."""
+        self.accumulator += elapsed
+        steps = int(self.accumulator / self.step)
+        if steps > self.max_steps:
+            steps = self.max_steps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.step
+        self.steps_run += steps
+        return steps
+
+    @property
+    def alpha(self) -> float:
+        """How far into the next step we are (0 to 1), for interpolating positions when drawing."""
+        return min(self.accumulator / self.step, 1.0)
+
+    def reset(self):
+        """Drops any accumulated time, e.g. after a pause."""
+        self.accumulator = 0.0
@@ -0,0 +1,269 @@
+from __future__ import annotations
+import hashlib
+import random
+from typing import TYPE_CHECKING, Callable, Optional
+
+from .enemy import Enemy
+from .log import log
+from .player import Player
+from .trace import tracer
+
+# This block is only processed by type checkers, not at runtime
+if TYPE_CHECKING:
+    from .card import Card
+
+# --- Game States ---
+# The game can only be in one of these states at a time.
+# - PLAYER_TURN: Waiting for player input (playing cards, ending turn).
+# - ENEMY_ANNOUNCE: Brief pause to show "Enemy's Turn".
+# - ENEMY_ATTACK: The enemy performs its attack animation and logic.
+# - ENEMY_END: The enemy turn ends, player's turn begins.
+# - GAME_OVER: The player has lost, showing restart/quit options.
+# - COMBAT_WIN: The player has won the combat, showing next/quit options.
+PLAYER_TURN = "PLAYER_TURN"
+ENEMY_ANNOUNCE = "ENEMY_ANNOUNCE"
+ENEMY_ATTACK = "ENEMY_ATTACK"
+ENEMY_END = "ENEMY_END"
+GAME_OVER = "GAME_OVER"
+COMBAT_WIN = "COMBAT_WIN"
+
+ENEMY_STATES = (ENEMY_ANNOUNCE, ENEMY_ATTACK, ENEMY_END)
+
+# --- Run Setup ---
+STARTING_DECK = (("card_001", 5), ("card_002", 5)) # (card id, number of copies)
+BASE_ENEMY_HP = 10 # The HP of the first enemy
+ENEMY_HP_SCALING = 0.25 # 25% increase per combat
+
+
+def enemy_hp_for_combat(combat_count: int) -> int:
+    """Returns the enemy HP for the given (zero-based) combat number."""
+    return int(BASE_ENEMY_HP * (1 + ENEMY_HP_SCALING * combat_count))
+
+
+def combat_seed(run_seed: int, combat_serial: int) -> int:
+    """
+    Derives the shuffle seed for one combat of a seeded run.
+    Every combat gets its own seed, so a combat can be replayed without
+    replaying the ones before it (see replay.py).
+    """
+    digest = hashlib.sha256(f"combat:{run_seed}:{combat_serial}".encode()).digest()
+    return int.from_bytes(digest[:8], "little")
+
+
+def build_starting_deck(all_cards: dict, load_images: bool = True) -> list[Card]:
+    """
+    Builds a fresh starting deck from the card templates.
+    It's crucial that each card is a unique object, so every entry is a copy.
+    """
+    templates = [all_cards.get(card_id) for card_id, _ in STARTING_DECK]
+    starting_deck = []
+    if all(templates):
+        for template, (_, copies) in zip(templates, STARTING_DECK):
+            for _ in range(copies):
+                starting_deck.append(template.copy(load_image=load_images))
+    return starting_deck
+
+
+@tracer.traced("reset_game")
+def reset_game(player: Player, all_cards: dict, width: int, height: int, combat_count: int) -> Enemy:
+    """Resets the game to its initial state and returns a new Enemy instance."""
+    log.info("game.reset", "--- Resetting Game ---", combat=combat_count)
+    # Create a new starting deck with fresh card copies
+    starting_deck = build_starting_deck(all_cards)
+
+    # player.reset_stats() is called by the caller when a new run starts
+    player.set_deck(starting_deck)
+    player.start_new_combat()
+
+    # Create and return a new enemy for the new game
+    # Scale enemy HP based on combat count. 25% increase per combat.
+    new_hp = enemy_hp_for_combat(combat_count)
+    new_enemy = Enemy(width // 2, height // 2 - 100, hp=new_hp)
+    return new_enemy
+
+
+def play_first_affordable(engine: CombatEngine) -> Optional[Card]:
+    """A simple policy: play the left-most card in hand the player can afford, or end the turn."""
+    energy = engine.player.energy
+    for card in engine.player.hand:
+        if card.cost <= energy:
+            return card
+    return None
+
+
+class CombatEngine:
+    """
+    Runs the rules of a single combat without any display.
+
+    The engine owns the turn state machine. Player actions come in through
+    play_card() and end_turn(); the enemy's turn is stepped with advance().
+    The pygame loop calls advance() when its timers and animations allow it,
+    while headless code can call run_enemy_turn() or run() to go flat-out.
+    """
+
+    def __init__(self, player: Player, enemy: Enemy):
+        self.player = player
+        self.enemy = enemy
+        self.state = PLAYER_TURN
+        self.game_over_reason = "" # To store why the game ended
+        self.turn = 1 # The player's turn number within this combat
+        self.update()
+
+    @property
+    def is_over(self) -> bool:
+        """True once the combat has been won or lost."""
+        return self.state == GAME_OVER or self.state == COMBAT_WIN
+
+    # --- Player Actions ---
+
+    def play_card(self, card: Card) -> bool:
+        """
+        Plays a card from the player's hand at the enemy.
+        Returns True if the card was played, False if it isn't the player's turn,
+        the card isn't in hand or the player can't afford it.
+        """
+        if self.state != PLAYER_TURN or card not in self.player.hand:
+            return False
+        if not self.player.play_card(card, self.enemy):
+            return False
+        self.update()
+        return True
+
+    def end_turn(self) -> bool:
+        """Ends the player's turn. Returns False if it isn't the player's turn."""
+        if self.state != PLAYER_TURN:
+            return False
+        self.state = ENEMY_ANNOUNCE
+        return True
+
+    # --- State Machine ---
+
+    def update(self) -> str:
+        """
+        Applies the automatic checks of the player's turn: enemy defeated,
+        player defeated, and auto-ending the turn when nothing can be played.
+        Returns the (possibly new) state.
+        """
+        if self.state != PLAYER_TURN:
+            return self.state
+
+        player = self.player
+        if self.enemy.hp <= 0:
+            self.state = COMBAT_WIN
+        elif player.hp <= 0:
+            self.game_over_reason = "You have been defeated!"
+            self.state = GAME_OVER
+        # Auto-end turn if player has no energy for any cards
+        elif (player.energy <= 0 and any(card.cost > 0 for card in player.hand)) or not player.hand:
+            self.state = ENEMY_ANNOUNCE
+        return self.state
+
+    def advance(self) -> str:
+        """
+        Moves the enemy's turn on by one step:
+        ENEMY_ANNOUNCE -> ENEMY_ATTACK -> ENEMY_END -> PLAYER_TURN (or GAME_OVER).
+        Does nothing in any other state. Returns the new state.
+        """
+        if self.state == ENEMY_ANNOUNCE:
+            self.state = ENEMY_ATTACK
+
+        elif self.state == ENEMY_ATTACK:
+            self.enemy.perform_attack(self.player)
+            self.state = ENEMY_END
+
+        elif self.state == ENEMY_END:
+            if self.player.hp <= 0:
+                self.game_over_reason = "You have been defeated!"
+                self.state = GAME_OVER
+                return self.state
+            self.player.end_turn() # Reset player energy and draw count
+            # --- Auto-draw a card at the start of the turn ---
+            if not self.player.draw_card():
+                self.game_over_reason = "Draw pile is empty!"
+                self.state = GAME_OVER
+                return self.state
+            self.turn += 1
+            self.state = PLAYER_TURN
+            self.update()
+
+        return self.state
+
+    def run_enemy_turn(self) -> str:
+        """Plays out the whole enemy turn instantly. Returns the resulting state."""
+        while self.state in ENEMY_STATES:
+            self.advance()
+        return self.state
+
+    def run(self, policy: Callable[[CombatEngine], Optional[Card]] = play_first_affordable) -> str:
+        """
+        Plays the combat to the end without a display.
+        The policy picks the next card to play, or returns None to end the turn.
+        Returns the final state (GAME_OVER or COMBAT_WIN).
+        """
+        while not self.is_over:
+            if self.state == PLAYER_TURN:
+                card = policy(self)
+                if card is None or not self.play_card(card):
+                    self.end_turn()
+            else:
+                self.run_enemy_turn()
+        return self.state
+
+
+class Run:
+    """
+    A whole run without a display: combats of growing difficulty, with the
+    player's HP carried over from one combat to the next.
+    This mirrors what reset_game() and the GAME_OVER/COMBAT_WIN buttons in main.py do.
+    """
+
+    def __init__(self, all_cards: dict, rng: random.Random | None = None, load_images: bool = False, seed: int | None = None):
+        """
+        Args:
+            all_cards (dict): The card catalog from load_cards().
+            rng (random.Random | None): The random source for every shuffle in the run.
+            load_images (bool): Whether deck copies should load their artwork.
+            seed (int | None): If given, the rng is reseeded with combat_seed(seed, n)
+                at the start of the n-th combat, so each combat can be reproduced on its own.
+        """
+        self.all_cards = all_cards
+        self.rng = rng if rng is not None else random.Random()
+        self.load_images = load_images
+        self.seed = seed
+        self.player = Player(rng=self.rng)
+        self.combat_count = 0
+        self.combats_started = 0 # Every combat started so far, including after restarts
+        self.engine = self._start_combat()
+
+    def _start_combat(self) -> CombatEngine:
+        """Deals a fresh starting deck and creates the enemy for the current combat."""
+        if self.seed is not None:
+            self.rng.seed(combat_seed(self.seed, self.combats_started))
+        self.combats_started += 1
+        self.player.set_deck(build_starting_deck(self.all_cards, load_images=self.load_images))
+        self.player.start_new_combat()
+        enemy = Enemy(0, 0, hp=enemy_hp_for_combat(self.combat_count))
+        self.engine = CombatEngine(self.player, enemy)
+        return self.engine
+
+    def next_combat(self) -> CombatEngine:
+        """Moves on to the next, harder combat. Player stats like HP carry over."""
+        self.combat_count += 1
+        return self._start_combat()
+
+    def restart(self) -> CombatEngine:
+        """Starts a new run from the first combat with full HP."""
+        self.combat_count = 0
+        self.player.reset_stats() # Fully reset player HP for a new run
+        return self._start_combat()
+
+    def resume(self, combat_serial: int, combat_count: int, hp: int, energy: int) -> CombatEngine:
+        """
+        Starts a combat from a saved point of a seeded run, e.g. a replay keyframe.
+        Only HP and energy carry over between combats, so they are all that's needed.
+        """
+        self.combats_started = combat_serial
+        self.combat_count = combat_count
+        self.player.hp = hp
+        self.player.energy = energy
+        return self._start_combat()
@@ -0,0 +1,126 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple
+
+# This block is only processed by type checkers, not at runtime
+if TYPE_CHECKING:
+    from .enemy import Enemy
+    from .player import Player
+
+# A compiled effect is a pre-resolved opcode: the handler function and its arguments.
+# Playing a card runs `handler(player, target, *args)` for each one, in order.
+Effect = tuple[Callable[..., None], tuple]
+
+
+# --- Effect Handlers ---
+# Every handler takes the player playing the card and the target enemy first.
+# Anything with the same attributes works (e.g. the rules-only game state).
+
+def deal_damage(player: Player, target: Enemy, amount: int):
+    """{"op": "damage", "amount": N}"""
+    target.hp -= amount
+
+def multi_hit(player: Player, target: Enemy, amount: int, hits: int):
+    """{"op": "multi_hit", "amount": N, "hits": H}"""
+    for _ in range(hits):
+        target.hp -= amount
+
+def gain_block(player: Player, target: Enemy, amount: int):
+    """{"op": "block", "amount": N}"""
+    player.armor += amount
+
+def gain_energy(player: Player, target: Enemy, amount: int):
+    """{"op": "energy", "amount": N}"""
+    player.energy += amount
+
+def draw_cards(player: Player, target: Enemy, count: int):
+    """{"op": "draw", "count": N}. Stops early if the draw pile runs out."""
+    for _ in range(count):
+        if not player.draw_card():
+            break
+
+def conditional(player: Player, target: Enemy, check: Callable, value: int, then: tuple, otherwise: tuple):
+    """{"op": "if", "condition": NAME, "value": N, "then": [...], "else": [...]}"""
+    for handler, args in (then if check(player, target, value) else otherwise):
+        handler(player, target, *args)
+
+
+# --- Conditions for "if" effects ---
+CONDITIONS: dict[str, Callable[[Any, Any, int], bool]] = {
+    "target_hp_below": lambda player, target, value: target.hp < value,
+    "player_hp_below": lambda player, target, value: player.hp < value,
+    "player_armor_at_least": lambda player, target, value: player.armor >= value,
+    "hand_size_at_most": lambda player, target, value: len(player.hand) <= value,
+}
+
+
+def _compile_one(spec: dict) -> Effect:
+    """Turns one effect from cards.json into a (handler, args) opcode."""
+    op = spec.get("op")
+    if op == "damage":
+        return deal_damage, (int(spec["amount"]),)
+    if op == "multi_hit":
+        return multi_hit, (int(spec["amount"]), int(spec["hits"]))
+    if op == "block":
+        return gain_block, (int(spec["amount"]),)
+    if op == "energy":
+        return gain_energy, (int(spec["amount"]),)
+    if op == "draw":
+        return draw_cards, (int(spec["count"]),)
+    if op == "if":
+        check = CONDITIONS.get(spec.get("condition"))
+        if check is None:
+            raise ValueError(f"Unknown effect condition: {spec.get('condition')!r}")
+        then = compile_effects(spec.get("then", []))
+        otherwise = compile_effects(spec.get("else", []))
+        return conditional, (check, int(spec["value"]), then, otherwise)
+    raise ValueError(f"Unknown effect op: {op!r}")
+
+
+def compile_effects(specs: list[dict]) -> tuple[Effect, ...]:
+    """Compiles a card's effect list from cards.json into pre-resolved opcodes."""
+    return tuple(_compile_one(spec) for spec in specs)
+
+
+def effect_specs(data: dict) -> list[dict]:
+    """
+    Returns the card's effect list. Cards without an "effects" entry get the
+    behaviour cards had before effects were data-driven: Attacks deal `value`
+    damage and Defend gains `value` armor.
+    """
+    if "effects" in data:
+        return data["effects"]
+    if data["type"] == "Attack":
+        return [{"op": "damage", "amount": data.get("value")}]
+    if data["type"] == "Skill" and data["name"] == "Defend":
+        return [{"op": "block", "amount": data.get("value")}]
+    return []
+
+
+class EffectTotals(NamedTuple):
+    """What a card does in total, for simulators that apply effects as plain numbers."""
+    damage: int = 0
+    block: int = 0
+    energy: int = 0
+    draw: int = 0
+
+
+def effect_totals(effects: tuple[Effect, ...]) -> EffectTotals:
+    """
+    Sums up unconditional effects. Raises ValueError for conditional effects,
+    whose outcome depends on the game state.
+    """
+    damage = block = energy = draw = 0
+    for handler, args in effects:
+        if handler is deal_damage:
+            damage += args[0]
+        elif handler is multi_hit:
+            damage += args[0] * args[1]
+        elif handler is gain_block:
+            block += args[0]
+        elif handler is gain_energy:
+            energy += args[0]
+        elif handler is draw_cards:
+            draw += args[0]
+        else:
+            raise ValueError(f"{handler.__name__} effects can't be reduced to totals")
+    return EffectTotals(damage, block, energy, draw)
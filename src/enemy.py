@@ -1,16 +1,23 @@
 from __future__ import annotations
-import pygame
 import math
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
+
+from .log import log
+from .trace import tracer
 
 # This block is only processed by type checkers, not at runtime
 if TYPE_CHECKING:
+    import pygame
     from player import Player
 
+IMAGE_SIZE = (150, 180)
+
 
 class Enemy:
     """Represents an enemy in the game."""
 
+    images_built = 0 # Placeholder images allocated so far, for the profiler
+
     def __init__(self, x: int, y: int, hp: int = 10):
         """
         Initializes the enemy.
@@ -28,21 +35,42 @@ class Enemy:
         self.attack_damage = 10 # The damage this enemy will deal
 
         # --- Animation ---
-        self.image = self._create_placeholder_image()
-        self.rect = self.image.get_rect(center=(x, y))
+        # Speeds are per second; update() is called with a fixed time step (see clock.py)
+        # The image and rect are built on first use, so headless combats never need pygame
+        self._image: Optional[pygame.Surface] = None
+        self._rect: Optional[pygame.Rect] = None
+        self._start_center = (x, y)
         self.base_x = x  # The central x position around which the enemy sways
+        self.x = float(x) # Simulated center x; rect follows it when drawing
+        self.prev_x = float(x) # Center x at the previous step, for interpolation
         self.sway_angle = 0.0
-        self.sway_speed = 0.02  # How fast the enemy sways
+        self.sway_speed = 1.2  # How fast the enemy sways, in radians per second
         self.sway_amplitude = 40  # How far the enemy sways from the center
         
         self.animation_state = "idle" # Can be "idle", "attacking", "returning"
         self.attack_target_pos = None
-        self.attack_speed = 25 # Pixels per frame during attack
+        self.attack_speed = 1500 # Pixels per second during attack
+
+    @property
+    def image(self) -> pygame.Surface:
+        if self._image is None:
+            self._image = self._create_placeholder_image()
+        return self._image
+
+    @property
+    def rect(self) -> pygame.Rect:
+        if self._rect is None:
+            import pygame
+            self._rect = pygame.Rect((0, 0), IMAGE_SIZE)
+            self._rect.center = (round(self.x), self._start_center[1])
+        return self._rect
 
     def _create_placeholder_image(self) -> pygame.Surface:
         """Creates a placeholder image for the enemy."""
-        size = (150, 180)
+        import pygame
+        size = IMAGE_SIZE
         image = pygame.Surface(size, pygame.SRCALPHA)
+        Enemy.images_built += 1
         
         # Main body
         body_rect = pygame.Rect(0, 0, size[0], size[1] - 30)
@@ -58,39 +86,64 @@ class Enemy:
 
         return image
 
-    def update(self) -> bool:
+    def update(self, dt: float = 1 / 60) -> bool:
         """
-        Updates the enemy's state, including its animation.
+        Advances the enemy's state, including its animation, by `dt` seconds.
         Returns True if the attack animation hits its target, False otherwise.
         """
         attack_hit = False
+        self.prev_x = self.x
         if self.animation_state == "idle":
-            self.sway_angle += self.sway_speed
+            self.sway_angle += self.sway_speed * dt
             # Use math.sin to create a smooth back-and-forth motion
-            offset_x = math.sin(self.sway_angle) * self.sway_amplitude
-            self.rect.centerx = self.base_x + int(offset_x)
+            self.x = self.base_x + math.sin(self.sway_angle) * self.sway_amplitude
         
         elif self.animation_state == "attacking":
             # Move towards the target position
-            if self.rect.centerx > self.attack_target_pos[0]:
-                self.rect.centerx -= self.attack_speed
-            else: # Reached target, switch to returning
+            target_x = self.attack_target_pos[0]
+            self.x = max(self.x - self.attack_speed * dt, target_x)
+            if self.x <= target_x: # Reached target, switch to returning
                 self.animation_state = "returning"
                 attack_hit = True
 
         elif self.animation_state == "returning":
             # Move back to base position
-            if self.rect.centerx < self.base_x:
-                self.rect.centerx += self.attack_speed
-            else: # Returned to base, switch to idle
-                self.rect.centerx = self.base_x
+            self.x = min(self.x + self.attack_speed * dt, self.base_x)
+            if self.x >= self.base_x: # Returned to base, switch to idle
                 self.animation_state = "idle"
+        if self._rect is not None: # Otherwise it starts out at x when it's first needed
+            self._rect.centerx = round(self.x)
+        return attack_hit
+
+    def interpolate(self, alpha: float):
+        """Places rect between the last two steps, `alpha` of the way to the latest one. Call before drawing."""
+        self.rect.centerx = round(self.prev_x + (self.x - self.prev_x) * alpha)
+
+    def move_to(self, center: tuple[int, int]):
+        """Moves the enemy (and the point it sways around) without animating, e.g. after a resize."""
+        self.rect.center = center
+        self.base_x = center[0]
+        if self.animation_state == "idle":
+            self.x = self.base_x + math.sin(self.sway_angle) * self.sway_amplitude
+        self.prev_x = self.x
+
+    def finish_animation(self) -> bool:
+        """
+        Skips straight to the end of the current animation (fast-forward).
+        Returns True if an attack was in progress and would have hit.
+        """
+        attack_hit = self.animation_state == "attacking"
+        self.animation_state = "idle"
+        self.x = self.prev_x = self.base_x + math.sin(self.sway_angle) * self.sway_amplitude
+        if self._rect is not None:
+            self._rect.centerx = round(self.x)
         return attack_hit
 
     def draw(self, surface: pygame.Surface):
         """Draws the enemy on the given surface."""
         surface.blit(self.image, self.rect)
 
+    @tracer.traced("Enemy.perform_attack")
     def perform_attack(self, target: Player):
         """
         Performs an attack on a target (the player).
@@ -98,7 +151,8 @@ class Enemy:
         """
         damage_to_deal = self.attack_damage
         target.take_damage(damage_to_deal)
-        print(f"Enemy attacks for {damage_to_deal}. Player HP: {target.hp}, Armor: {target.armor}")
+        log.debug("enemy.attack", "Enemy attacks for {damage}. Player HP: {hp}, Armor: {armor}",
+                  damage=damage_to_deal, hp=target.hp, armor=target.armor)
 
         # In the future, this could return information about the attack
         # for visual effects or other logic.
@@ -0,0 +1,63 @@
+from __future__ import annotations
+from bisect import bisect_right
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Optional
+
+# This block is only processed by type checkers, not at runtime
+if TYPE_CHECKING:
+    import pygame
+
+
+class HitIndex:
+    """
+    Finds the top-most UI element under a point without scanning every element.
+
+    The screen is cut into vertical strips at every element's left and right edge.
+    Each strip lists the elements that span it, top-most first, so a lookup is a
+    binary search for the strip plus a check of the few elements stacked there.
+    For a hand of overlapping cards, that's one or two cards whatever the hand size.
+
+    The index is a snapshot of the rects: rebuild() it whenever elements move
+    (main.py does it in position_ui_elements).
+    """
+
+    def __init__(self):
+        self._edges: list[int] = [] # Sorted x coordinates where strips start and end
+        self._strips: list[list[tuple[pygame.Rect, Any]]] = [] # Strip i spans edges[i]..edges[i+1], top-most first
+        self.size = 0
+
+    def rebuild(self, elements: Iterable[tuple[Any, Optional[pygame.Rect]]]):
+        """
+        Indexes the elements, given bottom to top (later elements are drawn over earlier ones).
+        Elements without a rect are skipped.
+
+        Args:
+            elements (Iterable[tuple[Any, pygame.Rect | None]]): (target, rect) pairs. The
+                target is what hit() returns, e.g. the Card or Button itself.
+        """
+        placed = [(rect.copy(), target) for target, rect in elements if rect and rect.width > 0 and rect.height > 0]
+        self._edges = sorted({x for rect, _ in placed for x in (rect.left, rect.right)})
+        self._strips = [[] for _ in range(max(len(self._edges) - 1, 0))]
+        for rect, target in reversed(placed): # Top-most first
+            first = bisect_right(self._edges, rect.left) - 1
+            last = bisect_right(self._edges, rect.right - 1) - 1
+            for strip in range(first, last + 1):
+                self._strips[strip].append((rect, target))
+        self.size = len(placed)
+
+    def hit(self, pos: tuple[int, int], accept: Optional[Callable[[Any], bool]] = None) -> Any:
+        """
+        Returns the top-most element at `pos`, or None.
+
+        Args:
+            pos (tuple[int, int]): The point, e.g. one mouse sample.
+            accept (callable | None): If given, elements it rejects (e.g. buttons hidden in
+                the current state) are passed over in favour of whatever is under them.
+        """
+        x, y = pos
+        strip = bisect_right(self._edges, x) - 1
+        if strip < 0 or strip >= len(self._strips):
+            return None
+        for rect, target in self._strips[strip]:
+            if rect.top <= y < rect.bottom and (accept is None or accept(target)):
+                return target
+        return None
@@ -47,4 +47,20 @@ class UILayout:
         self.deck_info_area = pygame.Rect(20, self.bottom_bar.top + 110, 300, 100)
         self.end_turn_area = pygame.Rect(width - 170, height - 70, 150, 50)
         self.draw_pile_area = pygame.Rect(width - 180, self.hand_area.y, 100, 150)
-        self.discard_pile_area = pygame.Rect(width - 300, self.hand_area.y, 100, 150)
\ No newline at end of file
+        self.discard_pile_area = pygame.Rect(width - 300, self.hand_area.y, 100, 150)
+
+    def hand_positions(self, num_cards: int, card_width: int = 100, gap: int = 10) -> list[tuple[float, float]]:
+        """
+        Returns the top-left corner of each card in a hand of `num_cards`, left to right.
+        Cards are spaced `gap` apart, or overlapped evenly if the hand is wider than the card zone.
+        """
+        card_spacing = card_width + gap # Ideal spacing
+
+        # Calculate total width required with ideal spacing
+        total_hand_width = (num_cards - 1) * card_spacing + card_width
+
+        # If the hand is too wide for the zone, calculate the necessary overlap
+        if total_hand_width > self.card_zone.width and num_cards > 1:
+            card_spacing = (self.card_zone.width - card_width) / (num_cards - 1)
+
+        return [(self.card_zone.left + i * card_spacing, self.card_zone.y) for i in range(num_cards)]
@@ -0,0 +1,159 @@
+from __future__ import annotations
+import json
+import sys
+import time
+from collections import deque
+from typing import IO, NamedTuple, Optional
+
+# --- Levels ---
+DEBUG = 10 # Every game action: cards played, attacks, draws
+INFO = 20 # Things worth seeing in the console: games reset, files saved
+WARNING = 30 # Something went wrong but the game carries on (e.g. missing artwork)
+ERROR = 40
+OFF = 100 # Above every level: nothing is logged
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+
+
+class LogRecord(NamedTuple):
+    """One logged event. The message text is only built if a sink asks for it."""
+    time: float # time.time()
+    level: int
+    event: str # Dotted name, e.g. "player.card_played"
+    template: str # str.format template, filled from `fields`
+    fields: dict
+    suppressed: int # Records of the same event dropped by the rate limit just before this one
+
+    @property
+    def message(self) -> str:
+        text = self.template.format(**self.fields) if self.fields else self.template
+        if self.suppressed:
+            text += f" ({self.suppressed} similar messages suppressed)"
+        return text
+
+    def to_dict(self) -> dict:
+        data = {"time": self.time, "level": LEVEL_NAMES.get(self.level, self.level), "event": self.event,
+                "message": self.message}
+        data.update(self.fields)
+        if self.suppressed:
+            data["suppressed"] = self.suppressed
+        return data
+
+
+# --- Sinks ---
+# A sink is anything with a write(record) method.
+
+class StdoutSink:
+    """Prints each message, like the game's old print() calls. Looks up sys.stdout on every write, so redirects still work."""
+
+    def write(self, record: LogRecord):
+        print(record.message, file=sys.stdout)
+
+
+class RingSink:
+    """Keeps the most recent records in memory, e.g. to show in an overlay or attach to a bug report."""
+
+    def __init__(self, capacity: int = 1000):
+        self.records: deque[LogRecord] = deque(maxlen=capacity)
+
+    def write(self, record: LogRecord):
+        self.records.append(record)
+
+    def messages(self) -> list[str]:
+        return [record.message for record in self.records]
+
+
+class JsonLinesSink:
+    """Appends one JSON object per record to a file (or any text stream), for offline analysis."""
+
+    def __init__(self, target: str | IO[str]):
+        """
+        Args:
+            target (str | file): A path to append to, or an open text stream.
+        """
+        self._owns_file = isinstance(target, str)
+        self.file = open(target, "a") if self._owns_file else target
+
+    def write(self, record: LogRecord):
+        self.file.write(json.dumps(record.to_dict()) + "\n")
+
+    def close(self):
+        if self._owns_file:
+            self.file.close()
+
+
+class EventLog:
+    """
+    The game's event log: level-gated, lazily formatted and rate-limited.
+
+    Callers pass an event name, a str.format template and the values as keywords:
+
+        log.debug("player.card_played", "Played {card}. Enemy HP: {enemy_hp}", card=card.name, enemy_hp=target.hp)
+
+    Below the current level a call returns before doing anything else, so debug
+    logging in the rules costs about as much as a method call. The template is only
+    formatted if a sink needs the text. Each event can be written at most `rate_limit`
+    times per `rate_interval` seconds; the rest are counted and reported with the
+    next record of that event that gets through.
+    """
+
+    def __init__(self, level: int = INFO, sinks: Optional[list] = None, rate_limit: int = 20, rate_interval: float = 1.0):
+        """
+        Args:
+            level (int): Records below this level are dropped. OFF disables logging.
+            sinks (list | None): Where records go. Defaults to stdout.
+            rate_limit (int): Most records of one event per `rate_interval`. 0 means no limit.
+            rate_interval (float): Length of a rate limit window, in seconds.
+        """
+        self.level = level
+        self.sinks = sinks if sinks is not None else [StdoutSink()]
+        self.rate_limit = rate_limit
+        self.rate_interval = rate_interval
+        self._windows: dict[str, list] = {} # event -> [window start, count, suppressed]
+
+    def configure(self, level: Optional[int] = None, sinks: Optional[list] = None):
+        """Changes the level and/or replaces the sinks."""
+        if level is not None:
+            self.level = level
+        if sinks is not None:
+            self.sinks = sinks
+
+    def is_enabled(self, level: int) -> bool:
+        """Whether a record at `level` would be written. Use it to skip computing expensive fields."""
+        return level >= self.level and bool(self.sinks)
+
+    def debug(self, event: str, message: str, **fields):
+        if DEBUG >= self.level:
+            self._emit(DEBUG, event, message, fields)
+
+    def info(self, event: str, message: str, **fields):
+        if INFO >= self.level:
+            self._emit(INFO, event, message, fields)
+
+    def warning(self, event: str, message: str, **fields):
+        if WARNING >= self.level:
+            self._emit(WARNING, event, message, fields)
+
+    def error(self, event: str, message: str, **fields):
+        if ERROR >= self.level:
+            self._emit(ERROR, event, message, fields)
+
+    def _emit(self, level: int, event: str, message: str, fields: dict):
+        suppressed = 0
+        if self.rate_limit:
+            now = time.monotonic()
+            window = self._windows.get(event)
+            if window is None or now - window[0] >= self.rate_interval:
+                suppressed = window[2] if window else 0
+                window = self._windows[event] = [now, 0, 0]
+            if window[1] >= self.rate_limit:
+                window[2] += 1
+                return
+            window[1] += 1
+
+        record = LogRecord(time.time(), level, event, message, fields, suppressed)
+        for sink in self.sinks:
+            sink.write(record)
+
+
+# The shared event log every module writes to.
+log = EventLog()
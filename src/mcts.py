@@ -0,0 +1,317 @@
+from __future__ import annotations
+import argparse
+import math
+import random
+import sys
+import time
+from array import array
+from typing import TYPE_CHECKING, Optional
+
+from .card import load_cards
+from .combat import Run, CombatEngine, ENEMY_STATES, COMBAT_WIN
+from .effects import effect_totals
+from .simulate import derive_seed, collect_run_stats, SimulationStats, DEFAULT_CARDS_PATH
+from .state import GameState, EnemyState
+
+# This block is only processed by type checkers, not at runtime
+if TYPE_CHECKING:
+    from .card import CardDefinition
+
+# A move is the (card id, cost) of the card to play, or END_TURN.
+# Identical cards are one move, whichever copy in the hand gets played.
+END_TURN = None
+MAX_PLAYOUT_TURNS = 60 # Playouts that run longer than this are scored as losses
+
+# Each worker process loads the card catalog once and keeps it here.
+_worker_cards: dict = {}
+
+
+# --- Moves ---
+
+def legal_moves(state: GameState) -> list:
+    """Every distinct card the player can play right now, plus ending the turn."""
+    definitions, costs, hand = state.definitions, state.costs, state.hand
+    moves = [(definitions[hand[index]].id, costs[hand[index]]) for index in state.distinct_playable()]
+    moves.append(END_TURN)
+    return moves
+
+def hand_index(state: GameState, move) -> int:
+    """Returns the position in hand of a card matching the move."""
+    definitions, costs = state.definitions, state.costs
+    for index, slot in enumerate(state.hand):
+        if (definitions[slot].id, costs[slot]) == move:
+            return index
+    raise ValueError(f"No card for move {move!r} in hand")
+
+def apply_move(state: GameState, move):
+    if move is END_TURN:
+        state.end_turn()
+    else:
+        state.play(hand_index(state, move))
+
+def reward(state: GameState) -> float:
+    """Scores a finished combat: 0 for a loss; a win is worth 0.5, plus up to 0.5 for the HP kept (it carries over)."""
+    if state.state != COMBAT_WIN:
+        return 0.0
+    return 0.5 + 0.5 * max(state.hp, 0) / state.max_hp
+
+
+class EffectCache:
+    """
+    Card effects reduced to totals, worked out once per definition.
+    Playouts use them to spot lethal cards without running the effect handlers.
+    """
+
+    def __init__(self):
+        self._damage: dict[CardDefinition, int] = {}
+
+    def damage(self, definition: CardDefinition) -> int:
+        damage = self._damage.get(definition)
+        if damage is None:
+            try:
+                damage = effect_totals(definition.effects).damage
+            except ValueError:
+                damage = 0 # Conditional: can't tell without playing it
+            self._damage[definition] = damage
+        return damage
+
+
+class Node:
+    """One action sequence from the root. Open-loop: the states it stands for differ by the cards drawn."""
+
+    __slots__ = ("children", "visits", "value")
+
+    def __init__(self):
+        self.children: dict = {}
+        self.visits = 0
+        self.value = 0.0
+
+
+class MCTS:
+    """
+    Monte Carlo tree search over one combat, from the player's point of view.
+
+    Every iteration guesses an order for the draw pile (the player can't see it),
+    walks the tree with UCT, adds one new move, finishes the combat with a quick
+    playout and backs the result up the path.
+    """
+
+    def __init__(self, exploration: float = 1.0, rng: Optional[random.Random] = None):
+        self.exploration = exploration
+        self.rng = rng if rng is not None else random.Random()
+        self.effects = EffectCache()
+
+    def search(self, root_state: GameState, time_budget: float = 0.05, max_iterations: Optional[int] = None) -> tuple[dict, int]:
+        """
+        Searches until the time budget (seconds) or iteration cap runs out.
+        Returns ({move: (visits, total value)} for the root's moves, iterations run).
+        """
+        rng = self.rng
+        root = Node()
+        deadline = time.perf_counter() + time_budget
+        iterations = 0
+        while (max_iterations is None or iterations < max_iterations) and (iterations == 0 or time.perf_counter() < deadline):
+            iterations += 1
+            state = root_state.copy()
+            state.shuffle_draw_pile(rng)
+            node, path = root, [root]
+
+            # --- Selection and expansion ---
+            while not state.is_over:
+                moves = legal_moves(state)
+                untried = [move for move in moves if move not in node.children]
+                if untried:
+                    move = rng.choice(untried)
+                    node.children[move] = child = Node()
+                    apply_move(state, move)
+                    path.append(child)
+                    break
+                log_visits = math.log(node.visits)
+                move = max(moves, key=lambda m: self._uct(node.children[m], log_visits))
+                node = node.children[move]
+                apply_move(state, move)
+                path.append(node)
+
+            value = self.playout(state)
+            for visited in path:
+                visited.visits += 1
+                visited.value += value
+        return {move: (child.visits, child.value) for move, child in root.children.items()}, iterations
+
+    def _uct(self, node: Node, log_parent_visits: float) -> float:
+        return node.value / node.visits + self.exploration * math.sqrt(log_parent_visits / node.visits)
+
+    def playout(self, state: GameState) -> float:
+        """
+        Finishes the combat quickly: play a lethal card if there is one, otherwise a
+        random affordable card, and end the turn when nothing can be played.
+        """
+        rng, effects = self.rng, self.effects
+        while not state.is_over and state.turn < MAX_PLAYOUT_TURNS:
+            moves = state.playable()
+            if not moves:
+                state.end_turn()
+                continue
+            hand, definitions, enemy_hp = state.hand, state.definitions, state.enemy.hp
+            lethal = [index for index in moves if effects.damage(definitions[hand[index]]) >= enemy_hp]
+            state.play(lethal[0] if lethal else rng.choice(moves))
+        return reward(state)
+
+
+# --- Process-pool (root-parallel) search ---
+
+def pack_state(state: GameState) -> tuple:
+    """Turns a state into plain data that can be sent to worker processes (definitions go by card id)."""
+    enemy = state.enemy
+    return (
+        tuple(definition.id for definition in state.definitions), state.costs,
+        tuple(pile.tolist() for pile in state.piles), (enemy.hp, enemy.armor, enemy.attack_damage),
+        (state.hp, state.max_hp, state.armor, state.energy, state.max_energy, state.cards_drawn_this_turn, state.turn),
+    )
+
+def unpack_state(packed: tuple, all_cards: dict) -> GameState:
+    """Rebuilds a state from pack_state() using the card catalog."""
+    card_ids, costs, piles, enemy, stats = packed
+    hp, max_hp, armor, energy, max_energy, cards_drawn, turn = stats
+    state = GameState(
+        tuple(all_cards[card_id].definition for card_id in card_ids), costs,
+        tuple(array('H', pile) for pile in piles), EnemyState(*enemy),
+        hp=hp, max_hp=max_hp, energy=energy, max_energy=max_energy,
+    )
+    state.armor = armor
+    state.cards_drawn_this_turn = cards_drawn
+    state.turn = turn
+    state.update()
+    return state
+
+def _init_worker(cards_path: str):
+    """Runs once in each worker process."""
+    global _worker_cards
+    _worker_cards = load_cards(cards_path)
+
+def _search_in_worker(packed: tuple, seed: int, time_budget: float, max_iterations: Optional[int]) -> tuple[dict, int]:
+    state = unpack_state(packed, _worker_cards)
+    return MCTS(rng=random.Random(seed)).search(state, time_budget, max_iterations)
+
+
+class MCTSAgent:
+    """
+    Chooses moves with MCTS. With several workers, each process searches the same
+    position independently (root parallelism) and their root statistics are summed.
+    """
+
+    def __init__(self, time_budget: float = 0.05, max_iterations: Optional[int] = None, workers: int = 1,
+                 seed: int = 0, cards_path: str = DEFAULT_CARDS_PATH):
+        """
+        Args:
+            time_budget (float): Seconds of search per decision.
+            max_iterations (int | None): Optional cap on iterations per decision (per worker).
+            workers (int): Processes to search with. 1 searches in this process.
+            seed (int): Base seed; every decision gets its own derived seed.
+            cards_path (str): Path to cards.json, for the worker processes.
+        """
+        self.time_budget = time_budget
+        self.max_iterations = max_iterations
+        self.workers = workers
+        self.seed = seed
+        self.decisions = 0
+        self.iterations = 0 # Summed over all decisions and workers
+        self._pool = None
+        if workers > 1:
+            from concurrent.futures import ProcessPoolExecutor # Slow to import; single-process agents skip it
+            self._pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(cards_path,))
+
+    def choose(self, state: GameState):
+        """Returns the move to make: a (card id, cost) to play, or END_TURN."""
+        moves = legal_moves(state)
+        if len(moves) == 1:
+            return moves[0] # Nothing to think about
+        self.decisions += 1
+        seed = derive_seed(self.seed, self.decisions)
+        if self._pool is None:
+            results = [MCTS(rng=random.Random(seed)).search(state, self.time_budget, self.max_iterations)]
+        else:
+            packed = pack_state(state)
+            futures = [self._pool.submit(_search_in_worker, packed, derive_seed(seed, worker), self.time_budget, self.max_iterations)
+                       for worker in range(self.workers)]
+            results = [future.result() for future in futures]
+
+        visits: dict = {}
+        for stats, iterations in results:
+            self.iterations += iterations
+            for move, (count, _) in stats.items():
+                visits[move] = visits.get(move, 0) + count
+        return max(visits, key=visits.get) # The most visited move is the most robust choice
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self) -> MCTSAgent:
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def play_combat(agent, engine: CombatEngine) -> str:
+    """
+    Plays one live combat with the agent's choices. Returns the final state.
+    The agent is anything with a choose(state) method, like MCTSAgent or solver.SolverAgent.
+    """
+    player = engine.player
+    while not engine.is_over:
+        if engine.state in ENEMY_STATES:
+            engine.run_enemy_turn()
+            continue
+        state = GameState.from_combat(player, engine.enemy, engine.turn)
+        move = agent.choose(state)
+        if move is END_TURN:
+            engine.end_turn()
+        else:
+            engine.play_card(player.hand[hand_index(state, move)])
+    return engine.state
+
+
+def play_runs(agent, all_cards: dict, runs: int, max_combats: int, seed: int = 0, on_progress=None) -> SimulationStats:
+    """
+    Plays full runs with the agent, each starting like reset_game() does, and
+    collects the same statistics as simulate.py.
+    """
+    return collect_run_stats(lambda run_index: Run(all_cards, seed=derive_seed(seed, run_index)),
+                             lambda run: play_combat(agent, run.engine), runs, max_combats, on_progress)
+
+
+def main(argv: list[str] | None = None):
+    """Command-line entry point: python -m src.mcts --runs 20 --max-combats 10 --time 0.05 --workers 4"""
+    parser = argparse.ArgumentParser(description="Play full runs with a Monte Carlo tree search agent.")
+    parser.add_argument("--runs", type=int, default=20, help="number of full runs")
+    parser.add_argument("--max-combats", type=int, default=10, help="combats needed to win a run (combat_count depth)")
+    parser.add_argument("--time", type=float, default=0.05, help="search time per decision, in seconds")
+    parser.add_argument("--iterations", type=int, default=None, help="cap on iterations per decision")
+    parser.add_argument("--workers", type=int, default=1, help="processes searching each decision (root parallel)")
+    parser.add_argument("--seed", type=int, default=0, help="base random seed")
+    parser.add_argument("--cards", default=DEFAULT_CARDS_PATH, help="path to cards.json")
+    args = parser.parse_args(argv)
+
+    all_cards = load_cards(args.cards)
+
+    def report_progress(stats: SimulationStats):
+        print(f"\r{stats.runs}/{args.runs} runs, win rate {stats.win_rate:.1%}", end="", file=sys.stderr)
+
+    start = time.perf_counter()
+    with MCTSAgent(args.time, args.iterations, args.workers, args.seed, args.cards) as agent:
+        stats = play_runs(agent, all_cards, args.runs, args.max_combats, args.seed, report_progress)
+    elapsed = time.perf_counter() - start
+    print(file=sys.stderr)
+
+    print(f"Runs: {stats.runs} in {elapsed:.1f}s")
+    print(f"Win rate (cleared {args.max_combats} combats): {stats.win_rate:.2%}")
+    print(f"Mean combats survived: {stats.mean_combats_survived:.2f}")
+    if agent.decisions:
+        print(f"Decisions searched: {agent.decisions}, {agent.iterations / agent.decisions:.0f} iterations each")
+
+
+if __name__ == "__main__":
+    main()
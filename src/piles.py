@@ -0,0 +1,337 @@
+from __future__ import annotations
+import random
+from array import array
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional
+
+# This block is only processed by type checkers, not at runtime
+if TYPE_CHECKING:
+    from .card import Card, CardDefinition
+
+# --- Zones ---
+DRAW = 0
+HAND = 1
+DISCARD = 2
+EXHAUST = 3
+ZONE_NAMES = ("draw", "hand", "discard", "exhaust")
+DETACHED = -1 # Tracked, but not in any pile (e.g. a card that is being played)
+
+# Piles whose order matters. Taking a card out of the middle of one of these shifts
+# the cards above it down and renumbers them, which is O(n) in the pile's size; the
+# others just move their top card into the gap, in O(1).
+# (Draws come off the top of the draw pile, and the hand is short, so both stay cheap.)
+_ORDERED = (True, True, False, False)
+
+
+class CardPiles:
+    """
+    Every card in a combat, addressed by slot index.
+
+    `cards` holds each card instance once. `zone` tags every slot with the pile
+    it is in, `position` with its index in that pile, and `piles` keeps one list
+    of slot indices per zone (the end of the list is the top of the pile).
+    Finding a card is one dict lookup on its identity, so moving, drawing and
+    playing never scan a list or call __eq__. Drawing and moving a card off the
+    top of a pile are O(1); taking one out of the middle of the hand or draw
+    pile keeps their order and is O(n) in that pile (see _ORDERED).
+
+    Cards are also grouped by definition into kinds, and `counts` keeps, per zone,
+    how many cards of each kind the pile holds. The counts are updated as cards move
+    (one list increment per move), and `version` goes up whenever a card changes
+    pile, so a display of the piles' contents only has to redraw when it changes.
+    """
+
+    __slots__ = ("cards", "zone", "position", "piles", "counts", "version",
+                 "kind_names", "_definitions", "_kinds", "_totals", "_kind_of", "_slots")
+
+    def __init__(self, cards: Iterable[Card] = ()):
+        self.cards: list[Card] = []
+        self.zone = array('b') # slot -> zone
+        self.position = array('i') # slot -> index in its pile
+        self.piles: tuple[list[int], ...] = tuple([] for _ in ZONE_NAMES)
+        self.counts: tuple[list[int], ...] = tuple([] for _ in ZONE_NAMES) # zone -> copies of each kind
+        self.version = 0 # Goes up every time a card changes pile
+        self.kind_names: list[str] = [] # kind -> card name, in first-seen order
+        self._definitions: list[CardDefinition] = [] # slot -> card definition
+        self._kinds = array('H') # slot -> kind
+        self._totals: list[int] = [] # kind -> copies tracked, in any pile or none
+        self._kind_of: dict[CardDefinition, int] = {} # interned definition -> kind
+        self._slots: dict[int, int] = {} # id(card) -> slot
+        self.reset(cards)
+
+    def reset(self, cards: Iterable[Card]):
+        """
+        Puts every card in the draw pile, in order, and empties the other piles.
+        When the cards are the same ones already tracked (the usual case between
+        combats), their slots are reused instead of being rebuilt.
+        """
+        cards = cards if isinstance(cards, list) else list(cards)
+        if len(cards) != len(self.cards) or any(a is not b for a, b in zip(cards, self.cards)):
+            self.cards = list(cards)
+            definitions = [card.definition for card in self.cards]
+            if definitions != self._definitions: # Fresh copies of the same deck keep their kinds
+                self._definitions = definitions
+                self._count_kinds()
+            self._slots = {id(card): slot for slot, card in enumerate(self.cards)}
+            self.zone = array('b', [DRAW]) * len(self.cards)
+            self.position = array('i', range(len(self.cards)))
+        else:
+            for slot in range(len(self.cards)):
+                self.zone[slot] = DRAW
+                self.position[slot] = slot
+        for pile in self.piles:
+            pile.clear()
+        self.piles[DRAW].extend(range(len(self.cards)))
+        empty = [0] * len(self.kind_names)
+        for zone, counts in enumerate(self.counts):
+            counts[:] = self._totals if zone == DRAW else empty
+        self.version += 1
+
+    # --- Lookups ---
+
+    def slot_of(self, card: Card) -> Optional[int]:
+        """Returns the card's slot, or None if it isn't tracked."""
+        return self._slots.get(id(card))
+
+    def zone_of(self, card: Card) -> int:
+        """Returns the zone the card is in; DETACHED if it isn't in any pile."""
+        slot = self._slots.get(id(card))
+        return DETACHED if slot is None else self.zone[slot]
+
+    def count(self, zone: int) -> int:
+        """Returns the number of cards in a pile."""
+        return len(self.piles[zone])
+
+    def composition(self, zone: int) -> dict[str, int]:
+        """Returns {card name: copies} for one pile, built from its counts (no card is visited)."""
+        composition = {}
+        for name, copies in zip(self.kind_names, self.counts[zone]):
+            if copies:
+                composition[name] = composition.get(name, 0) + copies # Kinds can share a name (e.g. upgrades)
+        return composition
+
+    def slots(self, zone: int) -> list[tuple[int, Card]]:
+        """Returns (slot, card) for each card in a pile, bottom to top. A slot stays the card's for the whole combat."""
+        cards = self.cards
+        return [(slot, cards[slot]) for slot in self.piles[zone]]
+
+    def view(self, zone: int) -> PileView:
+        """Returns a live, list-like view of one pile."""
+        return PileView(self, zone)
+
+    # --- Moves ---
+
+    def add(self, card: Card, zone: int) -> int:
+        """Puts a card on top of a pile, tracking it first if it is new. Returns its slot."""
+        slot = self._slots.get(id(card))
+        if slot is None:
+            slot = len(self.cards)
+            self.cards.append(card)
+            kind = self._kind_of.get(card.definition)
+            if kind is None:
+                kind = self._kind(card.definition)
+            self._definitions.append(card.definition)
+            self._kinds.append(kind)
+            self._totals[kind] += 1
+            self._slots[id(card)] = slot
+            self.zone.append(DETACHED)
+            self.position.append(-1)
+        self._move_slot(slot, zone)
+        return slot
+
+    def move(self, card: Card, zone: int):
+        """Moves a tracked card to the top of a pile (or out of every pile, with DETACHED)."""
+        slot = self._slots.get(id(card))
+        if slot is None:
+            raise ValueError(f"{card!r} is not in any pile")
+        self._move_slot(slot, zone)
+
+    def draw(self, zone: int = HAND) -> Optional[Card]:
+        """Moves the top card of the draw pile to another pile. Returns it, or None if the pile is empty."""
+        draw_pile = self.piles[DRAW]
+        if not draw_pile:
+            return None
+        slot = draw_pile.pop()
+        self.zone[slot] = DETACHED
+        self.counts[DRAW][self._kinds[slot]] -= 1
+        self._attach(slot, zone)
+        self.version += 1
+        return self.cards[slot]
+
+    def set_pile(self, zone: int, cards: Iterable[Card]):
+        """Replaces a pile's contents. Cards that were in it and aren't in `cards` are detached."""
+        cards = list(cards) # `cards` may be a view of (or generator over) this same pile
+        for slot in self.piles[zone]:
+            self.zone[slot] = DETACHED
+        self.piles[zone].clear()
+        counts = self.counts[zone]
+        counts[:] = [0] * len(counts)
+        self.version += 1
+        for card in cards:
+            self.add(card, zone)
+
+    def shuffle(self, zone: int, rng=random):
+        """Shuffles a pile in place."""
+        pile = self.piles[zone]
+        rng.shuffle(pile)
+        self._renumber(pile)
+
+    def reshuffle_discard(self, rng=random):
+        """
+        Shuffles the discard pile and puts it under the draw pile.
+        Only slot indices move; no card or pile is reallocated.
+        """
+        discard, draw_pile = self.piles[DISCARD], self.piles[DRAW]
+        rng.shuffle(discard)
+        for slot in discard:
+            self.zone[slot] = DRAW
+        draw_pile[0:0] = discard
+        discard.clear()
+        self._renumber(draw_pile)
+        draw_counts, discard_counts = self.counts[DRAW], self.counts[DISCARD]
+        draw_counts[:] = [a + b for a, b in zip(draw_counts, discard_counts)]
+        discard_counts[:] = [0] * len(discard_counts)
+        self.version += 1
+
+    # --- Snapshots ---
+
+    def snapshot(self) -> tuple:
+        """Captures which card is in which pile, in order. Card state (e.g. cost changes) isn't included."""
+        return len(self.cards), tuple(array('i', pile) for pile in self.piles)
+
+    def restore(self, snapshot: tuple):
+        """Puts every card back where it was when the snapshot was taken."""
+        tracked, piles = snapshot
+        for card in self.cards[tracked:]:
+            del self._slots[id(card)]
+        del self.cards[tracked:], self._definitions[tracked:], self.zone[tracked:], self.position[tracked:]
+        if len(self._kinds) != tracked:
+            self._count_kinds()
+        for slot in range(tracked):
+            self.zone[slot] = DETACHED
+        for zone, (pile, saved) in enumerate(zip(self.piles, piles)):
+            pile[:] = saved
+            for index, slot in enumerate(pile):
+                self.zone[slot] = zone
+                self.position[slot] = index
+        self._recount()
+
+    # --- Internals ---
+
+    def _move_slot(self, slot: int, zone: int):
+        if self.zone[slot] != DETACHED:
+            self._detach(slot)
+        if zone != DETACHED:
+            self._attach(slot, zone)
+        self.version += 1
+
+    def _attach(self, slot: int, zone: int):
+        pile = self.piles[zone]
+        self.zone[slot] = zone
+        self.position[slot] = len(pile)
+        pile.append(slot)
+        self.counts[zone][self._kinds[slot]] += 1
+
+    def _detach(self, slot: int):
+        zone = self.zone[slot]
+        pile = self.piles[zone]
+        index = self.position[slot]
+        last = pile.pop()
+        if last != slot:
+            if _ORDERED[zone]:
+                # Put the top card back, then close the gap so the order is kept
+                pile.append(last)
+                del pile[index]
+                for i in range(index, len(pile)):
+                    self.position[pile[i]] = i
+            else:
+                # Move the top card into the gap
+                pile[index] = last
+                self.position[last] = index
+        self.zone[slot] = DETACHED
+        self.counts[zone][self._kinds[slot]] -= 1
+
+    def _kind(self, definition: CardDefinition) -> int:
+        """Registers a new kind of card and returns it."""
+        kind = self._kind_of[definition] = len(self.kind_names)
+        self.kind_names.append(definition.name)
+        for counts in self.counts:
+            counts.append(0)
+        self._totals.append(0)
+        return kind
+
+    def _count_kinds(self):
+        """Rebuilds the slot -> kind table and the totals from the tracked definitions."""
+        kind_of = self._kind_of
+        self._kinds = array('H', [kind_of[d] if d in kind_of else self._kind(d) for d in self._definitions])
+        self._totals = [0] * len(self.kind_names)
+        for kind in self._kinds:
+            self._totals[kind] += 1
+
+    def _recount(self):
+        """Rebuilds every pile's counts from scratch, after a bulk change."""
+        kinds, empty = self._kinds, [0] * len(self.kind_names)
+        for pile, counts in zip(self.piles, self.counts):
+            counts[:] = empty
+            for slot in pile:
+                counts[kinds[slot]] += 1
+        self.version += 1
+
+    def _renumber(self, pile: list[int]):
+        for index, slot in enumerate(pile):
+            self.position[slot] = index
+
+
+class PileView(Sequence):
+    """
+    A live, read-mostly view of one pile that behaves like a list of cards:
+    len(), indexing, iteration, reversed() and `in` all work, and `in` and
+    index() are O(1). Iterating works on a copy of the pile, so cards can be
+    played while looping over the hand.
+    """
+
+    __slots__ = ("_piles", "zone")
+
+    def __init__(self, piles: CardPiles, zone: int):
+        self._piles = piles
+        self.zone = zone
+
+    def __len__(self) -> int:
+        return len(self._piles.piles[self.zone])
+
+    def __getitem__(self, index):
+        cards, pile = self._piles.cards, self._piles.piles[self.zone]
+        if isinstance(index, slice):
+            return [cards[slot] for slot in pile[index]]
+        return cards[pile[index]]
+
+    def __iter__(self) -> Iterator[Card]:
+        cards = self._piles.cards
+        return iter([cards[slot] for slot in self._piles.piles[self.zone]])
+
+    def __reversed__(self) -> Iterator[Card]:
+        cards = self._piles.cards
+        return iter([cards[slot] for slot in reversed(self._piles.piles[self.zone])])
+
+    def __contains__(self, card) -> bool:
+        return self._piles.zone_of(card) == self.zone
+
+    def index(self, card, start: int = 0, stop: Optional[int] = None) -> int:
+        slot = self._piles.slot_of(card)
+        if slot is None or self._piles.zone[slot] != self.zone:
+            raise ValueError(f"{card!r} is not in the {ZONE_NAMES[self.zone]} pile")
+        index = self._piles.position[slot]
+        if index < start or (stop is not None and index >= stop):
+            raise ValueError(f"{card!r} is not in the {ZONE_NAMES[self.zone]} pile")
+        return index
+
+    def append(self, card: Card):
+        """Puts a card on top of this pile, moving it from wherever it was."""
+        self._piles.add(card, self.zone)
+
+    def extend(self, cards: Iterable[Card]):
+        for card in cards:
+            self._piles.add(card, self.zone)
+
+    def __repr__(self) -> str:
+        return f"PileView({ZONE_NAMES[self.zone]}, {list(self)!r})"
@@ -1,18 +1,32 @@
 from __future__ import annotations
-import pygame
 import random
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterable, Optional
+
+from .piles import CardPiles, PileView, DRAW, HAND, DISCARD, EXHAUST, DETACHED
+from .log import log
+from .trace import tracer
 
 # This block is only processed by type checkers, not at runtime
 if TYPE_CHECKING:
+    import pygame
     from card import Card
     from enemy import Enemy
 
 class Player:
     """Represents the player in the game."""
 
-    def __init__(self):
-        """Initializes the player with starting attributes."""
+    images_built = 0 # Placeholder images allocated so far, for the profiler
+
+    def __init__(self, rng: random.Random | None = None):
+        """
+        Initializes the player with starting attributes.
+
+        Args:
+            rng (random.Random | None): The random source used to shuffle the deck.
+                Pass a seeded random.Random for reproducible combats; defaults to the
+                global random module.
+        """
+        self.rng = rng if rng is not None else random
         self.max_hp = 20
         self.hp = 20
         self.max_energy = 3
@@ -22,13 +36,69 @@ class Player:
         
         # --- Card Management ---
         self.deck: list[Card] = []
-        self.hand: list[Card] = []
-        self.draw_pile: list[Card] = []
-        self.discard_pile: list[Card] = []
+        self._deck_counts: Optional[dict[str, int]] = None # card name -> copies in the deck; None until counted
+        self.deck_version = 0 # Goes up whenever set_deck() replaces the deck
+        # The combat's draw pile, hand, discard and exhaust piles all live here (see piles.py).
+        # hand, draw_pile, discard_pile and exhaust_pile below are list-like views of it.
+        self.piles = CardPiles()
 
         # --- Visuals ---
-        self.image = self._create_placeholder_image()
-        self.rect = self.image.get_rect() # Position will be set in main.py
+        # Built on first use, so a headless Player never needs pygame
+        self._image: Optional[pygame.Surface] = None
+        self._rect: Optional[pygame.Rect] = None # Position will be set in main.py
+
+    @property
+    def image(self) -> pygame.Surface:
+        if self._image is None:
+            self._image = self._create_placeholder_image()
+        return self._image
+
+    @image.setter
+    def image(self, surface: pygame.Surface):
+        self._image = surface
+
+    @property
+    def rect(self) -> pygame.Rect:
+        if self._rect is None:
+            self._rect = self.image.get_rect()
+        return self._rect
+
+    @rect.setter
+    def rect(self, rect: pygame.Rect):
+        self._rect = rect
+
+    # --- Piles ---
+    @property
+    def hand(self) -> PileView:
+        return self.piles.view(HAND)
+
+    @hand.setter
+    def hand(self, cards: Iterable[Card]):
+        self.piles.set_pile(HAND, cards)
+
+    @property
+    def draw_pile(self) -> PileView:
+        return self.piles.view(DRAW)
+
+    @draw_pile.setter
+    def draw_pile(self, cards: Iterable[Card]):
+        self.piles.set_pile(DRAW, cards)
+
+    @property
+    def discard_pile(self) -> PileView:
+        return self.piles.view(DISCARD)
+
+    @discard_pile.setter
+    def discard_pile(self, cards: Iterable[Card]):
+        self.piles.set_pile(DISCARD, cards)
+
+    @property
+    def exhaust_pile(self) -> PileView:
+        return self.piles.view(EXHAUST)
+
+    @exhaust_pile.setter
+    def exhaust_pile(self, cards: Iterable[Card]):
+        self.piles.set_pile(EXHAUST, cards)
 
     def reset_stats(self):
         """Resets the player's core stats like HP and energy to their maximums."""
@@ -37,15 +107,38 @@ class Player:
         self.armor = 0
 
     def set_deck(self, cards: list[Card]):
-        """Sets the player's master deck for the run."""
+        """Sets the player's master deck for the run. Replace the deck through here, so its counts stay right."""
         self.deck = cards
+        self._deck_counts = None # Counted on the next composition() call (headless runs never ask)
+        self.deck_version += 1
+
+    # --- Composition ---
+    # The piles are counted as cards move (see CardPiles.counts), so reading them never visits the cards
+    def composition(self, zone: Optional[int] = None) -> dict[str, int]:
+        """
+        Returns {card name: copies}, in first-seen order. Don't modify it.
+
+        Args:
+            zone (int | None): A pile (DRAW, HAND, DISCARD or EXHAUST), or None for the whole deck.
+        """
+        if zone is not None:
+            return self.piles.composition(zone)
+        if self._deck_counts is None:
+            self._deck_counts = {}
+            for card in self.deck:
+                self._deck_counts[card.name] = self._deck_counts.get(card.name, 0) + 1
+        return self._deck_counts
+
+    @property
+    def composition_version(self) -> int:
+        """Goes up whenever the deck is replaced or a card changes pile. For displays of the piles; see deck_version for the deck."""
+        return self.deck_version + self.piles.version
 
     def start_new_combat(self):
         """Resets piles and draws an initial hand for combat."""
-        self.draw_pile = self.deck.copy()
-        random.shuffle(self.draw_pile)
-        self.hand = []
-        self.discard_pile = []
+        # Every card goes back into the draw pile; the slots are reused when the deck hasn't changed
+        self.piles.reset(self.deck)
+        self.piles.shuffle(DRAW, self.rng)
         self.armor = 0 # Reset armor at the start of combat
         self.cards_drawn_this_turn = 0 # Reset draw count for new combat
         # Example: Draw 5 cards to start
@@ -54,50 +147,50 @@ class Player:
 
     def _draw_card_no_count(self) -> bool:
         """Internal method to draw a card without incrementing the turn's draw counter. Used for setup."""
-        if not self.draw_pile:
-            return False
-        self.hand.append(self.draw_pile.pop())
-        return True
+        return self.piles.draw(HAND) is not None
 
     def draw_card(self) -> bool:
         """Draws a card from the draw pile into the hand, counting it against the turn limit. Returns True if successful, False otherwise."""
-        if not self.draw_pile:
-            print("Draw pile is empty!")
+        if self.piles.draw(HAND) is None:
+            log.debug("player.draw_pile_empty", "Draw pile is empty!")
             return False
 
-        self.hand.append(self.draw_pile.pop())
         self.cards_drawn_this_turn += 1
         return True
 
-    def play_card(self, card: Card, target: Enemy):
+    @tracer.traced("Player.play_card")
+    def play_card(self, card: Card, target: Enemy) -> bool:
         """
-        Plays a card from the hand, applying its effect and moving it to the discard pile.
+        Plays a card from the hand, applying its effect and moving it to the discard pile
+        (or the exhaust pile, for cards that exhaust).
+        Returns True if the card was played, False if there wasn't enough energy.
         """
+        if self.piles.zone_of(card) != HAND:
+            raise ValueError(f"{card.name} is not in the hand")
         if self.energy < card.cost:
-            print(f"Not enough energy to play {card.name}. Requires {card.cost}, has {self.energy}.")
-            return # Not enough energy
+            log.info("player.not_enough_energy", "Not enough energy to play {card}. Requires {cost}, has {energy}.",
+                     card=card.name, cost=card.cost, energy=self.energy)
+            return False # Not enough energy
 
         self.energy -= card.cost
-
-        # Apply card effect based on its type
-        if card.type == "Attack":
-            # For now, we assume attacks always target the passed 'target'
-            target.hp -= card.value
-            print(f"Played {card.name}, dealing {card.value} damage to {type(target).__name__}. Enemy HP is now {target.hp}.")
-            if target.hp <= 0:
-                print(f"Enemy has been defeated!")
-        elif card.type == "Skill":
-            if card.name == "Defend": # This could be more generic later
-                self.armor += card.value
-                print(f"Played {card.name}, gaining {card.value} armor. Player armor: {self.armor}")
-
-        # Move the card from hand to discard pile
-        self.hand.remove(card)
-        self.discard_pile.append(card)
+        # The card leaves the hand before it resolves, so its own effects (e.g. draws) don't see it
+        self.piles.move(card, DETACHED)
+
+        # Apply the card's effects: a tight loop over its pre-compiled opcodes (see effects.py)
+        for handler, args in card.definition.effects:
+            handler(self, target, *args)
+        log.debug("player.card_played", "Played {card}. Enemy HP: {enemy_hp}, Player armor: {armor}",
+                  card=card.name, enemy_hp=target.hp, armor=self.armor)
+        if target.hp <= 0:
+            log.debug("enemy.defeated", "Enemy has been defeated!")
+
+        # Move the card to the discard pile, or remove it from the combat if it exhausts
+        self.piles.move(card, EXHAUST if card.exhaust else DISCARD)
+        return True
 
     def end_turn(self):
         """Handles end-of-turn logic for the player."""
-        print("Player ends turn. Resetting energy.")
+        log.debug("player.end_turn", "Player ends turn. Resetting energy.")
         self.energy = self.max_energy
         self.cards_drawn_this_turn = 0 # Reset draw count for the new turn
         # We will add discarding the hand here in a future step.
@@ -118,8 +211,10 @@ class Player:
 
     def _create_placeholder_image(self) -> pygame.Surface:
         """Creates a placeholder image for the player."""
+        import pygame
         size = (120, 160)
         image = pygame.Surface(size, pygame.SRCALPHA)
+        Player.images_built += 1
 
         # Simple body shape (e.g., a blue-ish rectangle)
         body_rect = pygame.Rect(10, 20, size[0] - 20, size[1] - 20)
@@ -0,0 +1,211 @@
+from __future__ import annotations
+import math
+import time
+from collections import deque
+from typing import Callable, Optional
+
+import pygame
+
+from .trace import tracer
+from .ui import get_font
+
+# --- Overlay Style ---
+PANEL_COLOR = (0, 0, 0, 190)
+TEXT_COLOR = (220, 220, 220)
+PHASE_COLORS = {
+    "events": (120, 180, 255),
+    "update": (120, 220, 120),
+    "draw": (240, 200, 90),
+    "flip": (230, 120, 200),
+    "wait": (90, 90, 110),
+}
+BUDGET_COLOR = (200, 60, 60) # The 60 FPS line on the graph
+FONT_SIZE = 18
+LINE_HEIGHT = 16
+GRAPH_HEIGHT = 50
+
+
+class FrameProfiler:
+    """
+    Measures where each frame's time goes and shows it as an overlay (toggled with F3).
+
+    The main loop calls begin_frame() at the top of every frame and mark(phase) after
+    each phase (events, update, draw, flip). Time not covered by any phase, i.e. waiting
+    in clock.tick() and yielding to the browser, is reported as "wait". While the
+    overlay is off both calls return straight away, so leaving them in costs nothing
+    worth measuring. While the tracer is recording (see trace.py), every frame and
+    phase is also recorded there as a span, whether or not the overlay is on.
+
+    Counters are read from the existing caches and renderers rather than counted in
+    the hot paths: see add_counter().
+    """
+
+    PHASES = ("events", "update", "draw", "flip")
+
+    def __init__(self, history: int = 240, refresh: int = 10):
+        """
+        Args:
+            history (int): How many frames the percentiles, averages and graph cover.
+            refresh (int): Rebuild the overlay's text every this many frames, so it can be read.
+        """
+        self.enabled = False
+        self.history = history
+        self.refresh = refresh
+        self.frames = 0 # Frames measured since the overlay was turned on
+        self.frame_times: deque[float] = deque(maxlen=history) # Milliseconds
+        self.phase_times = {phase: deque(maxlen=history) for phase in self.PHASES + ("wait",)}
+        self._counters: dict[str, tuple[Callable[[], int], bool]] = {} # name -> (read, cumulative)
+        self._counter_last: dict[str, int] = {}
+        self.counter_values: dict[str, deque[int]] = {}
+        self._frame_start: Optional[float] = None
+        self._mark: float = 0.0
+        self._current: dict[str, float] = {}
+        self._panel: Optional[pygame.Surface] = None
+        self.panel_version = 0 # Changes whenever the overlay has to be repainted
+        self.surfaces_built = 0 # Surfaces allocated for the panel so far: its background and one per text line
+
+    # --- Recording ---
+
+    def add_counter(self, name: str, read: Callable[[], int], cumulative: bool = True):
+        """
+        Adds a counter to the overlay.
+
+        Args:
+            name (str): Label shown in the overlay.
+            read (callable): Returns the counter's value.
+            cumulative (bool): True if `read` returns a running total (e.g. cache misses),
+                in which case the overlay shows how much it grew each frame. False if it
+                already is a per-frame number (e.g. draw calls this frame).
+        """
+        self._counters[name] = (read, cumulative)
+        self.counter_values[name] = deque(maxlen=self.history)
+
+    def toggle(self):
+        """Turns the overlay (and the measuring) on or off."""
+        self.enabled = not self.enabled
+        self._frame_start = None
+        if self.enabled:
+            self.reset()
+
+    def reset(self):
+        """Forgets every measurement."""
+        self.frames = 0
+        self.frame_times.clear()
+        for times in self.phase_times.values():
+            times.clear()
+        for values in self.counter_values.values():
+            values.clear()
+        self._counter_last = {name: read() for name, (read, cumulative) in self._counters.items() if cumulative}
+        self._panel = None
+
+    def begin_frame(self):
+        """Ends the previous frame's measurement and starts a new one."""
+        if not (self.enabled or tracer.enabled):
+            self._frame_start = None
+            return
+        now = time.perf_counter()
+        if self._frame_start is not None:
+            tracer.complete("frame", self._frame_start, now, "frame")
+            if self.enabled:
+                self._end_frame(now)
+        self._frame_start = self._mark = now
+        self._current = {}
+
+    def mark(self, phase: str):
+        """Records the time since the last mark (or the start of the frame) as `phase`."""
+        if not (self.enabled or tracer.enabled) or self._frame_start is None:
+            return
+        now = time.perf_counter()
+        tracer.complete(phase, self._mark, now, "frame")
+        if self.enabled:
+            self._current[phase] = self._current.get(phase, 0.0) + (now - self._mark)
+        self._mark = now
+
+    def _end_frame(self, now: float):
+        total = now - self._frame_start
+        self.frame_times.append(total * 1000)
+        measured = 0.0
+        for phase in self.PHASES:
+            seconds = self._current.get(phase, 0.0)
+            measured += seconds
+            self.phase_times[phase].append(seconds * 1000)
+        self.phase_times["wait"].append(max(total - measured, 0.0) * 1000)
+
+        for name, (read, cumulative) in self._counters.items():
+            value = read()
+            if cumulative:
+                value, self._counter_last[name] = value - self._counter_last.get(name, value), value
+            self.counter_values[name].append(value)
+
+        self.frames += 1
+        if (self.frames - 1) % self.refresh == 0:
+            self._panel = None
+            self.panel_version += 1
+
+    # --- Statistics ---
+
+    def percentile(self, percent: float) -> float:
+        """The frame time (ms) that `percent`% of the recent frames were at or under."""
+        if not self.frame_times:
+            return 0.0
+        ordered = sorted(self.frame_times)
+        rank = max(0, min(len(ordered) - 1, math.ceil(percent / 100 * len(ordered)) - 1)) # Nearest rank
+        return ordered[rank]
+
+    def phase_average(self, phase: str) -> float:
+        """Mean milliseconds per frame spent in `phase` over the recent frames."""
+        times = self.phase_times[phase]
+        return sum(times) / len(times) if times else 0.0
+
+    # --- Overlay ---
+
+    def rect(self, topleft: tuple[int, int] = (10, 60)) -> pygame.Rect:
+        """The area the overlay covers."""
+        return self._get_panel().get_rect(topleft=topleft)
+
+    def draw(self, surface: pygame.Surface, topleft: tuple[int, int] = (10, 60)):
+        """Draws the overlay. It is rebuilt every `refresh` frames and reused in between."""
+        surface.blit(self._get_panel(), topleft)
+
+    def _get_panel(self) -> pygame.Surface:
+        if self._panel is None:
+            self._panel = self._compose()
+        return self._panel
+
+    def _compose(self) -> pygame.Surface:
+        """Builds the overlay: percentiles, the phase breakdown, counters and the frame-time graph."""
+        p50, p95, p99 = self.percentile(50), self.percentile(95), self.percentile(99)
+        lines = [(f"Frame  p50 {p50:.1f}  p95 {p95:.1f}  p99 {p99:.1f} ms", TEXT_COLOR)]
+        for phase in self.PHASES + ("wait",):
+            lines.append((f"{phase:<7} {self.phase_average(phase):6.2f} ms", PHASE_COLORS[phase]))
+        for name, values in self.counter_values.items():
+            last = values[-1] if values else 0
+            peak = max(values) if values else 0
+            lines.append((f"{name}: {last} (max {peak})", TEXT_COLOR))
+
+        # The overlay draws its own text straight from the font, so it never shows up in the text cache counters
+        font = get_font(FONT_SIZE)
+        width = max(260, self.history + 20)
+        panel = pygame.Surface((width, 10 + len(lines) * LINE_HEIGHT + GRAPH_HEIGHT + 10), pygame.SRCALPHA)
+        panel.fill(PANEL_COLOR)
+        self.surfaces_built += 1 + len(lines)
+        for i, (text, color) in enumerate(lines):
+            panel.blit(font.render(text, True, color), (10, 5 + i * LINE_HEIGHT))
+
+        # --- Frame-time graph: one column per frame, stacked by phase, 33 ms high ---
+        graph_bottom = panel.get_height() - 5
+        scale = GRAPH_HEIGHT / 33.3
+        for x in range(len(self.frame_times)):
+            y = graph_bottom
+            for phase in self.PHASES:
+                height = self.phase_times[phase][x] * scale
+                if height >= 0.5:
+                    pygame.draw.line(panel, PHASE_COLORS[phase], (10 + x, y), (10 + x, max(y - height, graph_bottom - GRAPH_HEIGHT)))
+                y -= height
+            # Anything else is waiting; only the top of the frame is drawn so the phases stay visible
+            top = graph_bottom - min(self.frame_times[x] * scale, GRAPH_HEIGHT)
+            if top < y:
+                panel.set_at((10 + x, int(top)), PHASE_COLORS["wait"])
+        budget_y = graph_bottom - int(1000 / 60 * scale)
+        pygame.draw.line(panel, BUDGET_COLOR, (10, budget_y), (width - 10, budget_y))
+        return panel
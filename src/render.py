@@ -0,0 +1,149 @@
+from __future__ import annotations
+import pygame
+from typing import Callable, Hashable, Optional
+
+from .ui import text_cache
+
+
+class Sprite:
+    """
+    A tracked piece of the scene: how to draw it, the area it covers, and a
+    signature of what it currently shows. The renderer compares the area and
+    signature with last frame's to decide whether the sprite needs repainting.
+    """
+
+    __slots__ = ("name", "draw", "bounds", "signature", "visible", "rect", "last_signature")
+
+    def __init__(
+        self,
+        name: str,
+        draw: Callable[[pygame.Surface], None],
+        bounds: Callable[[], pygame.Rect],
+        signature: Optional[Callable[[], Hashable]] = None,
+        visible: Optional[Callable[[], bool]] = None,
+    ):
+        self.name = name
+        self.draw = draw
+        self.bounds = bounds
+        self.signature = signature
+        self.visible = visible
+        self.rect: Optional[pygame.Rect] = None # Area covered last frame (None = not drawn)
+        self.last_signature: Hashable = None
+
+
+class DirtyRenderer:
+    """
+    A retained-mode render layer that only repaints what changed.
+
+    Each frame, every sprite's area and signature are compared with the previous
+    frame's. The old and new areas of anything that changed are repainted (the
+    background first, then every sprite overlapping them, in the order they were
+    added) and only those rects are returned for pygame.display.update().
+    """
+
+    DEBUG_COLOR = (255, 0, 255)
+
+    def __init__(self, background=(20, 20, 30)):
+        self.background = background
+        self.sprites: list[Sprite] = []
+        self.debug = False # Outline the repainted regions
+        self.last_dirty: list[pygame.Rect] = []
+        self._full_redraw = True
+        self._screen_size = None
+        self._debug_outlines: list[pygame.Rect] = []
+
+    def add(
+        self,
+        name: str,
+        draw: Callable[[pygame.Surface], None],
+        bounds: Callable[[], pygame.Rect],
+        signature: Optional[Callable[[], Hashable]] = None,
+        visible: Optional[Callable[[], bool]] = None,
+    ) -> Sprite:
+        """Adds a sprite on top of everything added before it."""
+        sprite = Sprite(name, draw, bounds, signature, visible)
+        self.sprites.append(sprite)
+        self._full_redraw = True
+        return sprite
+
+    def add_text(
+        self,
+        name: str,
+        text: Callable[[], str],
+        pos: Callable[[], tuple[int, int]],
+        font_size: int = 24,
+        color=(255, 255, 255),
+        visible: Optional[Callable[[], bool]] = None,
+    ) -> Sprite:
+        """Adds a text label. It is repainted only when its text or position changes."""
+        def draw(surface: pygame.Surface):
+            surface.blit(text_cache.render(text(), font_size, color), pos())
+
+        def bounds() -> pygame.Rect:
+            return text_cache.render(text(), font_size, color).get_rect(topleft=pos())
+
+        return self.add(name, draw, bounds, text, visible)
+
+    def invalidate(self):
+        """Forces the whole screen to be repainted next frame (e.g. after a resize)."""
+        self._full_redraw = True
+
+    def render(self, screen: pygame.Surface) -> list[pygame.Rect]:
+        """Repaints the changed regions of the screen. Returns the rects to pass to display.update()."""
+        screen_rect = screen.get_rect()
+        if screen.get_size() != self._screen_size:
+            self._screen_size = screen.get_size()
+            self._full_redraw = True
+
+        dirty: list[pygame.Rect] = list(self._debug_outlines) # Erase last frame's outlines
+        for sprite in self.sprites:
+            if sprite.visible is None or sprite.visible():
+                rect = pygame.Rect(sprite.bounds())
+                signature = sprite.signature() if sprite.signature else None
+            else:
+                rect = signature = None
+
+            if rect != sprite.rect or signature != sprite.last_signature:
+                if sprite.rect:
+                    dirty.append(sprite.rect)
+                if rect:
+                    dirty.append(rect)
+            sprite.rect = rect
+            sprite.last_signature = signature
+
+        if self._full_redraw:
+            dirty = [screen_rect]
+            self._full_redraw = False
+        else:
+            dirty = self._merge([rect.clip(screen_rect) for rect in dirty if rect.colliderect(screen_rect)])
+
+        for area in dirty:
+            screen.set_clip(area)
+            screen.fill(self.background)
+            for sprite in self.sprites:
+                if sprite.rect and sprite.rect.colliderect(area):
+                    sprite.draw(screen)
+        screen.set_clip(None)
+
+        self._debug_outlines = []
+        if self.debug:
+            for area in dirty:
+                pygame.draw.rect(screen, self.DEBUG_COLOR, area, 1)
+            self._debug_outlines = [area.copy() for area in dirty]
+
+        self.last_dirty = dirty
+        return dirty
+
+    @staticmethod
+    def _merge(rects: list[pygame.Rect]) -> list[pygame.Rect]:
+        """Unions overlapping rects so each pixel is repainted (and pushed) once."""
+        merged: list[pygame.Rect] = []
+        for rect in rects:
+            rect = rect.copy()
+            # Keep absorbing anything this rect now touches until nothing changes
+            index = rect.collidelist(merged)
+            while index != -1:
+                rect.union_ip(merged.pop(index))
+                index = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
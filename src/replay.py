@@ -0,0 +1,401 @@
+from __future__ import annotations
+import argparse
+import hashlib
+import json
+import os
+import time
+from typing import TYPE_CHECKING, Callable, NamedTuple, Optional
+
+from .card import load_cards
+from .combat import Run, CombatEngine, play_first_affordable, ENEMY_STATES, GAME_OVER, COMBAT_WIN
+
+# This block is only processed by type checkers, not at runtime
+if TYPE_CHECKING:
+    from .card import Card
+    from .player import Player
+
+DEFAULT_CARDS_PATH = os.path.join(os.path.dirname(__file__), 'data', 'cards.json')
+
+# --- Stream Format ---
+# Header: MAGIC, then varints for the format version and the run seed, then the
+# first 8 bytes of the card catalog's hash.
+# Body: one varint per record, `(argument << OP_BITS) | op`. Keyframes are followed
+# by four more varints: combat serial, combat count, HP and energy (zigzag-encoded).
+MAGIC = b"CGRP"
+VERSION = 1
+CATALOG_HASH_SIZE = 8
+
+# --- Record Types ---
+PLAY_CARD = 0 # Argument: the card's index in the hand
+END_TURN = 1
+RESTART = 2
+NEXT_COMBAT = 3
+KEYFRAME = 4 # The run's state at the start of a combat
+OP_BITS = 3
+OP_MASK = (1 << OP_BITS) - 1
+
+DEFAULT_KEYFRAME_INTERVAL = 10 # Combats between keyframes
+
+
+class ReplayError(ValueError):
+    """Raised for malformed replays, or replays that don't match the current cards or rules."""
+
+
+# --- Encoding Helpers ---
+
+def write_varint(out: bytearray, value: int):
+    """Appends an unsigned LEB128 varint."""
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def read_varint(data: bytes, pos: int) -> tuple[int, int]:
+    """Reads an unsigned LEB128 varint. Returns (value, position after it)."""
+    value = shift = 0
+    while True:
+        if pos >= len(data):
+            raise ReplayError("Replay ends in the middle of a record")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+def zigzag(value: int) -> int:
+    """Maps signed ints to unsigned ones so small negatives stay small (0, -1, 1, -2 -> 0, 1, 2, 3)."""
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+def unzigzag(value: int) -> int:
+    return value // 2 if value % 2 == 0 else -(value + 1) // 2
+
+
+def catalog_hash(cards_path: str = DEFAULT_CARDS_PATH) -> bytes:
+    """Hashes the card catalog's content (not its formatting), so replays can tell if the cards changed."""
+    with open(cards_path, 'r') as f:
+        cards = json.load(f)
+    canonical = json.dumps(cards, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).digest()[:CATALOG_HASH_SIZE]
+
+
+class Keyframe(NamedTuple):
+    """The state of the run at the start of a combat: everything needed to resume from there."""
+    record_index: int # Where the keyframe is in Replay.records
+    combat_serial: int # Combats started before this one, counting restarts
+    combat_count: int
+    hp: int
+    energy: int
+
+
+# --- Recording ---
+
+class ReplayRecorder:
+    """
+    Records a run as a compact binary stream of player actions.
+
+    The caller seeds each combat's shuffle with combat_seed(seed, recorder.combats_started)
+    before dealing it, then reports it with combat_started(). Everything between
+    actions (auto-ending turns, the enemy's turn) follows from the rules, so only
+    the player's choices are stored, mostly at one byte each.
+    """
+
+    def __init__(self, seed: int, catalog_digest: bytes, keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL):
+        """
+        Args:
+            seed (int): The run seed every combat's shuffle is derived from.
+            catalog_digest (bytes): catalog_hash() of the cards the run is played with.
+            keyframe_interval (int): Write a keyframe every this many combats, for seeking.
+        """
+        self.seed = seed
+        self.keyframe_interval = keyframe_interval
+        self.combats_started = 0
+        self.buffer = bytearray(MAGIC)
+        write_varint(self.buffer, VERSION)
+        write_varint(self.buffer, seed)
+        self.buffer += catalog_digest[:CATALOG_HASH_SIZE].ljust(CATALOG_HASH_SIZE, b"\0")
+
+    def _record(self, op: int, argument: int = 0):
+        write_varint(self.buffer, (argument << OP_BITS) | op)
+
+    def combat_started(self, combat_count: int, player: Player):
+        """Call once a combat has been dealt. Writes a keyframe every keyframe_interval combats."""
+        if self.combats_started % self.keyframe_interval == 0:
+            self._record(KEYFRAME)
+            for value in (self.combats_started, combat_count, zigzag(player.hp), zigzag(player.energy)):
+                write_varint(self.buffer, value)
+        self.combats_started += 1
+
+    def play_card(self, hand_index: int):
+        """Records a card played from the given position in the hand."""
+        self._record(PLAY_CARD, hand_index)
+
+    def end_turn(self):
+        self._record(END_TURN)
+
+    def restart(self):
+        self._record(RESTART)
+
+    def next_combat(self):
+        self._record(NEXT_COMBAT)
+
+    def getvalue(self) -> bytes:
+        """Returns the replay recorded so far."""
+        return bytes(self.buffer)
+
+    def save(self, path: str):
+        """Writes the replay recorded so far to a file."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(self.buffer)
+
+
+def record_session(
+    all_cards: dict,
+    seed: int,
+    combats: int,
+    catalog_digest: bytes,
+    policy: Callable[[CombatEngine], Optional[Card]] = play_first_affordable,
+    keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL,
+) -> bytes:
+    """
+    Plays `combats` combats headlessly with the policy (restarting the run after
+    each loss, like the Restart button) and returns the recorded replay.
+    """
+    recorder = ReplayRecorder(seed, catalog_digest, keyframe_interval)
+    run = Run(all_cards, seed=seed)
+    recorder.combat_started(run.combat_count, run.player)
+    while True:
+        engine = run.engine
+        while not engine.is_over:
+            if engine.state in ENEMY_STATES:
+                engine.run_enemy_turn()
+                continue
+            card = policy(engine)
+            if card is not None:
+                index = run.player.hand.index(card)
+                if engine.play_card(card):
+                    recorder.play_card(index)
+                    continue
+            engine.end_turn()
+            recorder.end_turn()
+        if recorder.combats_started >= combats:
+            return recorder.getvalue()
+        if engine.state == COMBAT_WIN:
+            recorder.next_combat()
+            run.next_combat()
+        else:
+            recorder.restart()
+            run.restart()
+        recorder.combat_started(run.combat_count, run.player)
+
+
+# --- Playback ---
+
+class Replay:
+    """A decoded replay: its header, every record, and where the keyframes are."""
+
+    def __init__(self, seed: int, catalog_digest: bytes, records: list[tuple], keyframes: list[Keyframe]):
+        self.seed = seed
+        self.catalog_digest = catalog_digest
+        self.records = records # (op, argument) pairs; keyframes are (KEYFRAME, Keyframe)
+        self.keyframes = keyframes
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Replay:
+        """Decodes a replay stream."""
+        if data[:len(MAGIC)] != MAGIC:
+            raise ReplayError("Not a replay file")
+        version, pos = read_varint(data, len(MAGIC))
+        if version != VERSION:
+            raise ReplayError(f"Unsupported replay version {version}")
+        seed, pos = read_varint(data, pos)
+        catalog_digest = bytes(data[pos:pos + CATALOG_HASH_SIZE])
+        pos += CATALOG_HASH_SIZE
+
+        records, keyframes = [], []
+        while pos < len(data):
+            value, pos = read_varint(data, pos)
+            op, argument = value & OP_MASK, value >> OP_BITS
+            if op == KEYFRAME:
+                fields = []
+                for _ in range(4):
+                    field, pos = read_varint(data, pos)
+                    fields.append(field)
+                serial, combat_count, hp, energy = fields
+                keyframe = Keyframe(len(records), serial, combat_count, unzigzag(hp), unzigzag(energy))
+                keyframes.append(keyframe)
+                records.append((KEYFRAME, keyframe))
+            elif op <= NEXT_COMBAT:
+                records.append((op, argument))
+            else:
+                raise ReplayError(f"Unknown record type {op}")
+        if not keyframes or keyframes[0].record_index != 0:
+            raise ReplayError("Replay doesn't start with a keyframe")
+        return cls(seed, catalog_digest, records, keyframes)
+
+    @classmethod
+    def load(cls, path: str) -> Replay:
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+
+class ReplayPlayer:
+    """
+    Plays a replay back headlessly, as fast as the rules engine can go.
+
+    seek() jumps to any combat and turn by resuming from the nearest keyframe
+    before it, so only the actions after that keyframe are replayed.
+    """
+
+    def __init__(self, replay: Replay, all_cards: dict, catalog_digest: Optional[bytes] = None):
+        """
+        Args:
+            replay (Replay): The decoded replay.
+            all_cards (dict): The card catalog from load_cards().
+            catalog_digest (bytes | None): catalog_hash() of all_cards. If given, it must match
+                the replay's, since the same actions give a different game with different cards.
+        """
+        if catalog_digest is not None and catalog_digest[:CATALOG_HASH_SIZE] != replay.catalog_digest:
+            raise ReplayError("The replay was recorded with a different card catalog")
+        self.replay = replay
+        self.all_cards = all_cards
+        self.run: Optional[Run] = None
+        self.position = 0 # Index of the next record to apply
+        self.actions = 0 # Records applied so far
+        self._resume(replay.keyframes[0])
+
+    @property
+    def engine(self) -> CombatEngine:
+        return self.run.engine
+
+    @property
+    def combat(self) -> int:
+        """Serial number of the current combat (counting combats after restarts)."""
+        return self.run.combats_started - 1
+
+    @property
+    def turn(self) -> int:
+        return self.run.engine.turn
+
+    @property
+    def finished(self) -> bool:
+        return self.position >= len(self.replay.records)
+
+    def _resume(self, keyframe: Keyframe):
+        """Rebuilds the run from a keyframe."""
+        if self.run is None:
+            self.run = Run(self.all_cards, seed=self.replay.seed)
+        self.run.resume(keyframe.combat_serial, keyframe.combat_count, keyframe.hp, keyframe.energy)
+        self.position = keyframe.record_index + 1
+        self._settle()
+
+    def step(self) -> bool:
+        """Applies the next record. Returns False once the replay has ended."""
+        if self.finished:
+            return False
+        op, argument = self.replay.records[self.position]
+        self.position += 1
+        self.actions += 1
+        run, engine = self.run, self.run.engine
+
+        if op == PLAY_CARD:
+            hand = run.player.hand
+            if argument >= len(hand) or not engine.play_card(hand[argument]):
+                raise ReplayError(f"Replay out of sync: can't play hand card {argument} at record {self.position - 1}")
+        elif op == END_TURN:
+            if not engine.end_turn():
+                raise ReplayError(f"Replay out of sync: can't end the turn at record {self.position - 1}")
+        elif op == RESTART or op == NEXT_COMBAT:
+            if op == RESTART:
+                run.restart()
+            else:
+                run.next_combat()
+            # A keyframe describes the combat as it was dealt, before anything happens in it
+            if not self.finished and self.replay.records[self.position][0] == KEYFRAME:
+                self._check_keyframe(self.replay.records[self.position][1])
+                self.position += 1
+        elif op == KEYFRAME:
+            self._check_keyframe(argument)
+
+        self._settle()
+        return True
+
+    def _settle(self):
+        """Plays out anything that happens without the player (the enemy's turn) at once."""
+        if self.run.engine.state in ENEMY_STATES:
+            self.run.engine.run_enemy_turn()
+
+    def _check_keyframe(self, keyframe: Keyframe):
+        """Makes sure playback still matches the recording when it passes a keyframe."""
+        player = self.run.player
+        actual = (self.combat, self.run.combat_count, player.hp, player.energy)
+        if actual != keyframe[1:]:
+            raise ReplayError(f"Replay out of sync at combat {keyframe.combat_serial}: expected {keyframe[1:]}, got {actual}")
+
+    def play_to_end(self):
+        """Plays every remaining record. Returns the final state of the last combat."""
+        while self.step():
+            pass
+        return self.run.engine.state
+
+    def seek(self, combat: int, turn: int = 1):
+        """
+        Moves playback to the start of the given turn of the given combat, resuming
+        from the closest keyframe before it. Stops at the end of the replay if the
+        target is never reached.
+        """
+        target = (combat, turn)
+        keyframe = None
+        for candidate in self.replay.keyframes:
+            if candidate.combat_serial > combat:
+                break
+            keyframe = candidate
+        if (self.combat, self.turn) > target or keyframe.combat_serial > self.combat:
+            self._resume(keyframe)
+        while (self.combat, self.turn) < target and self.step():
+            pass
+
+
+def main(argv: list[str] | None = None):
+    """Command-line entry point: python -m src.replay run.replay --seek 400"""
+    parser = argparse.ArgumentParser(description="Play back a recorded run without a display.")
+    parser.add_argument("path", nargs="?", help="replay file to play")
+    parser.add_argument("--seek", type=int, default=None, help="start from this combat")
+    parser.add_argument("--turn", type=int, default=1, help="turn within the --seek combat")
+    parser.add_argument("--cards", default=DEFAULT_CARDS_PATH, help="path to cards.json")
+    parser.add_argument("--record", type=int, default=None, metavar="COMBATS",
+                        help="instead of playing, record an automatic session of this many combats to PATH")
+    parser.add_argument("--seed", type=int, default=0, help="run seed for --record")
+    args = parser.parse_args(argv)
+    if not args.path:
+        parser.error("a replay path is required")
+
+    all_cards = load_cards(args.cards)
+    digest = catalog_hash(args.cards)
+    if args.record is not None:
+        data = record_session(all_cards, args.seed, args.record, digest)
+        with open(args.path, 'wb') as f:
+            f.write(data)
+        print(f"Recorded {args.record} combats in {len(data)} bytes to {args.path}")
+        return
+
+    start = time.perf_counter()
+    player = ReplayPlayer(Replay.load(args.path), all_cards, digest)
+    if args.seek is not None:
+        player.seek(args.seek, args.turn)
+        print(f"Seeked to combat {player.combat}, turn {player.turn} "
+              f"({player.actions} records applied) in {time.perf_counter() - start:.3f}s")
+    state = player.play_to_end()
+    elapsed = time.perf_counter() - start
+
+    print(f"Played {player.actions} records in {elapsed:.3f}s ({player.actions / max(elapsed, 1e-9):.0f} records/s)")
+    print(f"Ended in combat {player.combat} (turn {player.turn}): {state}")
+    if state == GAME_OVER:
+        print(f"Reason: {player.engine.game_over_reason}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+from __future__ import annotations
+import pygame
+from typing import Optional
+
+from .combat import GAME_OVER, COMBAT_WIN
+from .ui import text_cache
+
+# --- Modal Screen Definitions ---
+# state -> (title, title color)
+MODAL_TITLES = {
+    GAME_OVER: ("Game Over", (200, 50, 50)),
+    COMBAT_WIN: ("You Win!", (255, 215, 0)),
+}
+OVERLAY_COLOR = (0, 0, 0, 150) # Black, semi-transparent
+LOADING_BAR_SIZE = (400, 24)
+
+
+class ModalScreens:
+    """
+    Composes the full-screen GAME_OVER and COMBAT_WIN overlays.
+
+    Each screen (overlay, title and message) is built into one surface the first
+    time it is shown and reused every frame after that, until the state, the
+    message or the window size changes. Text is centered on the actual window
+    size, so the screens stay correct after a VIDEORESIZE.
+    """
+
+    def __init__(self):
+        self._key: Optional[tuple] = None
+        self._surface: Optional[pygame.Surface] = None
+        self.builds = 0 # How many times a screen had to be composed
+
+    def get(self, state: str, size: tuple[int, int], message: str = "") -> pygame.Surface:
+        """Returns the composed screen for the state at the given window size."""
+        key = (state, size, message)
+        if key != self._key:
+            self._surface = self._compose(state, size, message)
+            self._key = key
+            self.builds += 1
+        return self._surface
+
+    def draw(self, surface: pygame.Surface, state: str, message: str = ""):
+        """Draws the modal screen for the state over the whole surface."""
+        surface.blit(self.get(state, surface.get_size(), message), (0, 0))
+
+    def invalidate(self):
+        """Drops the composed screen so it is rebuilt next time."""
+        self._key = None
+        self._surface = None
+
+    def title_rect(self, state: str, size: tuple[int, int]) -> pygame.Rect:
+        """Where the state's title goes on a window of the given size."""
+        width, height = size
+        title, title_color = MODAL_TITLES[state]
+        return text_cache.render(title, 72, title_color).get_rect(midtop=(width // 2, height // 2 - 100))
+
+    def _compose(self, state: str, size: tuple[int, int], message: str) -> pygame.Surface:
+        """Builds the overlay with its title and message text."""
+        width, height = size
+        screen = pygame.Surface(size, pygame.SRCALPHA)
+        screen.fill(OVERLAY_COLOR)
+
+        title, title_color = MODAL_TITLES[state]
+        screen.blit(text_cache.render(title, 72, title_color), self.title_rect(state, size))
+
+        if message:
+            message_surf = text_cache.render(message, 36, (220, 220, 220))
+            screen.blit(message_surf, message_surf.get_rect(midtop=(width // 2, height // 2 - 30)))
+        return screen
+
+
+def draw_loading_screen(surface: pygame.Surface, loaded: int, total: int, background=(20, 20, 30)):
+    """Draws the loading screen: a title and a progress bar, centered on the surface."""
+    surface.fill(background)
+    width, height = surface.get_size()
+    title_surf = text_cache.render("Loading...", 48, (220, 220, 220))
+    surface.blit(title_surf, title_surf.get_rect(midbottom=(width // 2, height // 2 - 30)))
+
+    bar = pygame.Rect((0, 0), LOADING_BAR_SIZE)
+    bar.center = (width // 2, height // 2)
+    pygame.draw.rect(surface, (60, 60, 80), bar, border_radius=6)
+    if total:
+        filled = bar.copy()
+        filled.width = round(bar.width * loaded / total)
+        pygame.draw.rect(surface, (120, 180, 255), filled, border_radius=6)
+    count_surf = text_cache.render(f"{loaded} / {total} images", 24, (180, 180, 180))
+    surface.blit(count_surf, count_surf.get_rect(midtop=(width // 2, bar.bottom + 10)))
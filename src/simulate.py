@@ -0,0 +1,220 @@
+from __future__ import annotations
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from typing import Callable, Optional
+
+from .card import load_cards
+from .combat import Run, COMBAT_WIN
+
+DEFAULT_CARDS_PATH = os.path.join(os.path.dirname(__file__), 'data', 'cards.json')
+
+# Each worker process loads the card catalog once and keeps it here.
+_worker_cards: dict = {}
+
+
+def derive_seed(base_seed: int, chunk_index: int) -> int:
+    """
+    Derives an independent seed for one chunk of runs.
+    Hashing keeps neighbouring chunks' streams unrelated, and because it depends only
+    on the chunk index, results don't change with the number of workers.
+    """
+    digest = hashlib.sha256(f"{base_seed}:{chunk_index}".encode()).digest()
+    return int.from_bytes(digest[:8], "little")
+
+
+class SimulationStats:
+    """
+    Streamed aggregates over many runs. Each worker fills one of these for its
+    chunk, and the parent merges them as they arrive.
+    """
+
+    def __init__(self):
+        self.runs = 0
+        self.wins = 0 # Runs that cleared every combat up to max_combats
+        self.combats = 0
+        self.combats_survived = Counter() # combats won -> number of runs
+        self.damage_taken = Counter() # HP lost in one combat -> number of combats
+
+    @property
+    def win_rate(self) -> float:
+        """Fraction of runs that cleared every combat."""
+        return self.wins / self.runs if self.runs else 0.0
+
+    @property
+    def mean_combats_survived(self) -> float:
+        """Average number of combats won per run."""
+        if not self.runs:
+            return 0.0
+        return sum(won * count for won, count in self.combats_survived.items()) / self.runs
+
+    def record_combat(self, damage: int):
+        """Records one finished combat and the HP the player lost in it."""
+        self.combats += 1
+        self.damage_taken[damage] += 1
+
+    def record_run(self, combats_won: int, max_combats: int):
+        """Records one finished run."""
+        self.runs += 1
+        self.combats_survived[combats_won] += 1
+        if combats_won >= max_combats:
+            self.wins += 1
+
+    def merge(self, other: SimulationStats):
+        """Adds another set of results into this one."""
+        self.runs += other.runs
+        self.wins += other.wins
+        self.combats += other.combats
+        self.combats_survived.update(other.combats_survived)
+        self.damage_taken.update(other.damage_taken)
+
+    def to_dict(self) -> dict:
+        """Returns the aggregates in a JSON-friendly form."""
+        return {
+            "runs": self.runs,
+            "wins": self.wins,
+            "win_rate": self.win_rate,
+            "combats": self.combats,
+            "mean_combats_survived": self.mean_combats_survived,
+            "combats_survived": {str(k): v for k, v in sorted(self.combats_survived.items())},
+            "damage_taken": {str(k): v for k, v in sorted(self.damage_taken.items())},
+        }
+
+
+def collect_run_stats(
+    make_run: Callable[[int], Run],
+    play_combat: Callable[[Run], str],
+    runs: int,
+    max_combats: int,
+    on_progress: Optional[Callable[[SimulationStats], None]] = None,
+) -> SimulationStats:
+    """
+    Plays `runs` full runs and returns their aggregates. A run moves on to the next
+    combat after each win, and ends on a loss or once it has won `max_combats` combats.
+
+    Args:
+        make_run (callable): Called with the run's index; returns a fresh Run.
+        play_combat (callable): Plays the run's current combat to the end and returns the final state.
+        runs (int): Number of full runs.
+        max_combats (int): A run that wins this many combats counts as a win.
+        on_progress (callable | None): Called with the stats so far after each run.
+    """
+    stats = SimulationStats()
+    for run_index in range(runs):
+        run = make_run(run_index)
+        player = run.player
+        while True:
+            hp_before = player.hp
+            state = play_combat(run)
+            stats.record_combat(hp_before - player.hp)
+            if state != COMBAT_WIN:
+                combats_won = run.combat_count
+                break
+            if run.combat_count + 1 >= max_combats:
+                combats_won = run.combat_count + 1
+                break
+            run.next_combat()
+        stats.record_run(combats_won, max_combats)
+        if on_progress:
+            on_progress(stats)
+    return stats
+
+
+def simulate_runs(all_cards: dict, runs: int, max_combats: int, rng: random.Random) -> SimulationStats:
+    """Plays `runs` full runs with one random stream and returns their aggregates."""
+    return collect_run_stats(lambda _: Run(all_cards, rng=rng), lambda run: run.engine.run(), runs, max_combats)
+
+
+def _init_worker(cards_path: str):
+    """Runs once in each worker process."""
+    global _worker_cards
+    _worker_cards = load_cards(cards_path)
+
+
+def _run_chunk(base_seed: int, chunk_index: int, runs: int, max_combats: int) -> SimulationStats:
+    """Simulates one chunk of runs in a worker with the chunk's own random stream."""
+    rng = random.Random(derive_seed(base_seed, chunk_index))
+    return simulate_runs(_worker_cards, runs, max_combats, rng)
+
+
+def run_simulation(
+    runs: int,
+    max_combats: int,
+    seed: int = 0,
+    workers: int | None = None,
+    chunk_size: int = 250,
+    cards_path: str = DEFAULT_CARDS_PATH,
+    on_progress=None,
+) -> SimulationStats:
+    """
+    Runs `runs` full runs across a process pool and merges the results as they stream in.
+
+    Args:
+        runs (int): Number of full runs to simulate.
+        max_combats (int): A run that wins this many combats counts as a win.
+        seed (int): Base seed. The same seed and chunk size always give the same totals.
+        workers (int | None): Worker processes; defaults to the number of CPUs.
+        chunk_size (int): Runs per task. Each chunk gets its own seeded stream.
+        cards_path (str): Path to cards.json.
+        on_progress (callable | None): Called with the merged stats after each chunk.
+    """
+    # The process pool machinery is slow to import, and modules that only need the
+    # helpers above (e.g. mcts, solver) shouldn't pay for it
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    total = SimulationStats()
+    chunks = [(i, min(chunk_size, runs - start)) for i, start in enumerate(range(0, runs, chunk_size))]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(cards_path,)) as pool:
+        futures = [pool.submit(_run_chunk, seed, index, count, max_combats) for index, count in chunks]
+        for future in as_completed(futures):
+            total.merge(future.result())
+            if on_progress:
+                on_progress(total)
+    return total
+
+
+def main(argv: list[str] | None = None):
+    """Command-line entry point: python -m src.simulate --runs 100000 --max-combats 20"""
+    parser = argparse.ArgumentParser(description="Monte Carlo simulation of full runs.")
+    parser.add_argument("--runs", type=int, default=10000, help="number of full runs")
+    parser.add_argument("--max-combats", type=int, default=20, help="combats needed to win a run")
+    parser.add_argument("--seed", type=int, default=0, help="base random seed")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all CPUs)")
+    parser.add_argument("--chunk-size", type=int, default=250, help="runs per task")
+    parser.add_argument("--cards", default=DEFAULT_CARDS_PATH, help="path to cards.json")
+    parser.add_argument("--json", dest="json_path", help="write the aggregates to this JSON file")
+    args = parser.parse_args(argv)
+
+    def report_progress(stats: SimulationStats):
+        print(f"\r{stats.runs}/{args.runs} runs, win rate {stats.win_rate:.1%}", end="", file=sys.stderr)
+
+    start = time.perf_counter()
+    stats = run_simulation(
+        args.runs, args.max_combats, seed=args.seed, workers=args.workers,
+        chunk_size=args.chunk_size, cards_path=args.cards, on_progress=report_progress,
+    )
+    elapsed = time.perf_counter() - start
+    print(file=sys.stderr)
+
+    print(f"Runs: {stats.runs} in {elapsed:.2f}s ({stats.runs / elapsed:.0f} runs/s)")
+    print(f"Win rate (cleared {args.max_combats} combats): {stats.win_rate:.2%}")
+    print(f"Mean combats survived: {stats.mean_combats_survived:.2f}")
+    print("Combats survived:")
+    for won, count in sorted(stats.combats_survived.items()):
+        print(f"  {won:3d}: {count}")
+    print("Damage taken per combat:")
+    for damage, count in sorted(stats.damage_taken.items()):
+        print(f"  {damage:3d}: {count}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(stats.to_dict(), f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
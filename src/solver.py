@@ -0,0 +1,213 @@
+from __future__ import annotations
+import argparse
+import sys
+import time
+from typing import Callable, NamedTuple, Optional
+
+from .card import load_cards
+from .combat import COMBAT_WIN, GAME_OVER
+from .effects import effect_totals
+from .mcts import END_TURN, legal_moves, hand_index, play_runs
+from .piles import DRAW
+from .simulate import SimulationStats, DEFAULT_CARDS_PATH
+from .state import GameState
+
+
+def turn_score(state: GameState) -> float:
+    """
+    Scores the position once the turn (and the enemy's reply) is over:
+    winning beats surviving beats losing, then HP kept minus enemy HP left.
+    HP and unspent energy both carry over into the next combat, so a win is
+    worth more the more of each is left.
+    """
+    if state.state == COMBAT_WIN:
+        return 2000 + state.hp + 10 * state.energy
+    if state.state == GAME_OVER:
+        return state.hp - state.enemy.hp
+    return 1000 + state.hp - state.enemy.hp
+
+
+class Solution(NamedTuple):
+    """The best line for one turn."""
+    score: float
+    line: tuple # Moves to play in order: (card id, cost) pairs; the turn ends after them
+    nodes: int # Positions expanded for this solve
+    table_hits: int # Positions answered from the transposition table
+    elapsed: float # Seconds
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class TurnSolver:
+    """
+    Finds the best sequence of cards to play this turn, exactly.
+
+    Every order of plays is searched depth-first, but positions that only differ
+    in the order of the cards played are the same: the transposition table keys a
+    position by the multiset of cards left in hand, energy, both sides' HP and
+    armor and the draw pile. The table is kept between solves, so a later turn
+    with the same hand and numbers is answered without searching (memoization
+    across turns).
+
+    This is perfect play with the draw pile known: a reference for designers,
+    not something a player could do.
+    """
+
+    def __init__(self, evaluate: Callable[[GameState], float] = turn_score):
+        """
+        Args:
+            evaluate (callable): Scores a position after the turn and the enemy's reply.
+                Higher is better. It must only depend on what the table key includes.
+        """
+        self.evaluate = evaluate
+        self.table: dict[tuple, tuple[float, tuple]] = {} # position key -> (best score, best line)
+        self.nodes = 0
+        self.table_hits = 0
+        self._draws_matter: dict[tuple, bool] = {} # definitions -> whether any card draws
+
+    def _key(self, state: GameState) -> tuple:
+        definitions, costs = state.definitions, state.costs
+        hand = tuple(sorted((definitions[slot].id, costs[slot]) for slot in state.hand))
+        draw_pile = state.piles[DRAW]
+        if self._deck_draws(state):
+            # Drawing cards can change which cards are in hand, so the order of the pile matters
+            draw_key = tuple((definitions[slot].id, costs[slot]) for slot in draw_pile)
+        else:
+            draw_key = len(draw_pile) # Only whether the next turn's draw succeeds matters
+        enemy = state.enemy
+        return (hand, state.energy, state.max_energy, state.hp, state.armor,
+                enemy.hp, enemy.armor, enemy.attack_damage, draw_key)
+
+    def _deck_draws(self, state: GameState) -> bool:
+        draws = self._draws_matter.get(state.definitions)
+        if draws is None:
+            draws = False
+            for definition in set(state.definitions):
+                try:
+                    draws = draws or effect_totals(definition.effects).draw > 0
+                except ValueError:
+                    draws = True # A conditional effect could draw
+            self._draws_matter[state.definitions] = draws
+        return draws
+
+    def solve(self, state: GameState) -> Solution:
+        """Returns the best line for the current turn of `state` (which isn't changed)."""
+        nodes, hits = self.nodes, self.table_hits
+        start = time.perf_counter()
+        score, line = self._search(state)
+        elapsed = time.perf_counter() - start
+        return Solution(score, line, self.nodes - nodes, self.table_hits - hits, elapsed)
+
+    def _search(self, state: GameState) -> tuple[float, tuple]:
+        key = self._key(state)
+        known = self.table.get(key)
+        if known is not None:
+            self.table_hits += 1
+            return known
+        self.nodes += 1
+
+        # Ending the turn now is always an option
+        ended = state.copy()
+        ended.end_turn()
+        best = (self.evaluate(ended), ())
+
+        turn = state.turn
+        for move in legal_moves(state):
+            if move is END_TURN:
+                continue
+            child = state.copy()
+            child.play(hand_index(child, move))
+            if child.is_over or child.turn != turn:
+                result = (self.evaluate(child), (move,)) # The play ended the turn (or the combat)
+            else:
+                score, line = self._search(child)
+                result = (score, (move,) + line)
+            if result[0] > best[0]:
+                best = result
+
+        self.table[key] = best
+        return best
+
+
+class SolverAgent:
+    """Plays each turn's optimal line. Same interface as MCTSAgent, so it can play full runs."""
+
+    def __init__(self, solver: Optional[TurnSolver] = None, on_solve: Optional[Callable[[GameState, Solution], None]] = None):
+        """
+        Args:
+            solver (TurnSolver | None): The solver to use; its table is shared by every decision.
+            on_solve (callable | None): Called with the position and its Solution after each decision.
+        """
+        self.solver = solver if solver is not None else TurnSolver()
+        self.on_solve = on_solve
+        self.decisions = 0
+        self.nodes = 0
+        self.elapsed = 0.0
+
+    def choose(self, state: GameState):
+        """Returns the first move of the best line: a (card id, cost) to play, or END_TURN."""
+        solution = self.solver.solve(state)
+        self.decisions += 1
+        self.nodes += solution.nodes
+        self.elapsed += solution.elapsed
+        if self.on_solve:
+            self.on_solve(state, solution)
+        return solution.line[0] if solution.line else END_TURN
+
+    def close(self):
+        pass
+
+    def __enter__(self) -> SolverAgent:
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main(argv: list[str] | None = None):
+    """Command-line entry point: python -m src.solver --runs 200 --max-combats 10"""
+    parser = argparse.ArgumentParser(description="Play full runs with exact per-turn optimal play.")
+    parser.add_argument("--runs", type=int, default=100, help="number of full runs")
+    parser.add_argument("--max-combats", type=int, default=10, help="combats needed to win a run")
+    parser.add_argument("--seed", type=int, default=0, help="base random seed")
+    parser.add_argument("--cards", default=DEFAULT_CARDS_PATH, help="path to cards.json")
+    parser.add_argument("--show", type=int, default=0, metavar="N", help="print the best line of the first N decisions")
+    args = parser.parse_args(argv)
+
+    all_cards = load_cards(args.cards)
+
+    def report_progress(stats: SimulationStats):
+        print(f"\r{stats.runs}/{args.runs} runs, win rate {stats.win_rate:.1%}", end="", file=sys.stderr)
+
+    start = time.perf_counter()
+    shown = 0
+
+    def show_solution(state: GameState, solution: Solution):
+        nonlocal shown
+        if shown < args.show:
+            shown += 1
+            hand = ", ".join(state.card(slot).name for slot in state.hand)
+            line = ", ".join(f"{all_cards[card_id].name} ({cost})" for card_id, cost in solution.line) or "nothing"
+            print(f"Turn {state.turn}, energy {state.energy}, enemy HP {state.enemy.hp}, hand [{hand}]: "
+                  f"play {line} (score {solution.score:g}, {solution.nodes} nodes, "
+                  f"{solution.table_hits} table hits, {solution.nodes_per_second:.0f} nodes/s)")
+
+    agent = SolverAgent(on_solve=show_solution)
+    stats = play_runs(agent, all_cards, args.runs, args.max_combats, args.seed, report_progress)
+    elapsed = time.perf_counter() - start
+    print(file=sys.stderr)
+
+    solver = agent.solver
+    print(f"Runs: {stats.runs} in {elapsed:.1f}s")
+    print(f"Win rate with perfect play (cleared {args.max_combats} combats): {stats.win_rate:.2%}")
+    print(f"Mean combats survived: {stats.mean_combats_survived:.2f}")
+    print(f"Decisions: {agent.decisions}, nodes searched: {agent.nodes}, table hits: {solver.table_hits}, "
+          f"table size: {len(solver.table)}")
+    if agent.elapsed > 0:
+        print(f"Search speed: {agent.nodes / agent.elapsed:.0f} nodes/s")
+
+
+if __name__ == "__main__":
+    main()
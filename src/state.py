@@ -0,0 +1,261 @@
+from __future__ import annotations
+import random
+from array import array
+from typing import TYPE_CHECKING
+
+from .combat import PLAYER_TURN, GAME_OVER, COMBAT_WIN
+from .piles import DRAW, HAND, DISCARD, EXHAUST
+
+# This block is only processed by type checkers, not at runtime
+if TYPE_CHECKING:
+    from .card import CardDefinition
+    from .enemy import Enemy
+    from .player import Player
+
+
+class EnemyState:
+    """The rules-only part of an Enemy: no image, rect or animation."""
+
+    __slots__ = ("hp", "armor", "attack_damage")
+
+    def __init__(self, hp: int, armor: int = 0, attack_damage: int = 10):
+        self.hp = hp
+        self.armor = armor
+        self.attack_damage = attack_damage
+
+    def copy(self) -> EnemyState:
+        return EnemyState(self.hp, self.armor, self.attack_damage)
+
+
+class GameState:
+    """
+    A combat as plain values, for lookahead, undo and AI.
+
+    Player and Enemy carry pygame Surfaces and Rects, so copying them is slow.
+    A GameState only holds numbers: the player's and enemy's stats, the piles as
+    small arrays of card slots. Card definitions are shared and immutable, so they
+    are never copied.
+
+    copy() is copy-on-write: the pile arrays are shared with the copy and only
+    duplicated by whichever state changes a pile first. Branching costs a handful
+    of attribute copies, and a playout only pays for the piles it touches.
+
+    The rules match CombatEngine with the enemy's turn played out at once, and
+    card effects run through the same handlers as Player.play_card (see effects.py).
+    """
+
+    __slots__ = (
+        "definitions", "costs", "hp", "max_hp", "armor", "energy", "max_energy",
+        "cards_drawn_this_turn", "enemy", "turn", "state", "game_over_reason",
+        "piles", "_owned",
+    )
+
+    def __init__(
+        self,
+        definitions: tuple[CardDefinition, ...],
+        costs: tuple[int, ...],
+        piles: tuple[array, ...],
+        enemy: EnemyState,
+        hp: int = 20,
+        max_hp: int = 20,
+        energy: int = 3,
+        max_energy: int = 3,
+    ):
+        """
+        Args:
+            definitions (tuple[CardDefinition, ...]): The card in each slot of the combat.
+            costs (tuple[int, ...]): Each slot's energy cost (after any in-play changes).
+            piles (tuple[array, ...]): Slot arrays for the draw, hand, discard and exhaust
+                piles, indexed by the zones in piles.py. The end of an array is the top.
+            enemy (EnemyState): The enemy's stats.
+        """
+        self.definitions = definitions
+        self.costs = costs
+        self.piles = list(piles)
+        self.enemy = enemy
+        self.hp = hp
+        self.max_hp = max_hp
+        self.armor = 0
+        self.energy = energy
+        self.max_energy = max_energy
+        self.cards_drawn_this_turn = 0
+        self.turn = 1
+        self.state = PLAYER_TURN
+        self.game_over_reason = ""
+        self._owned = 0b1111 # Bit per pile: set if this state may change the array in place
+
+    @classmethod
+    def from_combat(cls, player: Player, enemy: Enemy, turn: int = 1) -> GameState:
+        """Captures a live combat (the Player's piles and stats and the Enemy's) as a GameState."""
+        cards = player.piles.cards
+        state = cls(
+            tuple(card.definition for card in cards),
+            tuple(card.cost for card in cards),
+            tuple(array('H', pile) for pile in player.piles.piles),
+            EnemyState(enemy.hp, enemy.armor, enemy.attack_damage),
+            hp=player.hp, max_hp=player.max_hp, energy=player.energy, max_energy=player.max_energy,
+        )
+        state.armor = player.armor
+        state.cards_drawn_this_turn = player.cards_drawn_this_turn
+        state.turn = turn
+        state.update()
+        return state
+
+    # --- Snapshots ---
+
+    def copy(self) -> GameState:
+        """Returns an independent copy. The piles are shared until either state changes them."""
+        other = GameState.__new__(GameState)
+        other.definitions = self.definitions
+        other.costs = self.costs
+        other.piles = self.piles.copy() # Just the four references
+        other.enemy = self.enemy.copy()
+        other.hp = self.hp
+        other.max_hp = self.max_hp
+        other.armor = self.armor
+        other.energy = self.energy
+        other.max_energy = self.max_energy
+        other.cards_drawn_this_turn = self.cards_drawn_this_turn
+        other.turn = self.turn
+        other.state = self.state
+        other.game_over_reason = self.game_over_reason
+        other._owned = 0
+        self._owned = 0 # The arrays are shared now, so neither side may write to them
+        return other
+
+    snapshot = copy
+
+    def restore(self, snapshot: GameState):
+        """Rewinds this state, in place, to a snapshot taken with snapshot()."""
+        self.piles[:] = snapshot.piles
+        self.enemy.hp = snapshot.enemy.hp
+        self.enemy.armor = snapshot.enemy.armor
+        self.enemy.attack_damage = snapshot.enemy.attack_damage
+        self.hp = snapshot.hp
+        self.max_hp = snapshot.max_hp
+        self.armor = snapshot.armor
+        self.energy = snapshot.energy
+        self.max_energy = snapshot.max_energy
+        self.cards_drawn_this_turn = snapshot.cards_drawn_this_turn
+        self.turn = snapshot.turn
+        self.state = snapshot.state
+        self.game_over_reason = snapshot.game_over_reason
+        self._owned = 0
+        snapshot._owned = 0
+
+    def _pile(self, zone: int) -> array:
+        """Returns a pile that is safe to change, copying it first if it's shared."""
+        if not self._owned & (1 << zone):
+            self.piles[zone] = array('H', self.piles[zone])
+            self._owned |= 1 << zone
+        return self.piles[zone]
+
+    # --- Queries ---
+
+    @property
+    def hand(self) -> array:
+        """The slots of the cards in hand, in order. Read-only: use play() and draw_card()."""
+        return self.piles[HAND]
+
+    @property
+    def is_over(self) -> bool:
+        return self.state != PLAYER_TURN
+
+    def card(self, slot: int) -> CardDefinition:
+        return self.definitions[slot]
+
+    def playable(self) -> list[int]:
+        """Hand positions of the cards the player can afford right now."""
+        if self.state != PLAYER_TURN:
+            return []
+        costs, energy = self.costs, self.energy
+        return [index for index, slot in enumerate(self.piles[HAND]) if costs[slot] <= energy]
+
+    def distinct_playable(self) -> list[int]:
+        """Like playable(), but only the first of several identical cards, since playing any of them is the same move."""
+        seen = set()
+        moves = []
+        costs, definitions, energy = self.costs, self.definitions, self.energy
+        for index, slot in enumerate(self.piles[HAND]):
+            key = (definitions[slot], costs[slot])
+            if costs[slot] <= energy and key not in seen:
+                seen.add(key)
+                moves.append(index)
+        return moves
+
+    # --- Rules ---
+
+    def draw_card(self) -> bool:
+        """Draws the top card of the draw pile into the hand. Returns False if the pile is empty."""
+        if not self.piles[DRAW]:
+            return False
+        self._pile(HAND).append(self._pile(DRAW).pop())
+        self.cards_drawn_this_turn += 1
+        return True
+
+    def take_damage(self, amount: int):
+        """Armor absorbs damage first, then HP."""
+        absorbed = min(self.armor, amount)
+        self.armor -= absorbed
+        self.hp -= amount - absorbed
+
+    def play(self, hand_index: int) -> bool:
+        """
+        Plays the card at the given hand position, then applies the automatic checks
+        (and the enemy's turn, if the player's turn ends). Returns False if it can't be played.
+        """
+        if self.state != PLAYER_TURN:
+            return False
+        slot = self.piles[HAND][hand_index]
+        cost = self.costs[slot]
+        if self.energy < cost:
+            return False
+        self.energy -= cost
+        self._pile(HAND).pop(hand_index)
+        definition = self.definitions[slot]
+        for handler, args in definition.effects:
+            handler(self, self.enemy, *args)
+        self._pile(EXHAUST if definition.exhaust else DISCARD).append(slot)
+        self.update()
+        return True
+
+    def end_turn(self) -> bool:
+        """Ends the player's turn and plays out the enemy's. Returns False if it isn't the player's turn."""
+        if self.state != PLAYER_TURN:
+            return False
+        self._enemy_turn()
+        self.update()
+        return True
+
+    def _enemy_turn(self):
+        """ENEMY_ANNOUNCE -> ENEMY_ATTACK -> ENEMY_END, as in CombatEngine.advance()."""
+        self.take_damage(self.enemy.attack_damage)
+        if self.hp <= 0:
+            self.game_over_reason = "You have been defeated!"
+            self.state = GAME_OVER
+            return
+        self.energy = self.max_energy
+        self.cards_drawn_this_turn = 0
+        if not self.draw_card():
+            self.game_over_reason = "Draw pile is empty!"
+            self.state = GAME_OVER
+            return
+        self.turn += 1
+
+    def update(self) -> str:
+        """The automatic checks of CombatEngine.update(), playing out enemy turns whenever the player's turn auto-ends."""
+        while self.state == PLAYER_TURN:
+            if self.enemy.hp <= 0:
+                self.state = COMBAT_WIN
+            elif self.hp <= 0:
+                self.game_over_reason = "You have been defeated!"
+                self.state = GAME_OVER
+            elif (self.energy <= 0 and any(self.costs[slot] > 0 for slot in self.piles[HAND])) or not self.piles[HAND]:
+                self._enemy_turn()
+            else:
+                break
+        return self.state
+
+    def shuffle_draw_pile(self, rng: random.Random):
+        """Shuffles the draw pile in place, e.g. to guess at an order the player can't see."""
+        rng.shuffle(self._pile(DRAW))
@@ -0,0 +1,119 @@
+from __future__ import annotations
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+DEFAULT_MAX_EVENTS = 100_000 # Roughly 15 MB of events; the oldest are dropped first
+
+
+class Tracer:
+    """
+    Records timed spans into a ring buffer and writes them out as a Chrome trace.
+
+    The output (trace.json) opens in chrome://tracing or https://ui.perfetto.dev,
+    with one row per thread and every span nested under the frame it happened in.
+    Tracing is opt-in: while it is off, span() and traced functions only check a flag.
+    The buffer holds at most `max_events` spans, so a long session keeps its most
+    recent part and never grows without bound.
+    """
+
+    def __init__(self, max_events: int = DEFAULT_MAX_EVENTS):
+        """
+        Args:
+            max_events (int): Size of the ring buffer. Older spans are dropped once it is full.
+        """
+        self.enabled = False
+        self.events: deque[tuple] = deque(maxlen=max_events) # (name, category, start, end, thread id, args)
+        self.dropped = 0 # Spans pushed out of the buffer
+        self._origin = time.perf_counter()
+        self._thread_names: dict[int, str] = {}
+
+    def start(self):
+        """Starts recording (keeping anything already recorded)."""
+        self.enabled = True
+
+    def stop(self):
+        self.enabled = False
+
+    def clear(self):
+        self.events.clear()
+        self.dropped = 0
+
+    # --- Recording ---
+
+    def complete(self, name: str, start: float, end: float, category: str = "engine", args: Optional[dict] = None):
+        """Records a span that ran from `start` to `end` (time.perf_counter() values)."""
+        if not self.enabled:
+            return
+        thread_id = threading.get_ident()
+        if thread_id not in self._thread_names:
+            self._thread_names[thread_id] = threading.current_thread().name
+        if len(self.events) == self.events.maxlen:
+            self.dropped += 1
+        self.events.append((name, category, start, end, thread_id, args))
+
+    @contextmanager
+    def span(self, name: str, category: str = "engine", **args):
+        """Times the body of a with-block as one span."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.complete(name, start, time.perf_counter(), category, args or None)
+
+    def traced(self, name: Optional[str] = None, category: str = "engine") -> Callable:
+        """Decorator that records every call of the function as a span named `name` (default: its qualified name)."""
+        def decorator(function: Callable) -> Callable:
+            span_name = name or function.__qualname__
+
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self.complete(span_name, start, time.perf_counter(), category)
+            return wrapper
+        return decorator
+
+    # --- Output ---
+
+    def to_chrome(self) -> dict:
+        """The recorded spans in the Chrome trace event format (complete "X" events, in microseconds)."""
+        pid = os.getpid()
+        trace_events = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": thread_id, "args": {"name": thread_name}}
+            for thread_id, thread_name in self._thread_names.items()
+        ]
+        for name, category, start, end, thread_id, args in self.events:
+            event = {
+                "name": name, "cat": category, "ph": "X", "pid": pid, "tid": thread_id,
+                "ts": round((start - self._origin) * 1e6, 3), "dur": round((end - start) * 1e6, 3),
+            }
+            if args:
+                event["args"] = args
+            trace_events.append(event)
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms", "otherData": {"dropped_events": self.dropped}}
+
+    def dump(self, path: str) -> int:
+        """Writes the buffer to `path` as a Chrome trace. Returns the number of spans written."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.to_chrome(), f, separators=(",", ":"))
+        return len(self.events)
+
+
+# The shared tracer: the main loop and the engine's traced functions all record into it.
+tracer = Tracer()
@@ -1,4 +1,88 @@
 import pygame
+from collections import OrderedDict
+
+# --- Font Registry ---
+# Constructing a pygame Font is expensive, so every font is created once per (face, size).
+_fonts: dict[tuple[str | None, int], pygame.font.Font] = {}
+
+
+def get_font(size: int, face: str | None = None) -> pygame.font.Font:
+    """Returns the shared Font for the given face (None = pygame's default) and size."""
+    key = (face, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.Font(face, size)
+        _fonts[key] = font
+    return font
+
+
+def fonts_created() -> int:
+    """How many Fonts have been created so far (one per face and size)."""
+    return len(_fonts)
+
+
+class TextCache:
+    """
+    An LRU cache of rendered text surfaces keyed by (text, size, color, face).
+    Labels that don't change between frames are only rasterized once.
+    The cache evicts the least recently used surfaces once their pixel data
+    goes over the memory budget.
+    """
+
+    def __init__(self, max_bytes: int = 4 * 1024 * 1024):
+        """
+        Args:
+            max_bytes (int): Memory budget for the cached surfaces' pixel data.
+        """
+        self.max_bytes = max_bytes
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def render(self, text: str, font_size: int = 24, color=(255, 255, 255), face: str | None = None) -> pygame.Surface:
+        """Returns the rendered text, from the cache if it has been rendered before."""
+        key = (text, font_size, tuple(color), face)
+        text_surf = self._entries.get(key)
+        if text_surf is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return text_surf
+
+        self.misses += 1
+        text_surf = get_font(font_size, face).render(text, True, color)
+        size = text_surf.get_pitch() * text_surf.get_height()
+        if size <= self.max_bytes:
+            self._entries[key] = text_surf
+            self.used_bytes += size
+            self._evict()
+        return text_surf
+
+    def set_budget(self, max_bytes: int):
+        """Changes the memory budget, evicting entries if the cache is now over it."""
+        self.max_bytes = max_bytes
+        self._evict()
+
+    def clear(self):
+        """Drops every cached surface and resets the counters."""
+        self._entries.clear()
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _evict(self):
+        """Removes least recently used entries until the cache fits its budget."""
+        while self.used_bytes > self.max_bytes and self._entries:
+            _, text_surf = self._entries.popitem(last=False)
+            self.used_bytes -= text_surf.get_pitch() * text_surf.get_height()
+
+
+# The shared cache used by draw_text and the widgets in this module.
+text_cache = TextCache()
+
 
 class Button:
     """A simple clickable button with text."""
@@ -9,19 +93,18 @@ class Button:
         self.color = (70, 80, 90) # Dark grey
         self.hover_color = (90, 100, 110) # Lighter grey
         self.text_color = (255, 255, 255) # White
-        self.font = pygame.font.Font(None, 32) # Default font, size 32
+        self.font_size = 32 # Default font, size 32
+        self.hovered = False # Set by the owner once per frame from its hit test (see main.py)
 
     def draw(self, surface: pygame.Surface):
         """Draws the button on the given surface."""
-        # Check for mouse hover
-        is_hovered = self.rect.collidepoint(pygame.mouse.get_pos())
-        draw_color = self.hover_color if is_hovered else self.color
+        draw_color = self.hover_color if self.hovered else self.color
 
         pygame.draw.rect(surface, draw_color, self.rect, border_radius=8)
 
         # Draw text
         if self.text != '':
-            text_surf = self.font.render(self.text, True, self.text_color)
+            text_surf = text_cache.render(self.text, self.font_size, self.text_color)
             text_rect = text_surf.get_rect(center=self.rect.center)
             surface.blit(text_surf, text_rect)
 
@@ -39,12 +122,9 @@ class Button:
         return False
 
 def draw_text(surface: pygame.Surface, text: str, x: int, y: int, font_size=24, color=(255, 255, 255)):
-    """A helper function to draw text on a surface."""
-    font = pygame.font.Font(None, font_size)
-    text_surf = font.render(text, True, color)
-    text_rect = text_surf.get_rect()
-    text_rect.topleft = (x, y)
-    surface.blit(text_surf, text_rect)
+    """A helper function to draw text on a surface. Rendered text is cached between calls."""
+    text_surf = text_cache.render(text, font_size, color)
+    surface.blit(text_surf, (x, y))
 
 def wrap_text(surface, text, pos, font, max_width, color=(255, 255, 255)):
     """
@@ -0,0 +1,78 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# --- Add the project root to the Python path ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '.'))
+sys.path.insert(0, project_root)
+# ---
+
+import pygame
+from src.assets import AssetManager, artwork_files
+from src.card import load_cards
+from src.log import log, RingSink
+
+class TestAssetManager(unittest.TestCase):
+    """Tests for the artwork preloader."""
+
+    def setUp(self):
+        """A folder with a few real PNGs and one broken file."""
+        self._directory = tempfile.TemporaryDirectory()
+        self.directory = self._directory.name
+        self.names = []
+        for i in range(6):
+            image = pygame.Surface((8, 12))
+            image.fill((i * 40, 0, 0))
+            name = f"art{i}.png"
+            pygame.image.save(image, os.path.join(self.directory, name))
+            self.names.append(name)
+        with open(os.path.join(self.directory, "broken.png"), "wb") as f:
+            f.write(b"not a png")
+
+        self.ring = RingSink()
+        self._sinks = log.sinks
+        log.configure(sinks=[self.ring])
+
+    def tearDown(self):
+        log.configure(sinks=self._sinks)
+        self._directory.cleanup()
+
+    def test_preload_on_threads(self):
+        """Verify every file is decoded once, progress is reported, and lookups never touch the disk again."""
+        manager = AssetManager(self.directory, workers=3)
+        progress = []
+        manager.preload_now(self.names + self.names[:2], lambda loaded, total: progress.append((loaded, total)))
+
+        self.assertEqual(progress, [(i, 6) for i in range(7)])
+        self.assertEqual(manager.disk_loads, 6)
+        self.assertEqual(manager.get("art3.png").get_at((0, 0))[:3], (120, 0, 0))
+        for name in self.names:
+            manager.get(name)
+        self.assertEqual(manager.disk_loads, 6)
+
+    def test_without_threads(self):
+        """Verify the one-file-at-a-time path (used in the browser) loads the same files."""
+        manager = AssetManager(self.directory, workers=1)
+        manager.preload_now(self.names)
+        self.assertEqual(len(manager), 6)
+        self.assertEqual(manager.get("art5.png").get_size(), (8, 12))
+
+    def test_failures_are_remembered(self):
+        """Verify broken or missing files load as None and are only reported once."""
+        manager = AssetManager(self.directory)
+        manager.preload_now(["broken.png", "missing.png"])
+        self.assertIsNone(manager.get("broken.png"))
+        self.assertIsNone(manager.get("missing.png"))
+        self.assertEqual(manager.disk_loads, 2)
+        self.assertEqual(len(self.ring.records), 2)
+
+    def test_catalog_artwork(self):
+        """Verify every artwork the catalog refers to is found, once each."""
+        all_cards = load_cards(os.path.join(project_root, 'src', 'data', 'cards.json'))
+        files = artwork_files(all_cards.values())
+        self.assertEqual(len(files), len(set(files)))
+        self.assertEqual(set(files), {card.artwork_filename for card in all_cards.values()})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import random
+import sys
+import os
+
+# --- Add the project root to the Python path ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '.'))
+sys.path.insert(0, project_root)
+# ---
+
+try:
+    import numpy
+except ImportError: # The batch simulator is optional; the game runs without NumPy
+    numpy = None
+
+from src.player import Player
+from src.enemy import Enemy
+from src.card import load_cards
+from src.combat import CombatEngine, build_starting_deck, enemy_hp_for_combat, COMBAT_WIN
+
+if numpy is not None:
+    from src.batch_sim import BatchCombat, WIN, LOSS_DEFEATED, LOSS_EMPTY_DRAW
+
+@unittest.skipIf(numpy is None, "NumPy is not installed")
+class TestBatchSim(unittest.TestCase):
+    """Tests that the vectorized batch simulator matches the scalar rules."""
+
+    def setUp(self):
+        """Load the real card catalog."""
+        self.all_cards = load_cards(os.path.join(project_root, 'src', 'data', 'cards.json'))
+
+    def run_scalar(self, seed: int, enemy_hp: int, player_hp: int):
+        """Runs one combat through Player/Enemy/CombatEngine with a seeded shuffle."""
+        player = Player(rng=random.Random(seed))
+        player.hp = player_hp
+        player.set_deck(build_starting_deck(self.all_cards, load_images=False))
+        player.start_new_combat()
+        enemy = Enemy(0, 0, hp=enemy_hp)
+        engine = CombatEngine(player, enemy)
+        engine.run()
+        return engine, player, enemy
+
+    def test_batch_matches_scalar_engine(self):
+        """Verify every game in a batch ends exactly like the scalar engine on the same seed."""
+        seeds = list(range(300))
+        for combat_count in (0, 3, 8):
+            enemy_hp = enemy_hp_for_combat(combat_count)
+            player_hp = 20 - combat_count
+            batch = BatchCombat.from_catalog(self.all_cards, seeds, enemy_hp, player_hp=player_hp).run()
+
+            for i, seed in enumerate(seeds):
+                engine, player, enemy = self.run_scalar(seed, enemy_hp, player_hp)
+                with self.subTest(combat_count=combat_count, seed=seed):
+                    self.assertEqual(batch.outcome[i] == WIN, engine.state == COMBAT_WIN)
+                    self.assertEqual(batch.hp[i], player.hp)
+                    self.assertEqual(batch.armor[i], player.armor)
+                    self.assertEqual(batch.energy[i], player.energy)
+                    self.assertEqual(batch.enemy_hp[i], enemy.hp)
+                    self.assertEqual(batch.turns[i], engine.turn)
+                    self.assertEqual(batch.hand_len[i], len(player.hand))
+                    self.assertEqual(batch.discard_len[i], len(player.discard_pile))
+
+    def test_fast_shuffle_is_deterministic(self):
+        """Verify the vectorized shuffle deals valid, reproducible draw piles."""
+        first = BatchCombat.from_catalog(self.all_cards, range(50), 15, fast_shuffle=True)
+        second = BatchCombat.from_catalog(self.all_cards, range(50), 15, fast_shuffle=True)
+
+        self.assertTrue((first.hand == second.hand).all())
+        self.assertTrue((first.draw == second.draw).all())
+        for row in first.draw:
+            self.assertEqual(sorted(row), list(range(first.deck_size)))
+
+    def test_loss_reasons(self):
+        """Verify the batch records why each lost game ended."""
+        # Arrange: an enemy that can't be beaten and a player that can't be killed
+        batch = BatchCombat.from_catalog(self.all_cards, [1, 2], enemy_hp=1000, player_hp=[5, 1000])
+
+        # Act
+        batch.run()
+
+        # Assert
+        self.assertEqual(batch.outcome[0], LOSS_DEFEATED)
+        self.assertEqual(batch.outcome[1], LOSS_EMPTY_DRAW)
+        self.assertFalse(batch.active.any())
+
+if __name__ == '__main__':
+    unittest.main()
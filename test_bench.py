@@ -0,0 +1,62 @@
+import unittest
+import sys
+import os
+import io
+import contextlib
+
+# --- Add the project root to the Python path ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '.'))
+sys.path.insert(0, project_root)
+# ---
+
+from src.bench import run_benchmarks, compare, measure
+
+def results(**values):
+    """Builds a result set: positive values are throughputs, negative ones latencies in ms."""
+    return {"version": 1, "results": {
+        name: {"value": abs(value), "unit": "ms" if value < 0 else "items/s", "higher_is_better": value > 0}
+        for name, value in values.items()
+    }}
+
+class TestBench(unittest.TestCase):
+    """Tests for the benchmark runner and baseline comparison."""
+
+    def test_compare_flags_regressions_in_either_unit(self):
+        """Verify fewer items/s and more ms both count as slowdowns, and only past the threshold."""
+        baseline = results(copies=1000, frame=-2.0, faces=100)
+        current = results(copies=800, frame=-2.1, faces=200)
+        rows = {name: (change, regressed) for name, _, _, change, regressed in compare(baseline, current, threshold=0.1)}
+
+        self.assertAlmostEqual(rows["copies"][0], 0.25)
+        self.assertTrue(rows["copies"][1])
+        self.assertAlmostEqual(rows["frame"][0], 0.05)
+        self.assertFalse(rows["frame"][1])
+        self.assertLess(rows["faces"][0], 0) # Faster
+        self.assertFalse(rows["faces"][1])
+
+    def test_compare_skips_missing_benchmarks(self):
+        """Verify benchmarks that only one side has are left out."""
+        rows = compare(results(copies=1000, frame=-2.0), results(copies=1000))
+        self.assertEqual([row[0] for row in rows], ["copies"])
+
+    def test_measure(self):
+        """Verify measure reports the time per call and the items per call."""
+        seconds, items = measure(lambda: 3, repeat=2, min_time=0.001)
+        self.assertEqual(items, 3)
+        self.assertGreater(seconds, 0)
+
+    def test_run_headless(self):
+        """Verify a quick run produces results in the baseline format without a window."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            output = run_benchmarks(["card_copy", "frame_hand_5"], repeat=1, min_time=0.001)
+        self.assertEqual(set(output["results"]), {"card_copy", "frame_hand_5"})
+        self.assertEqual(output["results"]["frame_hand_5"]["unit"], "ms")
+        self.assertGreater(output["results"]["card_copy"]["value"], 0)
+
+    def test_unknown_benchmark(self):
+        """Verify asking for a benchmark that doesn't exist is an error."""
+        with self.assertRaises(ValueError):
+            run_benchmarks(["no_such_benchmark"])
+
+if __name__ == '__main__':
+    unittest.main()
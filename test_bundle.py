@@ -0,0 +1,89 @@
+import unittest
+import sys
+import os
+import io
+import zipfile
+import zipimport
+import tempfile
+import threading
+import contextlib
+import urllib.request
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+# --- Add the project root to the Python path ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '.'))
+sys.path.insert(0, project_root)
+# ---
+
+from src.bundle import build_bundle, collect_files, mount, BundleError, BUNDLE_NAME
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+class TestBundle(unittest.TestCase):
+    """Tests for the single-archive web bundle."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.data, cls.manifest = build_bundle(project_root)
+
+    def test_contents(self):
+        """Verify the bundle has the game's code, card data and artwork, but no tests or dev tools."""
+        files = self.manifest["files"]
+        for path in ("main.py", "src/card.py", "src/bundle.py", "src/data/cards.json"):
+            self.assertIn(path, files)
+        self.assertTrue(any(path.startswith("assets/images/") for path in files))
+        self.assertFalse(any("test_" in path or path == "src/run_dev.py" for path in files))
+        self.assertEqual(list(files), collect_files(project_root))
+
+    def test_reproducible(self):
+        """Verify building the same tree twice gives identical bytes."""
+        again, manifest = build_bundle(project_root)
+        self.assertEqual(again, self.data)
+        self.assertEqual(manifest["digest"], self.manifest["digest"])
+
+    def test_served_and_mounted_offline(self):
+        """Verify the bundle can be fetched in one request from a static file server, imported from and unpacked."""
+        with tempfile.TemporaryDirectory() as site, tempfile.TemporaryDirectory() as browser_fs:
+            with open(os.path.join(site, BUNDLE_NAME), "wb") as f:
+                f.write(self.data)
+            server = ThreadingHTTPServer(("127.0.0.1", 0), partial(QuietHandler, directory=site))
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            try:
+                url = f"http://127.0.0.1:{server.server_address[1]}/{BUNDLE_NAME}"
+                with contextlib.closing(urllib.request.urlopen(url)) as response:
+                    fetched = response.read()
+            finally:
+                server.shutdown()
+                server.server_close()
+            self.assertEqual(fetched, self.data)
+
+            # index.html imports the loader straight from the archive
+            bundle_path = os.path.join(browser_fs, BUNDLE_NAME)
+            with open(bundle_path, "wb") as f:
+                f.write(fetched)
+            loader = zipimport.zipimporter(bundle_path + "/src/")
+            self.assertIsNotNone(loader.find_spec("bundle"))
+
+            mount(bundle_path, browser_fs)
+            for path in ("main.py", "src/data/cards.json"):
+                with open(os.path.join(browser_fs, path), "rb") as mounted, open(os.path.join(project_root, path), "rb") as original:
+                    self.assertEqual(mounted.read(), original.read())
+
+    def test_tampered_file_is_rejected(self):
+        """Verify a file that doesn't match its manifest hash is refused."""
+        source = zipfile.ZipFile(io.BytesIO(self.data))
+        output = io.BytesIO()
+        with zipfile.ZipFile(output, "w") as tampered:
+            for info in source.infolist():
+                data = source.read(info)
+                tampered.writestr(info, data + b" " if info.filename == "src/data/cards.json" else data)
+        with tempfile.TemporaryDirectory() as target:
+            with self.assertRaises(BundleError):
+                mount(output.getvalue(), target)
+
+if __name__ == '__main__':
+    unittest.main()
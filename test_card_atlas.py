@@ -0,0 +1,67 @@
+import unittest
+import sys
+import os
+
+# --- Add the project root to the Python path ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '.'))
+sys.path.insert(0, project_root)
+# ---
+
+import pygame
+from src.card import Card
+from src.atlas import CardAtlas
+
+class TestCardAtlas(unittest.TestCase):
+    """Tests for packing card faces into one texture and drawing them in batches."""
+
+    @classmethod
+    def setUpClass(cls):
+        pygame.font.init()
+
+    def setUp(self):
+        """Create a handful of distinct card templates (their artwork is missing, so placeholders are packed)."""
+        Card.clear_image_caches()
+        self.templates = [
+            Card({"id": f"c{i}", "name": f"Card {i}", "cost": i % 3, "type": "Attack", "value": i,
+                  "description": f"Deal {i} damage.", "artwork": "missing.png"})
+            for i in range(30)
+        ]
+        self.atlas = CardAtlas(self.templates)
+        self.screen = pygame.Surface((1280, 720))
+
+    def test_regions_do_not_overlap(self):
+        """Verify every face gets its own area inside the texture."""
+        regions = list(self.atlas.regions.values())
+        texture_rect = self.atlas.texture.get_rect()
+
+        self.assertEqual(len(regions), 30)
+        for i, region in enumerate(regions):
+            self.assertTrue(texture_rect.contains(region))
+            self.assertEqual(region.collidelist(regions[i + 1:]), -1)
+
+    def test_hand_is_drawn_with_one_call(self):
+        """Verify a whole hand costs a single blits call, or three with a hover highlight."""
+        hand = [self.templates[i % 30].copy() for i in range(50)]
+        for i, card in enumerate(hand):
+            card.rect = pygame.Rect(i * 20, 400, 100, 150)
+
+        self.atlas.draw_cards(self.screen, hand)
+        self.assertEqual((self.atlas.draw_calls, self.atlas.cards_drawn), (1, 50))
+
+        self.atlas.reset_stats()
+        self.atlas.draw_cards(self.screen, hand, hovered_card=hand[10])
+        self.assertEqual((self.atlas.draw_calls, self.atlas.cards_drawn), (3, 50))
+
+    def test_modified_card_falls_back_to_its_own_image(self):
+        """Verify a card whose face isn't packed is still drawn in the same batch."""
+        card = self.templates[0].copy()
+        card.cost = 9
+        card.rect = pygame.Rect(0, 0, 100, 150)
+
+        self.assertIsNone(self.atlas.region_for(card))
+        self.atlas.draw_cards(self.screen, [card, self.templates[1].copy()])
+        self.assertEqual(self.atlas.draw_calls, 1)
+        self.assertEqual(self.atlas.cards_drawn, 1) # The second card has no rect yet
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+import sys
+import os
+
+# --- Add the project root to the Python path ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '.'))
+sys.path.insert(0, project_root)
+# ---
+
+from src.card import Card, CardDefinition, load_cards
+
+class TestCardDefinition(unittest.TestCase):
+    """Tests for the shared card definitions and the small per-copy card state."""
+
+    def setUp(self):
+        self.data = {"id": "c1", "name": "Strike", "cost": 1, "type": "Attack", "value": 6, "description": "Deal 6 damage.", "artwork": "s.png"}
+
+    def test_definitions_are_interned(self):
+        """Verify cards built from the same data share one definition."""
+        first = Card(dict(self.data))
+        second = Card(dict(self.data))
+        different = Card(dict(self.data, value=7))
+
+        self.assertIs(first.definition, second.definition)
+        self.assertIsNot(first.definition, different.definition)
+
+    def test_definitions_are_immutable(self):
+        """Verify a definition can't be changed after it is loaded."""
+        definition = CardDefinition.get(self.data)
+        with self.assertRaises(AttributeError):
+            definition.cost = 0
+
+    def test_copy_shares_definition_and_keeps_own_state(self):
+        """Verify copies share static data, while costs modified in play stay per copy."""
+        card = Card(self.data)
+        card.cost = 0
+        copy = card.copy(load_image=False)
+        copy.cost = 2
+
+        self.assertIs(copy.definition, card.definition)
+        self.assertEqual((card.cost, copy.cost, card.definition.cost), (0, 2, 1))
+        copy.cost = 1
+        self.assertIsNone(copy.cost_override) # Back to the definition's cost
+
+    def test_instances_have_no_per_instance_dict(self):
+        """Verify card instances are slotted, so big decks stay small."""
+        card = Card(self.data)
+        self.assertFalse(hasattr(card, "__dict__"))
+        with self.assertRaises(AttributeError):
+            card.some_new_field = 1
+
+    def test_catalog_uses_definitions(self):
+        """Verify the loaded catalog exposes the fields from cards.json."""
+        all_cards = load_cards(os.path.join(project_root, 'src', 'data', 'cards.json'))
+        strike = all_cards["card_001"]
+
+        self.assertIsInstance(strike.definition, CardDefinition)
+        self.assertEqual((strike.name, strike.type, strike.value), ("Strike", "Attack", 5))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+import sys
+import os
+
+# --- Add the project root to the Python path ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '.'))
+sys.path.insert(0, project_root)
+# ---
+
+import pygame
+from src.card import Card
+
+class TestCardFaces(unittest.TestCase):
+    """Tests for the shared card face cache."""
+
+    @classmethod
+    def setUpClass(cls):
+        pygame.font.init()
+
+    def setUp(self):
+        """Start from empty caches with a card whose artwork doesn't exist (so a placeholder is used)."""
+        Card.clear_image_caches()
+        card_data = {"id": "c1", "name": "Strike", "cost": 1, "type": "Attack", "value": 6, "description": "Deal 6 damage.", "artwork": "missing.png"}
+        self.template = Card(card_data)
+        self.template.load_image()
+
+    def test_copies_share_one_face(self):
+        """Verify every copy of a card uses the same pre-rendered surface."""
+        copies = [self.template.copy() for _ in range(10)]
+
+        for card in copies:
+            self.assertIs(card.image, self.template.image)
+        self.assertEqual(len(Card._face_cache), 1)
+
+    def test_headless_copies_have_no_image(self):
+        """Verify copies made without images never build a face."""
+        card = self.template.copy(load_image=False)
+        self.assertIsNone(card.image)
+
+    def test_changing_cost_switches_face(self):
+        """Verify a cost change in play gets its own face, and changing it back reuses the original."""
+        card = self.template.copy()
+        original_face = card.image
+
+        card.cost = 0
+        discounted_face = card.image
+        card.cost = 1
+
+        self.assertIsNot(discounted_face, original_face)
+        self.assertIs(card.image, original_face)
+        self.assertIs(self.template.image, original_face) # Other copies are untouched
+        self.assertEqual(len(Card._face_cache), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+import sys
+import os
+
+# --- Add the project root to the Python path ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '.'))
+sys.path.insert(0, project_root)
+# ---
+
+import pygame
+from src.clock import FixedTimestep
+from src.enemy import Enemy
+
+class TestFixedTimestep(unittest.TestCase):
+    """Tests for the fixed-step simulation clock and per-second enemy animations."""
+
+    def test_steps_follow_real_time(self):
+        """Verify frames of any length add up to the same number of steps."""
+        fast, slow = FixedTimestep(step=0.01), FixedTimestep(step=0.01)
+        fast_steps = sum(fast.advance(0.004) for _ in range(100)) # 250 FPS for 0.4s
+        slow_steps = sum(slow.advance(0.1) for _ in range(4)) # 10 FPS for 0.4s
+
+        self.assertAlmostEqual(fast_steps, 40, delta=1)
+        self.assertAlmostEqual(slow_steps, 40, delta=1)
+        self.assertGreaterEqual(fast.alpha, 0.0)
+        self.assertLessEqual(fast.alpha, 1.0)
+
+    def test_long_frames_are_capped(self):
+        """Verify a huge frame doesn't make the game run hundreds of steps to catch up."""
+        timestep = FixedTimestep(step=1 / 60, max_steps=5)
+        self.assertEqual(timestep.advance(10.0), 5)
+        self.assertEqual(timestep.accumulator, 0.0)
+
+    def attack_duration(self, dt: float) -> float:
+        """Returns the simulated time until the enemy's attack lands."""
+        enemy = Enemy(600, 300)
+        enemy.start_attack_animation(pygame.Rect(100, 250, 100, 100))
+        elapsed = 0.0
+        while not enemy.update(dt):
+            elapsed += dt
+        return elapsed
+
+    def test_attack_takes_the_same_time_at_any_step(self):
+        """Verify the attack animation speed is per second, not per update."""
+        self.assertAlmostEqual(self.attack_duration(1 / 30), self.attack_duration(1 / 240), delta=1 / 30)
+
+    def test_interpolation_and_fast_forward(self):
+        """Verify drawing interpolates between steps and fast-forward skips the animation."""
+        enemy = Enemy(600, 300)
+        enemy.start_attack_animation(pygame.Rect(100, 250, 100, 100))
+        enemy.update(0.1)
+        enemy.interpolate(0.5)
+        self.assertEqual(enemy.rect.centerx, round((enemy.prev_x + enemy.x) / 2))
+
+        self.assertTrue(enemy.finish_animation())
+        self.assertEqual(enemy.animation_state, "idle")
+        self.assertFalse(enemy.finish_animation()) # Nothing left to skip
+
+if __name__ == '__main__':
+    unittest.main()
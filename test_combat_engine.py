@@ -0,0 +1,141 @@
+import unittest
+import sys
+import os
+
+# --- Add the project root to the Python path ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '.'))
+sys.path.insert(0, project_root)
+# ---
+
+from src.player import Player
+from src.enemy import Enemy
+from src.card import Card, load_cards
+from src.combat import (
+    CombatEngine, build_starting_deck, enemy_hp_for_combat,
+    PLAYER_TURN, ENEMY_ANNOUNCE, ENEMY_ATTACK, ENEMY_END, GAME_OVER, COMBAT_WIN,
+)
+
+class TestCombatEngine(unittest.TestCase):
+    """Tests for the headless combat engine's state machine."""
+
+    def setUp(self):
+        """Set up a player with a small deck and an enemy."""
+        strike_data = {"id": "c1", "name": "Strike", "cost": 1, "type": "Attack", "value": 6, "description": "Deal 6 damage.", "artwork": "s.png"}
+        defend_data = {"id": "c2", "name": "Defend", "cost": 1, "type": "Skill", "value": 5, "description": "Gain 5 Block.", "artwork": "d.png"}
+        self.strike = Card(strike_data)
+        self.defend = Card(defend_data)
+
+        self.player = Player()
+        self.enemy = Enemy(0, 0, hp=20)
+
+    def test_playing_lethal_card_wins_combat(self):
+        """Verify that defeating the enemy moves the engine to COMBAT_WIN."""
+        # Arrange
+        self.enemy.hp = 5
+        self.player.hand = [self.strike]
+        engine = CombatEngine(self.player, self.enemy)
+
+        # Act
+        played = engine.play_card(self.strike)
+
+        # Assert
+        self.assertTrue(played)
+        self.assertEqual(engine.state, COMBAT_WIN)
+        self.assertTrue(engine.is_over)
+
+    def test_cannot_play_card_without_energy(self):
+        """Verify that an unaffordable card is rejected and stays in hand."""
+        # Arrange
+        self.player.energy = 1
+        expensive = self.strike.copy(load_image=False)
+        expensive.cost = 2
+        self.player.hand = [expensive, self.defend]
+        engine = CombatEngine(self.player, self.enemy)
+
+        # Act
+        played = engine.play_card(expensive)
+
+        # Assert
+        self.assertFalse(played)
+        self.assertIn(expensive, self.player.hand)
+        self.assertEqual(self.player.energy, 1)
+        self.assertEqual(engine.state, PLAYER_TURN)
+
+    def test_turn_auto_ends_when_nothing_is_affordable(self):
+        """Verify the engine moves to ENEMY_ANNOUNCE when the player is out of energy."""
+        # Arrange
+        self.player.energy = 1
+        self.player.hand = [self.strike, self.defend]
+        engine = CombatEngine(self.player, self.enemy)
+
+        # Act
+        engine.play_card(self.strike)
+
+        # Assert
+        self.assertEqual(engine.state, ENEMY_ANNOUNCE)
+
+    def test_enemy_turn_steps_through_each_state(self):
+        """Verify advance() walks ENEMY_ANNOUNCE -> ENEMY_ATTACK -> ENEMY_END -> PLAYER_TURN."""
+        # Arrange
+        self.player.hand = [self.strike]
+        self.player.draw_pile = [self.defend]
+        engine = CombatEngine(self.player, self.enemy)
+        engine.end_turn()
+        self.player.energy = 0
+
+        # Act / Assert
+        self.assertEqual(engine.state, ENEMY_ANNOUNCE)
+        self.assertEqual(engine.advance(), ENEMY_ATTACK)
+        self.assertEqual(engine.advance(), ENEMY_END)
+        self.assertEqual(self.player.hp, self.player.max_hp - self.enemy.attack_damage)
+        self.assertEqual(engine.advance(), PLAYER_TURN)
+        self.assertEqual(self.player.energy, self.player.max_energy)
+        self.assertIn(self.defend, self.player.hand)
+        self.assertEqual(engine.turn, 2)
+
+    def test_empty_draw_pile_ends_the_game(self):
+        """Verify that failing the start-of-turn draw leads to GAME_OVER."""
+        # Arrange
+        self.player.hand = [self.strike]
+        self.player.draw_pile = []
+        engine = CombatEngine(self.player, self.enemy)
+        engine.end_turn()
+
+        # Act
+        state = engine.run_enemy_turn()
+
+        # Assert
+        self.assertEqual(state, GAME_OVER)
+        self.assertEqual(engine.game_over_reason, "Draw pile is empty!")
+
+    def test_player_defeat_ends_the_game(self):
+        """Verify that the enemy's attack can defeat the player."""
+        # Arrange
+        self.player.hp = 5
+        self.player.hand = [self.strike]
+        self.player.draw_pile = [self.defend]
+        engine = CombatEngine(self.player, self.enemy)
+        engine.end_turn()
+
+        # Act
+        state = engine.run_enemy_turn()
+
+        # Assert
+        self.assertEqual(state, GAME_OVER)
+        self.assertEqual(engine.game_over_reason, "You have been defeated!")
+
+    def test_run_plays_many_combats_headless(self):
+        """Verify full combats from the starting deck can be run to completion without a display."""
+        all_cards = load_cards(os.path.join(project_root, 'src', 'data', 'cards.json'))
+        outcomes = set()
+        for combat_count in range(200):
+            player = Player()
+            player.set_deck(build_starting_deck(all_cards, load_images=False))
+            player.start_new_combat()
+            enemy = Enemy(0, 0, hp=enemy_hp_for_combat(combat_count % 10))
+            outcomes.add(CombatEngine(player, enemy).run())
+        self.assertTrue(outcomes <= {GAME_OVER, COMBAT_WIN})
+        self.assertIn(COMBAT_WIN, outcomes)
+
+if __name__ == '__main__':
+    unittest.main()
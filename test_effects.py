@@ -0,0 +1,93 @@
+import unittest
+import sys
+import os
+
+# --- Add the project root to the Python path ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '.'))
+sys.path.insert(0, project_root)
+# ---
+
+from src.card import Card
+from src.effects import compile_effects, effect_specs, effect_totals, EffectTotals
+from src.enemy import Enemy
+from src.player import Player
+
+class TestEffects(unittest.TestCase):
+    """Tests for the data-driven card effects."""
+
+    def setUp(self):
+        self.player = Player()
+        self.player.energy = 3
+        self.enemy = Enemy(x=0, y=0, hp=30)
+        self.filler = Card({"id": "f", "name": "Filler", "cost": 1, "type": "Skill", "value": 0, "description": "", "artwork": "f.png", "effects": []})
+
+    def make_card(self, effects, cost=1):
+        return Card({"id": "t", "name": "Test", "cost": cost, "type": "Skill", "value": 0, "description": "", "artwork": "t.png", "effects": effects})
+
+    def play(self, card):
+        self.player.hand.append(card)
+        return self.player.play_card(card, self.enemy)
+
+    def test_basic_ops(self):
+        """Verify damage, multi-hit, block and energy effects apply in order."""
+        card = self.make_card([
+            {"op": "damage", "amount": 3},
+            {"op": "multi_hit", "amount": 2, "hits": 3},
+            {"op": "block", "amount": 4},
+            {"op": "energy", "amount": 2},
+        ])
+        self.assertTrue(self.play(card))
+
+        self.assertEqual(self.enemy.hp, 30 - 3 - 6)
+        self.assertEqual(self.player.armor, 4)
+        self.assertEqual(self.player.energy, 3 - 1 + 2)
+        self.assertIn(card, self.player.discard_pile)
+
+    def test_draw_stops_when_pile_is_empty(self):
+        """Verify a draw effect draws what it can and doesn't count the played card."""
+        self.player.draw_pile = [self.filler.copy(load_image=False)]
+        card = self.make_card([{"op": "draw", "count": 3}])
+        self.play(card)
+
+        self.assertEqual(len(self.player.hand), 1)
+        self.assertNotIn(card, self.player.hand)
+        self.assertEqual(len(self.player.draw_pile), 0)
+
+    def test_conditional(self):
+        """Verify 'if' effects pick their branch from the game state when played."""
+        effects = [{"op": "if", "condition": "target_hp_below", "value": 10,
+                    "then": [{"op": "damage", "amount": 10}],
+                    "else": [{"op": "damage", "amount": 1}]}]
+        self.play(self.make_card(effects, cost=0))
+        self.assertEqual(self.enemy.hp, 29)
+
+        self.enemy.hp = 9
+        self.play(self.make_card(effects, cost=0))
+        self.assertEqual(self.enemy.hp, -1)
+
+    def test_legacy_cards_without_effects(self):
+        """Verify cards without an effects list keep their old behaviour."""
+        self.assertEqual(effect_specs({"type": "Attack", "name": "Bash", "value": 8}), [{"op": "damage", "amount": 8}])
+        self.assertEqual(effect_specs({"type": "Skill", "name": "Defend", "value": 5}), [{"op": "block", "amount": 5}])
+        self.assertEqual(effect_specs({"type": "Power", "name": "Focus", "value": 1}), [])
+
+    def test_unknown_ops_are_rejected_at_load(self):
+        """Verify typos in cards.json fail when the card is compiled, not when it is played."""
+        with self.assertRaises(ValueError):
+            compile_effects([{"op": "damgae", "amount": 1}])
+        with self.assertRaises(ValueError):
+            compile_effects([{"op": "if", "condition": "nope", "value": 1}])
+
+    def test_effect_totals(self):
+        """Verify unconditional effects reduce to totals, and conditional ones refuse to."""
+        effects = compile_effects([
+            {"op": "multi_hit", "amount": 2, "hits": 2},
+            {"op": "block", "amount": 1},
+            {"op": "draw", "count": 2},
+        ])
+        self.assertEqual(effect_totals(effects), EffectTotals(damage=4, block=1, energy=0, draw=2))
+        with self.assertRaises(ValueError):
+            effect_totals(compile_effects([{"op": "if", "condition": "player_hp_below", "value": 5}]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+import random
+import sys
+import os
+
+# --- Add the project root to the Python path ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '.'))
+sys.path.insert(0, project_root)
+# ---
+
+import pygame
+from src.hittest import HitIndex
+from src.layout import UILayout
+
+class TestHitIndex(unittest.TestCase):
+    """Tests for the hit-test index used for clicks and hover."""
+
+    def setUp(self):
+        # A hand of overlapping cards, with a button drawn over its right end
+        self.cards = [(f"card{i}", pygame.Rect(pos, (100, 150))) for i, pos in enumerate(UILayout(1280, 720).hand_positions(12))]
+        self.button = ("button", pygame.Rect(self.cards[-1][1].centerx, 600, 150, 50))
+        self.index = HitIndex()
+        self.index.rebuild(self.cards + [self.button])
+
+    def brute_force(self, pos, accept=None):
+        """What main.py used to do: scan every element, keeping the last (top-most) hit."""
+        found = None
+        for target, rect in self.cards + [self.button]:
+            if rect.collidepoint(pos) and (accept is None or accept(target)):
+                found = target
+        return found
+
+    def test_matches_a_full_scan(self):
+        """Verify the index finds the same top-most element as scanning every rect."""
+        rng = random.Random(1)
+        points = [(rng.randrange(-10, 1290), rng.randrange(400, 730)) for _ in range(2000)]
+        points += [corner for _, rect in self.cards + [self.button]
+                   for corner in (rect.topleft, rect.bottomright, (rect.right - 1, rect.bottom - 1))]
+        for pos in points:
+            self.assertEqual(self.index.hit(pos), self.brute_force(pos), pos)
+
+    def test_overlapping_elements_resolve_to_the_top_one(self):
+        """Verify later elements win where they overlap earlier ones, and misses return None."""
+        first, second = self.cards[0][1], self.cards[1][1]
+        if first.right > second.left: # The hand overlaps at this width
+            self.assertEqual(self.index.hit((second.left, second.centery)), "card1")
+        self.assertEqual(self.index.hit(self.button[1].center), "button")
+        self.assertIsNone(self.index.hit((5, 5)))
+
+    def test_accept_falls_through_to_the_element_below(self):
+        """Verify a rejected element (e.g. a hidden button) doesn't hide what is under it."""
+        pos = (self.button[1].left + 1, self.button[1].top + 1)
+        hidden = lambda target: target != "button"
+        self.assertEqual(self.index.hit(pos, hidden), self.brute_force(pos, hidden))
+        self.assertIsNotNone(self.index.hit(pos, hidden))
+
+    def test_rebuild_replaces_the_previous_layout(self):
+        """Verify a rebuild forgets old rects and skips elements without one."""
+        self.index.rebuild([("moved", pygame.Rect(0, 0, 10, 10)), ("unplaced", None)])
+        self.assertEqual(self.index.size, 1)
+        self.assertEqual(self.index.hit((5, 5)), "moved")
+        self.assertIsNone(self.index.hit(self.button[1].center))
+
+if __name__ == '__main__':
+    unittest.main()
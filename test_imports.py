@@ -0,0 +1,60 @@
+import unittest
+import sys
+import os
+import subprocess
+
+# --- Add the project root to the Python path ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '.'))
+sys.path.insert(0, project_root)
+# ---
+
+RULES_MODULES = ["src.card", "src.player", "src.enemy", "src.combat", "src.state", "src.effects", "src.piles",
+                 "src.simulate", "src.mcts", "src.solver", "src.replay"]
+IMPORT_BUDGET = 0.5 # Seconds for all of the above in a fresh interpreter; pygame alone would eat most of it
+
+def run_python(code: str) -> str:
+    """Runs code in a fresh interpreter from the project root and returns its stdout."""
+    result = subprocess.run([sys.executable, "-c", code], cwd=project_root, capture_output=True, text=True, timeout=60)
+    if result.returncode != 0:
+        raise AssertionError(result.stderr)
+    return result.stdout
+
+class TestHeadlessImports(unittest.TestCase):
+    """Tests that the rules and tools load quickly and without pygame."""
+
+    def test_rules_import_without_pygame(self):
+        """Verify no rules module pulls in pygame, and they all import within the budget."""
+        output = run_python(
+            "import sys, time\n"
+            "start = time.perf_counter()\n"
+            f"for name in {RULES_MODULES!r}: __import__(name)\n"
+            "print(time.perf_counter() - start)\n"
+            "print('pygame' in sys.modules)\n"
+        )
+        elapsed, pygame_loaded = output.split()
+        self.assertEqual(pygame_loaded, "False")
+        self.assertLess(float(elapsed), IMPORT_BUDGET)
+
+    def test_headless_run_without_pygame(self):
+        """Verify whole runs can be played, with players and enemies, without ever loading pygame."""
+        output = run_python(
+            "import sys\n"
+            "from src.card import load_cards\n"
+            "from src.combat import Run\n"
+            "from src.simulate import collect_run_stats\n"
+            "all_cards = load_cards('src/data/cards.json')\n"
+            "stats = collect_run_stats(lambda _: Run(all_cards, seed=3), lambda run: run.engine.run(), 1, 5)\n"
+            "print(stats.runs == 1, 'pygame' in sys.modules)\n"
+        )
+        self.assertEqual(output.split(), ["True", "False"])
+
+    def test_entry_point(self):
+        """Verify `python -m src` runs a headless tool without loading pygame."""
+        result = subprocess.run([sys.executable, "-m", "src", "simulate", "--runs", "20", "--workers", "1"],
+                                cwd=project_root, capture_output=True, text=True, timeout=60)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn("Runs: 20", result.stdout)
+        self.assertNotIn("pygame", result.stdout) # pygame prints a banner when it's imported
+
+if __name__ == '__main__':
+    unittest.main()
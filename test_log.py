@@ -0,0 +1,74 @@
+import unittest
+import sys
+import os
+import io
+import json
+import contextlib
+
+# --- Add the project root to the Python path ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '.'))
+sys.path.insert(0, project_root)
+# ---
+
+from src.log import EventLog, RingSink, JsonLinesSink, StdoutSink, DEBUG, INFO, WARNING, OFF
+
+class Unformattable:
+    """A field that fails the test if the log ever turns it into text."""
+    def __format__(self, spec):
+        raise AssertionError("formatted a record nobody reads")
+
+class TestEventLog(unittest.TestCase):
+    """Tests for the level-gated, rate-limited event log."""
+
+    def setUp(self):
+        self.ring = RingSink()
+        self.log = EventLog(level=INFO, sinks=[self.ring])
+
+    def test_levels(self):
+        """Verify records below the level are dropped and OFF drops everything."""
+        self.log.debug("player.card_played", "Played {card}", card="Strike")
+        self.log.info("game.reset", "Resetting")
+        self.log.warning("card.artwork_failed", "Missing {path}", path="x.png")
+        self.assertEqual(self.ring.messages(), ["Resetting", "Missing x.png"])
+
+        self.log.configure(level=OFF)
+        self.log.error("cards.invalid", "Broken")
+        self.assertEqual(len(self.ring.records), 2)
+        self.assertFalse(self.log.is_enabled(WARNING))
+
+    def test_formatting_is_lazy(self):
+        """Verify messages are never formatted when they are dropped or kept unread."""
+        self.log.debug("player.card_played", "Played {card}", card=Unformattable()) # Below the level
+        self.log.info("player.card_played", "Played {card}", card=Unformattable()) # Only stored
+        self.assertEqual(len(self.ring.records), 1)
+
+    def test_rate_limit(self):
+        """Verify a chatty event is capped per window and the next window reports how many were dropped."""
+        self.log.rate_limit, self.log.rate_interval = 3, 3600
+        for i in range(10):
+            self.log.info("enemy.attack", "Attack {n}", n=i)
+        self.log.info("game.reset", "Resetting") # Other events have their own budget
+        self.assertEqual(self.ring.messages(), ["Attack 0", "Attack 1", "Attack 2", "Resetting"])
+
+        self.log.rate_interval = 0 # Start a new window
+        self.log.info("enemy.attack", "Attack {n}", n=10)
+        self.assertEqual(self.ring.records[-1].suppressed, 7)
+        self.assertEqual(self.ring.messages()[-1], "Attack 10 (7 similar messages suppressed)")
+
+    def test_json_lines_and_stdout(self):
+        """Verify the JSON-lines sink writes structured records and stdout gets the plain message."""
+        stream = io.StringIO()
+        self.log.configure(level=DEBUG, sinks=[JsonLinesSink(stream), StdoutSink()])
+        printed = io.StringIO()
+        with contextlib.redirect_stdout(printed):
+            self.log.debug("enemy.attack", "Enemy attacks for {damage}", damage=10)
+
+        record = json.loads(stream.getvalue())
+        self.assertEqual(record["event"], "enemy.attack")
+        self.assertEqual(record["level"], "DEBUG")
+        self.assertEqual(record["damage"], 10)
+        self.assertEqual(record["message"], "Enemy attacks for 10")
+        self.assertEqual(printed.getvalue(), "Enemy attacks for 10\n")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+import sys
+import os
+
+# --- Add the project root to the Python path ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '.'))
+sys.path.insert(0, project_root)
+# ---
+
+from src.card import load_cards
+from src.combat import Run
+from src.log import log, WARNING
+from src.mcts import MCTSAgent, END_TURN, legal_moves, pack_state, unpack_state, play_runs
+from src.state import GameState
+
+CARDS_PATH = os.path.join(project_root, 'src', 'data', 'cards.json')
+
+class TestMCTS(unittest.TestCase):
+    """Tests for the Monte Carlo tree search autoplayer."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.all_cards = load_cards(CARDS_PATH)
+
+    def setUp(self):
+        self._level = log.level
+        log.configure(level=WARNING)
+        run = Run(self.all_cards, seed=4)
+        self.state = GameState.from_combat(run.player, run.engine.enemy)
+
+    def tearDown(self):
+        log.configure(level=self._level)
+
+    def test_moves_merge_identical_cards(self):
+        """Verify the agent chooses between kinds of cards, not between identical copies."""
+        moves = legal_moves(self.state)
+        self.assertIn(END_TURN, moves)
+        self.assertEqual(len(moves), len(set(moves)))
+        self.assertLessEqual(len(moves), 3) # Strike, Defend, end turn
+
+    def test_takes_the_lethal_line(self):
+        """Verify the agent plays a Strike when it finishes the enemy off."""
+        self.state.enemy.hp = 5
+        if ("card_001", 1) not in legal_moves(self.state):
+            self.skipTest("No Strike in this opening hand")
+        with MCTSAgent(time_budget=1.0, max_iterations=200, seed=1) as agent:
+            self.assertEqual(agent.choose(self.state), ("card_001", 1))
+
+    def test_packed_state_round_trips(self):
+        """Verify a state sent to a worker process comes back identical."""
+        copy = unpack_state(pack_state(self.state), self.all_cards)
+        self.assertEqual(pack_state(copy), pack_state(self.state))
+
+    def test_root_parallel_runs(self):
+        """Verify full runs can be played with searches spread over worker processes."""
+        with MCTSAgent(time_budget=1.0, max_iterations=20, workers=2, seed=3, cards_path=CARDS_PATH) as agent:
+            stats = play_runs(agent, self.all_cards, runs=2, max_combats=2, seed=5)
+        self.assertEqual(stats.runs, 2)
+        self.assertGreater(agent.iterations, 0)
+
+if __name__ == '__main__':
+    unittest.main()
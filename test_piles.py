@@ -0,0 +1,179 @@
+import unittest
+import random
+import sys
+import os
+
+# --- Add the project root to the Python path ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '.'))
+sys.path.insert(0, project_root)
+# ---
+
+from src.card import Card
+from src.enemy import Enemy
+from src.piles import CardPiles, DRAW, HAND, DISCARD, EXHAUST
+from src.player import Player
+
+class TestCardPiles(unittest.TestCase):
+    """Tests for the slot-indexed card piles."""
+
+    def setUp(self):
+        data = {"id": "c1", "name": "Strike", "cost": 1, "type": "Attack", "value": 6, "description": "Deal 6 damage.", "artwork": "s.png"}
+        self.cards = [Card(data) for _ in range(6)]
+        self.piles = CardPiles(self.cards)
+
+    def test_draw_takes_from_the_top(self):
+        """Verify drawing moves the last card of the draw pile into the hand."""
+        drawn = self.piles.draw()
+        self.assertIs(drawn, self.cards[-1])
+        self.assertEqual(self.piles.zone_of(drawn), HAND)
+        self.assertEqual((self.piles.count(DRAW), self.piles.count(HAND)), (5, 1))
+
+    def test_hand_keeps_its_order(self):
+        """Verify removing a card from the middle of the hand keeps the others in order."""
+        for _ in range(4):
+            self.piles.draw()
+        hand = self.piles.view(HAND)
+        first, second, third, fourth = list(hand)
+
+        self.piles.move(second, DISCARD)
+
+        self.assertEqual(list(hand), [first, third, fourth])
+        self.assertEqual(hand.index(fourth), 2)
+        self.assertNotIn(second, hand)
+        self.assertIn(second, self.piles.view(DISCARD))
+
+    def test_slots_list_a_pile_with_stable_slots(self):
+        """Verify slots() pairs each card in a pile with its slot, bottom to top."""
+        for _ in range(3):
+            self.piles.draw()
+        self.assertEqual(self.piles.slots(HAND), [(5, self.cards[5]), (4, self.cards[4]), (3, self.cards[3])])
+        self.piles.move(self.cards[4], DISCARD)
+        self.assertEqual(self.piles.slots(HAND), [(5, self.cards[5]), (3, self.cards[3])])
+        self.assertEqual(self.piles.slots(DISCARD), [(4, self.cards[4])])
+
+    def test_set_pile_from_itself(self):
+        """Verify assigning a pile from a view of itself, or a generator over it, keeps its cards."""
+        player = Player(rng=random.Random(0))
+        player.set_deck(self.cards)
+        player.start_new_combat()
+        hand = list(player.hand)
+
+        player.hand = player.hand
+        self.assertEqual(list(player.hand), hand)
+        self.assertTrue(all(player.piles.zone_of(card) == HAND for card in hand))
+
+        player.hand = (card for card in player.hand if card is not hand[0])
+        self.assertEqual(list(player.hand), hand[1:])
+        self.assertEqual(player.piles.composition(HAND), {"Strike": 4})
+
+    def test_reshuffle_discard(self):
+        """Verify the discard pile goes under the draw pile and is emptied."""
+        for _ in range(6):
+            self.piles.move(self.piles.draw(), DISCARD)
+        self.piles.move(self.cards[0], DRAW) # One card left on top
+
+        self.piles.reshuffle_discard(random.Random(1))
+
+        draw_pile = self.piles.view(DRAW)
+        self.assertEqual(self.piles.count(DISCARD), 0)
+        self.assertEqual(len(draw_pile), 6)
+        self.assertIs(draw_pile[-1], self.cards[0])
+        self.assertEqual([draw_pile.index(card) for card in draw_pile], list(range(6)))
+
+    def test_snapshot_and_restore(self):
+        """Verify restoring a snapshot puts every card back in its pile and order."""
+        self.piles.shuffle(DRAW, random.Random(3))
+        self.piles.draw()
+        self.piles.draw()
+        snapshot = self.piles.snapshot()
+        before = [list(self.piles.view(zone)) for zone in (DRAW, HAND, DISCARD, EXHAUST)]
+
+        self.piles.move(self.piles.view(HAND)[0], EXHAUST)
+        self.piles.add(self.cards[0].copy(load_image=False), HAND) # A card created mid-combat
+        self.piles.reshuffle_discard()
+        self.piles.restore(snapshot)
+
+        after = [list(self.piles.view(zone)) for zone in (DRAW, HAND, DISCARD, EXHAUST)]
+        self.assertEqual(after, before)
+        self.assertEqual(len(self.piles.cards), 6)
+
+    def test_player_plays_through_the_piles(self):
+        """Verify playing a card moves it to the discard pile, or the exhaust pile if it exhausts."""
+        player = Player(rng=random.Random(0))
+        exhausting = Card({"id": "x", "name": "Flash", "cost": 0, "type": "Attack", "value": 1, "description": "", "artwork": "x.png", "exhaust": True})
+        player.set_deck(self.cards[:4] + [exhausting])
+        player.start_new_combat()
+        enemy = Enemy(x=0, y=0, hp=50)
+
+        self.assertTrue(player.play_card(exhausting, enemy))
+        self.assertTrue(player.play_card(self.cards[0], enemy))
+
+        self.assertEqual(list(player.exhaust_pile), [exhausting])
+        self.assertEqual(list(player.discard_pile), [self.cards[0]])
+        self.assertEqual(len(player.hand), 3)
+        self.assertEqual(player.piles.zone_of(exhausting), EXHAUST)
+        with self.assertRaises(ValueError):
+            player.play_card(self.cards[0], enemy) # No longer in the hand
+
+    def test_counts_follow_every_move(self):
+        """Verify the per-pile name counts match a recount after draws, moves, reshuffles and restores."""
+        defend = Card({"id": "c2", "name": "Defend", "cost": 1, "type": "Skill", "value": 5, "description": "Gain 5 armor.", "artwork": "d.png"})
+        self.piles.reset(self.cards + [defend, defend.copy(load_image=False)])
+        rng = random.Random(7)
+
+        def check():
+            for zone in (DRAW, HAND, DISCARD, EXHAUST):
+                expected = {}
+                for card in self.piles.view(zone):
+                    expected[card.name] = expected.get(card.name, 0) + 1
+                self.assertEqual(self.piles.composition(zone), expected, zone)
+
+        check()
+        snapshot = self.piles.snapshot()
+        for step in range(200):
+            version = self.piles.version
+            if not self.piles.view(DRAW):
+                self.piles.reshuffle_discard(rng)
+            elif step % 3 == 0:
+                self.piles.move(self.piles.draw(), rng.choice((DISCARD, EXHAUST)))
+            else:
+                self.piles.draw()
+                hand = self.piles.view(HAND)
+                self.piles.move(hand[rng.randrange(len(hand))], DISCARD)
+            self.assertGreater(self.piles.version, version)
+            check()
+        self.piles.set_pile(HAND, [defend])
+        check()
+        self.piles.add(Card({"id": "c3", "name": "Wound", "cost": 0, "type": "Status", "value": 0, "description": "", "artwork": "w.png"}), DISCARD)
+        check()
+        self.piles.restore(snapshot)
+        check()
+        self.piles.reset(self.cards) # A different deck
+        check()
+
+    def test_player_composition(self):
+        """Verify the player exposes the deck's and each pile's counts, and bumps the version on changes."""
+        player = Player(rng=random.Random(0))
+        player.set_deck(self.cards)
+        self.assertEqual(player.composition(), {"Strike": 6})
+        version = player.composition_version
+
+        player.start_new_combat()
+        self.assertEqual(player.composition(HAND), {"Strike": 5})
+        self.assertEqual(player.composition(DRAW), {"Strike": 1})
+        self.assertGreater(player.composition_version, version)
+
+        version, deck_version = player.composition_version, player.deck_version
+        player.play_card(player.hand[0], Enemy(x=0, y=0, hp=50))
+        self.assertEqual(player.composition(DISCARD), {"Strike": 1})
+        self.assertEqual(player.composition(HAND), {"Strike": 4})
+        self.assertEqual(player.composition(), {"Strike": 6}) # The deck itself didn't change
+        self.assertGreater(player.composition_version, version)
+        self.assertEqual(player.deck_version, deck_version)
+
+        player.set_deck(self.cards[:3])
+        self.assertGreater(player.deck_version, deck_version)
+        self.assertEqual(player.composition(), {"Strike": 3})
+
+if __name__ == '__main__':
+    unittest.main()
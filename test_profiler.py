@@ -0,0 +1,92 @@
+import unittest
+import sys
+import os
+
+# --- Add the project root to the Python path ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '.'))
+sys.path.insert(0, project_root)
+# ---
+
+import pygame
+from src.card import Card
+from src.profiler import FrameProfiler
+
+class TestFrameProfiler(unittest.TestCase):
+    """Tests for the frame profiler overlay."""
+
+    @classmethod
+    def setUpClass(cls):
+        pygame.font.init()
+
+    def setUp(self):
+        self.total = 0
+        self.profiler = FrameProfiler(history=10, refresh=1)
+        self.profiler.add_counter("renders", lambda: self.total)
+
+    def run_frames(self, count: int):
+        for _ in range(count):
+            self.profiler.begin_frame()
+            self.total += 3
+            for phase in FrameProfiler.PHASES:
+                self.profiler.mark(phase)
+        self.profiler.begin_frame() # Closes the last frame
+
+    def test_records_nothing_while_off(self):
+        """Verify the hooks do nothing until the overlay is turned on."""
+        self.run_frames(5)
+        self.assertEqual(len(self.profiler.frame_times), 0)
+        self.assertEqual(len(self.profiler.counter_values["renders"]), 0)
+
+    def test_records_phases_and_counter_deltas(self):
+        """Verify each frame records every phase and how much cumulative counters grew."""
+        self.total = 100 # Counted before the overlay was on, so it isn't shown
+        self.profiler.toggle()
+        self.run_frames(4)
+
+        self.assertEqual(len(self.profiler.frame_times), 4)
+        for phase in FrameProfiler.PHASES + ("wait",):
+            self.assertEqual(len(self.profiler.phase_times[phase]), 4)
+        self.assertEqual(list(self.profiler.counter_values["renders"]), [3, 3, 3, 3])
+
+    def test_percentiles(self):
+        """Verify percentiles use the nearest rank over the recent frames only."""
+        self.profiler.frame_times.extend([100.0] + [float(ms) for ms in range(1, 11)]) # 100 falls out of the history
+        self.assertEqual(self.profiler.percentile(50), 5.0)
+        self.assertEqual(self.profiler.percentile(95), 10.0)
+        self.assertEqual(self.profiler.percentile(0), 1.0)
+
+    def test_overlay_is_reused_between_refreshes(self):
+        """Verify the overlay is only recomposed when its version changes."""
+        profiler = FrameProfiler(refresh=5)
+        profiler.toggle()
+        profiler.begin_frame()
+        profiler.begin_frame()
+        version = profiler.panel_version
+        panel = profiler._get_panel()
+        for _ in range(3):
+            profiler.begin_frame()
+        self.assertEqual(profiler.panel_version, version)
+        self.assertIs(profiler._get_panel(), panel)
+
+        surface = pygame.Surface((400, 400))
+        profiler.draw(surface)
+        self.assertTrue(surface.get_rect().contains(profiler.rect()))
+
+    def test_counts_the_surfaces_it_allocates(self):
+        """Verify the panel and card tooltips count the Surfaces they create, for the allocation counter."""
+        profiler = FrameProfiler(refresh=1)
+        profiler.toggle()
+        profiler.begin_frame()
+        profiler._get_panel()
+        self.assertGreater(profiler.surfaces_built, 1) # Background plus its text lines
+
+        card = Card({"id": "t1", "name": "Strike", "cost": 1, "type": "Attack", "value": 6, "description": "Deal 6 damage.", "artwork": "s.png"})
+        card.rect = pygame.Rect(100, 300, 100, 150)
+        before = Card.tooltips_built
+        surface = pygame.Surface((400, 500))
+        card.draw_tooltip(surface)
+        card.draw_tooltip(surface)
+        self.assertEqual(Card.tooltips_built, before + 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+import sys
+import os
+
+# --- Add the project root to the Python path ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '.'))
+sys.path.insert(0, project_root)
+# ---
+
+import pygame
+from src.render import DirtyRenderer
+
+class TestDirtyRenderer(unittest.TestCase):
+    """Tests for the dirty-rectangle render layer."""
+
+    def setUp(self):
+        """A screen with a moving box and a static box."""
+        self.screen = pygame.Surface((400, 300))
+        self.renderer = DirtyRenderer(background=(0, 0, 0))
+        self.moving = pygame.Rect(10, 10, 20, 20)
+        self.static = pygame.Rect(200, 200, 50, 50)
+        self.static_draws = 0
+
+        def draw_static(surface):
+            self.static_draws += 1
+            pygame.draw.rect(surface, (0, 255, 0), self.static)
+
+        self.renderer.add("moving", lambda surface: pygame.draw.rect(surface, (255, 0, 0), self.moving), lambda: self.moving)
+        self.renderer.add("static", draw_static, lambda: self.static)
+
+    def test_first_frame_repaints_everything(self):
+        """Verify the first frame is a full repaint."""
+        dirty = self.renderer.render(self.screen)
+        self.assertEqual(dirty, [self.screen.get_rect()])
+
+    def test_unchanged_frame_repaints_nothing(self):
+        """Verify nothing is repainted or pushed when the scene hasn't changed."""
+        self.renderer.render(self.screen)
+        draws = self.static_draws
+
+        self.assertEqual(self.renderer.render(self.screen), [])
+        self.assertEqual(self.static_draws, draws)
+
+    def test_moving_sprite_repaints_old_and_new_area_only(self):
+        """Verify a moved sprite dirties where it was and where it is, and leaves the rest alone."""
+        self.renderer.render(self.screen)
+        draws = self.static_draws
+
+        self.moving.x += 5
+        dirty = self.renderer.render(self.screen)
+
+        self.assertEqual(dirty, [pygame.Rect(10, 10, 25, 20)]) # Old and new overlap, so they are merged
+        self.assertEqual(self.static_draws, draws)
+        self.assertEqual(self.screen.get_at((12, 12))[:3], (0, 0, 0)) # Old area cleared
+        self.assertEqual(self.screen.get_at((32, 12))[:3], (255, 0, 0))
+
+    def test_signature_change_repaints_in_place(self):
+        """Verify a sprite whose contents change is repainted even if it didn't move."""
+        label = {"text": "A"}
+        self.renderer.add("label", lambda surface: None, lambda: pygame.Rect(100, 100, 10, 10), lambda: label["text"])
+        self.renderer.render(self.screen)
+
+        label["text"] = "B"
+
+        self.assertEqual(self.renderer.render(self.screen), [pygame.Rect(100, 100, 10, 10)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import sys
+import os
+
+# --- Add the project root to the Python path ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '.'))
+sys.path.insert(0, project_root)
+# ---
+
+from src.card import load_cards
+from src.log import log, WARNING
+from src.replay import (
+    Replay, ReplayPlayer, ReplayError, catalog_hash, record_session,
+    read_varint, write_varint, zigzag, unzigzag,
+)
+
+CARDS_PATH = os.path.join(project_root, 'src', 'data', 'cards.json')
+
+class TestReplay(unittest.TestCase):
+    """Tests for recording runs and playing them back headlessly."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.all_cards = load_cards(CARDS_PATH)
+        cls.digest = catalog_hash(CARDS_PATH)
+        cls._level = log.level
+        log.configure(level=WARNING)
+        cls.data = record_session(cls.all_cards, seed=7, combats=60, catalog_digest=cls.digest)
+
+    @classmethod
+    def tearDownClass(cls):
+        log.configure(level=cls._level)
+
+    def snapshot(self, player):
+        """The parts of the game that playback must reproduce exactly."""
+        run = player.run
+        return (player.combat, player.turn, run.combat_count, run.player.hp, run.player.energy,
+                run.engine.enemy.hp, [card.id for card in run.player.hand], run.engine.state)
+
+    def test_varints(self):
+        """Verify varints and zigzag round-trip, and small values take one byte."""
+        out = bytearray()
+        for value in (0, 5, 127, 128, 300, 2**40):
+            write_varint(out, value)
+        pos, values = 0, []
+        while pos < len(out):
+            value, pos = read_varint(out, pos)
+            values.append(value)
+        self.assertEqual(values, [0, 5, 127, 128, 300, 2**40])
+        self.assertEqual([unzigzag(zigzag(v)) for v in (-3, -1, 0, 1, 3)], [-3, -1, 0, 1, 3])
+
+    def test_playback_is_deterministic_and_compact(self):
+        """Verify a replay plays back to the same end state twice, at about a byte per action."""
+        replay = Replay.from_bytes(self.data)
+        first, second = ReplayPlayer(replay, self.all_cards, self.digest), ReplayPlayer(replay, self.all_cards)
+        first.play_to_end()
+        second.play_to_end()
+
+        self.assertEqual(self.snapshot(first), self.snapshot(second))
+        self.assertEqual(first.combat, 59)
+        self.assertLess(len(self.data), len(replay.records) * 2)
+
+    def test_seek_matches_linear_playback(self):
+        """Verify seeking from a keyframe lands in the same state as playing from the start."""
+        replay = Replay.from_bytes(self.data)
+        linear = ReplayPlayer(replay, self.all_cards)
+        while (linear.combat, linear.turn) < (45, 2) and linear.step():
+            pass
+
+        seeking = ReplayPlayer(replay, self.all_cards)
+        seeking.seek(45, 2)
+
+        self.assertEqual(self.snapshot(seeking), self.snapshot(linear))
+        self.assertLess(seeking.actions, linear.actions / 4) # Started from a nearby keyframe
+        seeking.seek(3) # Backwards works too
+        self.assertEqual((seeking.combat, seeking.turn), (3, 1))
+
+    def test_rejects_other_catalogs_and_bad_data(self):
+        """Verify replays recorded with different cards, or that aren't replays, are rejected."""
+        replay = Replay.from_bytes(self.data)
+        with self.assertRaises(ReplayError):
+            ReplayPlayer(replay, self.all_cards, catalog_digest=b"\xff" * 8)
+        with self.assertRaises(ReplayError):
+            Replay.from_bytes(b"not a replay")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+import sys
+import os
+
+# --- Add the project root to the Python path ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '.'))
+sys.path.insert(0, project_root)
+# ---
+
+import pygame
+from src.combat import GAME_OVER, COMBAT_WIN
+from src.screens import ModalScreens, MODAL_TITLES, OVERLAY_COLOR
+
+class TestModalScreens(unittest.TestCase):
+    """Tests for the cached GAME_OVER / COMBAT_WIN overlays."""
+
+    @classmethod
+    def setUpClass(cls):
+        pygame.font.init()
+
+    def setUp(self):
+        self.screens = ModalScreens()
+
+    def test_titles_cover_the_engine_states(self):
+        """Verify the titles are keyed by the combat engine's end states."""
+        self.assertEqual(set(MODAL_TITLES), {GAME_OVER, COMBAT_WIN})
+
+    def test_same_key_is_built_once(self):
+        """Verify repeated get() calls with the same state, size and message reuse one surface."""
+        first = self.screens.get(GAME_OVER, (1280, 720), "You ran out of HP.")
+        for _ in range(5):
+            self.assertIs(self.screens.get(GAME_OVER, (1280, 720), "You ran out of HP."), first)
+        self.assertEqual(self.screens.builds, 1)
+
+    def test_rebuilt_when_the_key_changes(self):
+        """Verify a new size, state or message, or invalidate(), composes the screen again."""
+        self.screens.get(GAME_OVER, (1280, 720), "")
+        self.screens.get(GAME_OVER, (1000, 700), "")
+        self.assertEqual(self.screens.builds, 2)
+        self.screens.get(COMBAT_WIN, (1000, 700), "")
+        self.assertEqual(self.screens.builds, 3)
+        self.screens.get(COMBAT_WIN, (1000, 700), "Enemy defeated.")
+        self.assertEqual(self.screens.builds, 4)
+        self.screens.invalidate()
+        self.screens.get(COMBAT_WIN, (1000, 700), "Enemy defeated.")
+        self.assertEqual(self.screens.builds, 5)
+
+    def test_title_is_centered_on_the_window(self):
+        """Verify the title is centered on the real window size, not the default screen width."""
+        size = (1000, 700)
+        surface = self.screens.get(GAME_OVER, size)
+        title_rect = self.screens.title_rect(GAME_OVER, size)
+
+        self.assertEqual(surface.get_size(), size)
+        self.assertEqual(title_rect.centerx, size[0] // 2)
+        self.assertEqual(title_rect.top, size[1] // 2 - 100)
+        # The title was actually drawn there: some pixels in its rect aren't the plain overlay
+        pixels = [tuple(surface.get_at((x, title_rect.centery))) for x in range(title_rect.left, title_rect.right)]
+        self.assertTrue(any(pixel != OVERLAY_COLOR for pixel in pixels))
+
+if __name__ == '__main__':
+    unittest.main()
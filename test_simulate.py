@@ -0,0 +1,61 @@
+import unittest
+import random
+import sys
+import os
+
+# --- Add the project root to the Python path ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '.'))
+sys.path.insert(0, project_root)
+# ---
+
+from src.card import load_cards
+from src.simulate import SimulationStats, derive_seed, simulate_runs, run_simulation
+
+CARDS_PATH = os.path.join(project_root, 'src', 'data', 'cards.json')
+
+class TestSimulate(unittest.TestCase):
+    """Tests for the Monte Carlo run simulator."""
+
+    def setUp(self):
+        """Load the real card catalog."""
+        self.all_cards = load_cards(CARDS_PATH)
+
+    def test_same_seed_gives_same_results(self):
+        """Verify runs are reproducible from a seed."""
+        first = simulate_runs(self.all_cards, 50, 10, random.Random(123))
+        second = simulate_runs(self.all_cards, 50, 10, random.Random(123))
+
+        self.assertEqual(first.to_dict(), second.to_dict())
+        self.assertEqual(first.runs, 50)
+        self.assertEqual(sum(first.combats_survived.values()), 50)
+        self.assertEqual(sum(first.damage_taken.values()), first.combats)
+
+    def test_chunk_seeds_are_independent(self):
+        """Verify every chunk gets its own stream, and the same one every time."""
+        seeds = [derive_seed(0, i) for i in range(100)]
+        self.assertEqual(len(set(seeds)), 100)
+        self.assertEqual(seeds[5], derive_seed(0, 5))
+        self.assertNotEqual(derive_seed(0, 5), derive_seed(1, 5))
+
+    def test_merge_adds_everything_up(self):
+        """Verify merging two result sets sums their counts and histograms."""
+        a = simulate_runs(self.all_cards, 20, 3, random.Random(1))
+        b = simulate_runs(self.all_cards, 30, 3, random.Random(2))
+        total = SimulationStats()
+        total.merge(a)
+        total.merge(b)
+
+        self.assertEqual(total.runs, 50)
+        self.assertEqual(total.wins, a.wins + b.wins)
+        self.assertEqual(total.combats_survived, a.combats_survived + b.combats_survived)
+
+    def test_results_do_not_depend_on_worker_count(self):
+        """Verify the process pool gives the same totals with one or two workers."""
+        one = run_simulation(60, 5, seed=9, workers=1, chunk_size=20, cards_path=CARDS_PATH)
+        two = run_simulation(60, 5, seed=9, workers=2, chunk_size=20, cards_path=CARDS_PATH)
+
+        self.assertEqual(one.to_dict(), two.to_dict())
+        self.assertEqual(one.runs, 60)
+
+if __name__ == '__main__':
+    unittest.main()
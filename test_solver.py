@@ -0,0 +1,56 @@
+import unittest
+import sys
+import os
+from array import array
+
+# --- Add the project root to the Python path ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '.'))
+sys.path.insert(0, project_root)
+# ---
+
+from src.card import load_cards
+from src.solver import TurnSolver
+from src.state import GameState, EnemyState
+
+STRIKE, DEFEND = ("card_001", 1), ("card_002", 1)
+
+class TestTurnSolver(unittest.TestCase):
+    """Tests for the exact per-turn solver."""
+
+    @classmethod
+    def setUpClass(cls):
+        all_cards = load_cards(os.path.join(project_root, 'src', 'data', 'cards.json'))
+        cls.strike, cls.defend = all_cards["card_001"].definition, all_cards["card_002"].definition
+
+    def make_state(self, hand: str, hp: int, enemy_hp: int, energy: int) -> GameState:
+        """Builds a position from a hand like "SDS", with a few cards left to draw."""
+        cards = [self.strike if letter == "S" else self.defend for letter in hand] + [self.defend] * 3
+        hand_slots = array('H', range(len(hand)))
+        draw_slots = array('H', range(len(hand), len(cards)))
+        return GameState(tuple(cards), tuple(1 for _ in cards), (draw_slots, hand_slots, array('H'), array('H')),
+                         EnemyState(enemy_hp), hp=hp, energy=energy)
+
+    def test_finds_lethal(self):
+        """Verify the solver finishes the enemy when it can."""
+        solution = TurnSolver().solve(self.make_state("DSDS", hp=20, enemy_hp=10, energy=3))
+        self.assertEqual(solution.line, (STRIKE, STRIKE))
+
+    def test_blocks_when_the_attack_would_kill(self):
+        """Verify the solver defends instead of attacking when the enemy's hit would be fatal."""
+        solution = TurnSolver().solve(self.make_state("SD", hp=8, enemy_hp=30, energy=1))
+        self.assertEqual(solution.line, (DEFEND,))
+
+    def test_transpositions_and_memo(self):
+        """Verify orderings of the same cards are searched once, and repeated turns come from the table."""
+        solver = TurnSolver()
+        first = solver.solve(self.make_state("SSDDS", hp=20, enemy_hp=40, energy=3))
+        # Without the table this would be 5 * 4 * 3 orderings; with it, one node per multiset of cards left
+        self.assertLessEqual(first.nodes, 1 + 2 + 3 + 4)
+        self.assertGreater(first.table_hits, 0)
+
+        again = solver.solve(self.make_state("DSSDS", hp=20, enemy_hp=40, energy=3)) # Same cards, other order
+        self.assertEqual(again.nodes, 0)
+        self.assertEqual(again.score, first.score)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import sys
+import os
+
+# --- Add the project root to the Python path ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '.'))
+sys.path.insert(0, project_root)
+# ---
+
+from src.card import load_cards
+from src.combat import Run, COMBAT_WIN
+from src.log import log, WARNING
+from src.state import GameState
+
+class TestGameState(unittest.TestCase):
+    """Tests for the rules-only game state used by search."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.all_cards = load_cards(os.path.join(project_root, 'src', 'data', 'cards.json'))
+
+    def setUp(self):
+        self._level = log.level
+        log.configure(level=WARNING)
+
+    def tearDown(self):
+        log.configure(level=self._level)
+
+    def play_first_affordable(self, state: GameState):
+        while not state.is_over:
+            moves = state.playable()
+            if moves:
+                state.play(moves[0])
+            else:
+                state.end_turn()
+
+    def test_matches_the_combat_engine(self):
+        """Verify a GameState plays out exactly like CombatEngine with the same choices."""
+        for seed in range(40):
+            with self.subTest(seed=seed):
+                run = Run(self.all_cards, seed=seed)
+                run.combat_count = seed % 6
+                run.engine.enemy.hp = run.engine.enemy.max_hp = 10 + 3 * (seed % 6)
+                state = GameState.from_combat(run.player, run.engine.enemy)
+
+                outcome = run.engine.run()
+                self.play_first_affordable(state)
+
+                self.assertEqual(state.state, outcome)
+                self.assertEqual((state.hp, state.armor, state.turn, state.enemy.hp),
+                                 (run.player.hp, run.player.armor, run.engine.turn, run.engine.enemy.hp))
+
+    def test_copies_are_independent(self):
+        """Verify changing a copy (or the original) never changes the other."""
+        run = Run(self.all_cards, seed=1)
+        state = GameState.from_combat(run.player, run.engine.enemy)
+        hand_before = list(state.hand)
+
+        branch = state.copy()
+        branch.play(0)
+        branch.end_turn()
+
+        self.assertEqual(list(state.hand), hand_before)
+        self.assertEqual((state.energy, state.enemy.hp, state.turn), (3, 10, 1))
+        state.play(1)
+        self.assertNotEqual(list(state.hand), list(branch.hand))
+
+    def test_restore_rewinds_in_place(self):
+        """Verify restore() puts a state back exactly as it was when the snapshot was taken."""
+        run = Run(self.all_cards, seed=2)
+        state = GameState.from_combat(run.player, run.engine.enemy)
+        snapshot = state.snapshot()
+        fields = lambda s: (s.hp, s.armor, s.energy, s.turn, s.state, s.enemy.hp, [list(p) for p in s.piles])
+        before = fields(state)
+
+        self.play_first_affordable(state)
+        self.assertNotEqual(fields(state), before)
+        state.restore(snapshot)
+        self.assertEqual(fields(state), before)
+
+        self.play_first_affordable(state) # The snapshot survives being played from again
+        state.restore(snapshot)
+        self.assertEqual(fields(state), before)
+
+if __name__ == '__main__':
+    unittest.main()
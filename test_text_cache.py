@@ -0,0 +1,59 @@
+import unittest
+import sys
+import os
+
+# --- Add the project root to the Python path ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '.'))
+sys.path.insert(0, project_root)
+# ---
+
+import pygame
+from src.ui import TextCache, get_font
+
+class TestTextCache(unittest.TestCase):
+    """Tests for the font registry and the rendered-text cache."""
+
+    @classmethod
+    def setUpClass(cls):
+        pygame.font.init()
+
+    def test_fonts_are_shared_per_face_and_size(self):
+        """Verify the same Font object is returned for the same (face, size)."""
+        self.assertIs(get_font(24), get_font(24))
+        self.assertIsNot(get_font(24), get_font(32))
+
+    def test_repeated_text_is_a_cache_hit(self):
+        """Verify rendering the same label twice only rasterizes it once."""
+        cache = TextCache()
+
+        first = cache.render("Deck", 24, (255, 255, 255))
+        second = cache.render("Deck", 24, [255, 255, 255]) # Lists and tuples are the same color
+
+        self.assertIs(first, second)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        cache.render("Deck", 36)
+        self.assertEqual(cache.misses, 2)
+
+    def test_budget_evicts_least_recently_used(self):
+        """Verify the cache stays under its memory budget by dropping the oldest entries."""
+        cache = TextCache()
+        sample = cache.render("Label 0", 24)
+        entry_size = sample.get_pitch() * sample.get_height()
+        cache.clear()
+        cache.set_budget(entry_size * 3)
+
+        for i in range(3):
+            cache.render(f"Label {i}", 24)
+        cache.render("Label 0", 24) # Touch the oldest so it becomes the most recent
+        cache.render("Label 3", 24) # Forces an eviction
+
+        self.assertLessEqual(cache.used_bytes, cache.max_bytes)
+        self.assertEqual(len(cache), 3)
+        hits = cache.hits
+        cache.render("Label 0", 24)
+        self.assertEqual(cache.hits, hits + 1) # Still cached
+        cache.render("Label 1", 24)
+        self.assertEqual(cache.hits, hits + 1) # Was evicted
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+# --- Add the project root to the Python path ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '.'))
+sys.path.insert(0, project_root)
+# ---
+
+from src.card import load_cards
+from src.combat import Run
+from src.simulate import collect_run_stats
+from src.trace import Tracer, tracer
+
+class TestTracer(unittest.TestCase):
+    """Tests for the Chrome trace recorder."""
+
+    def test_off_by_default(self):
+        """Verify nothing is recorded until tracing is started."""
+        recorder = Tracer()
+        with recorder.span("load"):
+            pass
+        recorder.traced()(lambda: None)()
+        self.assertEqual(len(recorder.events), 0)
+
+    def test_ring_buffer_keeps_the_newest(self):
+        """Verify the buffer never grows past its cap and counts what it dropped."""
+        recorder = Tracer(max_events=3)
+        recorder.start()
+        for i in range(5):
+            recorder.complete(f"span {i}", i, i + 0.5)
+        self.assertEqual([event[0] for event in recorder.events], ["span 2", "span 3", "span 4"])
+        self.assertEqual(recorder.dropped, 2)
+
+    def test_chrome_format(self):
+        """Verify the dump is a valid Chrome trace with nested complete events in microseconds."""
+        recorder = Tracer()
+        recorder.start()
+
+        @recorder.traced("inner")
+        def inner():
+            return 42
+
+        with recorder.span("outer", category="frame", combat=1):
+            self.assertEqual(inner(), 42)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "traces", "trace.json")
+            self.assertEqual(recorder.dump(path), 2)
+            with open(path) as f:
+                trace = json.load(f)
+
+        events = {event["name"]: event for event in trace["traceEvents"] if event["ph"] == "X"}
+        outer, inner_event = events["outer"], events["inner"]
+        self.assertEqual(outer["args"], {"combat": 1})
+        self.assertEqual(outer["cat"], "frame")
+        self.assertGreaterEqual(inner_event["ts"], outer["ts"])
+        self.assertLessEqual(inner_event["ts"] + inner_event["dur"], outer["ts"] + outer["dur"])
+        self.assertTrue(any(event["ph"] == "M" for event in trace["traceEvents"])) # Thread names
+
+    def test_engine_spans(self):
+        """Verify card plays and enemy attacks are traced by the shared tracer."""
+        all_cards = load_cards(os.path.join(project_root, 'src', 'data', 'cards.json'))
+        tracer.clear()
+        tracer.start()
+        try:
+            collect_run_stats(lambda _: Run(all_cards, seed=1), lambda run: run.engine.run(), 1, 3) # Engine events are logged at DEBUG, below the default level
+        finally:
+            tracer.stop()
+        names = {event[0] for event in tracer.events}
+        tracer.clear()
+        self.assertIn("Player.play_card", names)
+        self.assertIn("Enemy.perform_attack", names)
+
+if __name__ == '__main__':
+    unittest.main()